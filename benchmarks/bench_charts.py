@@ -0,0 +1,155 @@
+"""
+Chart redraw benchmark: recreating a figure per refresh (the old approach) versus updating
+the persistent charts in budget.ui.charts in place.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_charts            # headless, renders with Agg
+    python -m benchmarks.bench_charts --tk       # embeds real Tk canvases (needs a display)
+
+Each refresh alternates between two sets of totals, so every in-place update really changes
+the artists. Times are the median per refresh in milliseconds, including the render.
+"""
+
+# --- Standard library ---
+import argparse
+import json
+import statistics
+import time
+from typing import Callable
+
+# --- Third-party libraries ---
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# --- Local modules ---
+from budget.ui.charts import CategoryBarChart, TrendChart, CategoryPieChart
+
+CATEGORIES = ['Food', 'Drinks', 'Entertainment', 'Transport', 'Holidays', 'Other']
+
+def _totals(scale: float) -> pd.Series:
+    return pd.Series({category: (i + 1) * 37.5 * scale for i, category in enumerate(CATEGORIES)}).sort_values()
+
+def _monthly(scale: float) -> pd.DataFrame:
+    months = [f"2024-{month:02d}" for month in range(1, 13)]
+    return pd.DataFrame({"month": months, "amount": [(200 + 15 * i) * scale for i in range(12)]})
+
+# --- The old approach: a new figure and canvas every refresh ---
+
+def _recreate_bar(totals: pd.Series, make_canvas: Callable) -> None:
+    fig, ax = plt.subplots(figsize=(4.9, 2))
+    totals.plot(kind='barh', ax=ax, color='#4CAF50')
+    ax.set_title('Total Spent per Category')
+    ax.set_xlabel('Amount (£)')
+    ax.set_ylabel('Category')
+    plt.subplots_adjust(left=0.4, right=0.95, top=0.85, bottom=0.3)
+    ax.tick_params(labelsize=9)
+    make_canvas(fig)
+    plt.close(fig)
+
+def _recreate_trend(monthly: pd.DataFrame, make_canvas: Callable) -> None:
+    fig, ax = plt.subplots(figsize=(6.5, 3.5))
+    ax.plot(monthly['month'].astype(str), monthly['amount'], marker='o', markersize=8, linewidth=3,
+            color='#2E8B57', markerfacecolor='#4CAF50', markeredgecolor='black')
+    ax.set_title('Monthly Spending Trend')
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Total Spent (£)')
+    ax.tick_params(axis='x', rotation=45)
+    ax.grid(True, linestyle='--', alpha=0.4)
+    plt.subplots_adjust(left=0.15, right=0.98, top=0.88, bottom=0.28)
+    make_canvas(fig)
+    plt.close(fig)
+
+def _recreate_pie(totals: pd.Series, make_canvas: Callable) -> None:
+    grouped = totals.sort_index()
+    fig, ax = plt.subplots(figsize=(3.5, 3.5))
+    ax.pie(grouped, labels=grouped.index, autopct="%1.0f%%", startangle=90, colors=plt.cm.Set3.colors, labeldistance=1.1) # type: ignore[attr-defined]
+    ax.set_title("Spending by Category")
+    make_canvas(fig)
+    plt.close(fig)
+
+def _time(refresh: Callable[[int], None], repeat: int) -> float:
+    """
+    Median milliseconds per call of refresh(i).
+    """
+    refresh(0)  # Warm up (font cache, first layout)
+    samples = []
+    for i in range(1, repeat + 1):
+        start = time.perf_counter()
+        refresh(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def run(repeat: int = 30, use_tk: bool = False) -> dict[str, dict[str, float]]:
+    """
+    Returns {chart: {"recreate_ms": ..., "in_place_ms": ..., "speedup": ...}}.
+    """
+    root = None
+    if use_tk:
+        import tkinter as tk
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        root = tk.Tk()
+
+        def make_canvas(fig):
+            # What the app used to do: embed a new canvas, draw it and destroy the previous widget
+            canvas = FigureCanvasTkAgg(fig, master=root)
+            canvas.draw()
+            widget = canvas.get_tk_widget()
+            widget.pack()
+            root.update_idletasks()
+            widget.destroy()
+    else:
+        def make_canvas(fig):
+            FigureCanvasAgg(fig).draw()
+
+    def render() -> None:
+        # Agg's draw_idle renders straight away; Tk's runs once the idle tasks are processed
+        if root is not None:
+            root.update_idletasks()
+
+    bar, trend, pie = CategoryBarChart(root), TrendChart(root), CategoryPieChart(root)
+    for chart in (bar, trend, pie):
+        if root is not None:
+            chart.widget.pack()
+
+    scale = lambda i: 1.0 + (i % 2) * 0.5
+    cases = {
+        "bar": (lambda i: _recreate_bar(_totals(scale(i)), make_canvas),
+                lambda i: (bar.update(_totals(scale(i))), render())),
+        "trend": (lambda i: _recreate_trend(_monthly(scale(i)), make_canvas),
+                  lambda i: (trend.update(_monthly(scale(i))), render())),
+        "pie": (lambda i: _recreate_pie(_totals(scale(i)), make_canvas),
+                lambda i: (pie.update(_totals(scale(i))), render())),
+    }
+
+    results = {}
+    for name, (recreate, in_place) in cases.items():
+        before, after = _time(recreate, repeat), _time(in_place, repeat)
+        results[name] = {"recreate_ms": round(before, 2), "in_place_ms": round(after, 2),
+                         "speedup": round(before / after, 2)}
+
+    if root is not None:
+        root.destroy()
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=30, help="Refreshes timed per chart (default 30)")
+    parser.add_argument("--tk", action="store_true", help="Embed real Tk canvases (needs a display)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.tk)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'chart':<8}{'recreate (ms)':>15}{'in place (ms)':>15}{'speedup':>10}")
+    for name, result in results.items():
+        print(f"{name:<8}{result['recreate_ms']:>15.2f}{result['in_place_ms']:>15.2f}{result['speedup']:>9.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Ledger benchmark suite: times the database functions, the ledger snapshot, the in-memory store,
+the forecasts, chart rendering and a full add-transaction refresh cycle on seeded synthetic ledgers.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ledger                          # 10k and 100k rows, headless
+    python -m benchmarks.bench_ledger --rows 10000 1000000 5000000 --repeat 5
+    python -m benchmarks.bench_ledger --tk                     # refresh cycle through a real BudgetApp (needs a display)
+    python -m benchmarks.bench_ledger --output new.json --compare old.json
+
+Each size gets a fresh database in a temporary directory, filled by benchmarks.synthetic.
+Results are written as JSON (see run(), which also records the memory used by the LedgerStore) together with the commit, Python and library versions,
+so runs from different commits can be compared with --compare.
+"""
+
+# --- Standard library ---
+import argparse
+import json
+import logging
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+# --- Third-party libraries ---
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+import pandas as pd
+
+# --- Local modules ---
+from budget import db, ledger
+from budget.store import LedgerStore
+from budget.forecast import MODELS, Forecaster
+from budget.ui.charts import CategoryBarChart, TrendChart, CategoryPieChart
+from benchmarks.synthetic import populate
+
+DEFAULT_ROWS = (10_000, 100_000)
+DEFAULT_OUTPUT = "bench_ledger.json"
+
+# Loading every row into a DataFrame is skipped above this size (it needs several GB at 5M rows)
+FULL_LOAD_LIMIT = 1_000_000
+
+def _time(func: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> dict[str, float]:
+    """
+    Runs func once to warm up, then repeat times, and returns the timings in milliseconds.
+    setup (if given) runs untimed before every call.
+    """
+    samples = []
+    for i in range(repeat + 1):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        if i:
+            samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3),
+            "max_ms": round(max(samples), 3), "runs": repeat}
+
+def _consume(chunks) -> int:
+    return sum(len(chunk) for chunk in chunks)
+
+def _db_cases(rows: int) -> dict[str, Callable[[], Any]]:
+    """
+    The database readers, unfiltered and with the filters the UI uses.
+    """
+    last_year = db.TransactionFilter(start_date="2025-01-01", end_date="2025-12-31")       # Whole months: summary table
+    partial = db.TransactionFilter(start_date="2025-01-15", end_date="2025-06-14")         # Partial months: transactions table
+    food = db.TransactionFilter(categories=("Food", "Drinks"))
+    middle = db.get_transactions_slice(rows // 2, 1)[0]
+    middle_by_amount = db.get_transactions_slice(rows // 2, 1, sort_by="amount")[0]
+
+    cases: dict[str, Callable[[], Any]] = {
+        "count_transactions": db.count_transactions,
+        "count_transactions[partial months]": lambda: db.count_transactions(partial),
+        "get_total_amount": db.get_total_amount,
+        "get_total_amount[last year]": lambda: db.get_total_amount(last_year),
+        "get_total_amount[partial months]": lambda: db.get_total_amount(partial),
+        "get_monthly_totals": db.get_monthly_totals,
+        "get_monthly_totals[partial months]": lambda: db.get_monthly_totals(partial),
+        "get_category_totals": db.get_category_totals,
+        "get_category_totals[categories]": lambda: db.get_category_totals(food),
+        "get_monthly_category_amounts": db.get_monthly_category_amounts,
+        "get_monthly_category_totals": db.get_monthly_category_totals,
+        "get_top_categories": db.get_top_categories,
+        "get_transactions_slice[first]": lambda: db.get_transactions_slice(0, 50),
+        "get_transactions_slice[middle]": lambda: db.get_transactions_slice(rows // 2, 50),
+        "get_transactions_page[first]": lambda: db.get_transactions_page(limit=50),
+        "get_transactions_page[middle]": lambda: db.get_transactions_page((middle[1], middle[0]), limit=50),
+        "get_transactions_slice[middle, amount]": lambda: db.get_transactions_slice(rows // 2, 50, sort_by="amount"),
+        "get_transactions_page[middle, amount]": lambda: db.get_transactions_page(
+            (middle_by_amount[2], middle_by_amount[0]), limit=50, sort_by="amount"),
+        "iter_transactions": lambda: _consume(db.iter_transactions()),
+        "iter_transactions[categories]": lambda: _consume(db.iter_transactions(food)),
+        "check_summary": db.check_summary,
+        "rebuild_summary": db.rebuild_summary,
+    }
+    if rows <= FULL_LOAD_LIMIT:
+        cases["get_all_transactions"] = db.get_all_transactions
+    return cases
+
+def bench_database(rows: int, repeat: int) -> dict[str, dict[str, float]]:
+    results = {f"db.{name}": _time(func, repeat) for name, func in _db_cases(rows).items()}
+
+    results["db.add_transaction"] = _time(lambda: db.add_transaction("2025-12-31", 9.99, "Food", "Benchmark"), repeat)
+    results["db.delete_latest_transaction"] = _time(
+        db.delete_latest_transaction, repeat, setup=lambda: db.add_transaction("2025-12-31", 9.99, "Food", "Benchmark")
+    )
+    results["ledger.load_snapshot"] = _time(ledger.load_snapshot, repeat)
+    return results
+
+def bench_store(repeat: int) -> tuple[LedgerStore, dict[str, dict[str, float]]]:
+    """
+    Times loading the LedgerStore and its vectorised queries. Returns the loaded store as well.
+    """
+    partial = db.TransactionFilter(start_date="2025-01-15", end_date="2025-06-14")
+    results = {"store.from_database": _time(LedgerStore.from_database, repeat)}
+    store = LedgerStore.from_database()
+
+    cases: dict[str, Callable[[], Any]] = {
+        "total": store.total,
+        "total[partial months]": lambda: store.total(partial),
+        "monthly_totals": store.monthly_totals,
+        "category_totals": store.category_totals,
+        "monthly_category_totals": store.monthly_category_totals,
+        "monthly_category_totals[partial months]": lambda: store.monthly_category_totals(partial),
+    }
+    results.update({f"store.{name}": _time(func, repeat) for name, func in cases.items()})
+
+    next_id = int(store.ids.max(initial=0)) + 1
+    results["store.append+delete"] = _time(
+        lambda: (store.append(next_id, "2025-12-31", 9.99, "Food", "Benchmark"), store.delete([next_id])), repeat
+    )
+    return store, results
+
+def bench_forecast(snapshot: ledger.LedgerSnapshot, repeat: int) -> dict[str, dict[str, float]]:
+    """
+    A full fit of every model on the category x month matrix, and the incremental update
+    used after a single transaction is added.
+    """
+    results: dict[str, dict[str, float]] = {}
+    if snapshot.category_monthly is None:
+        return results
+
+    history = snapshot.category_monthly.to_numpy()
+    for model in MODELS:
+        results[f"forecast.fit[{model}]"] = _time(lambda: Forecaster(history, model).forecasts(), repeat)
+
+    forecaster = Forecaster(history, "trend")
+    changed = history.copy()
+    step = iter(range(1, 10 ** 9))
+
+    def update() -> None:
+        changed[0, -1] += next(step)
+        forecaster.update(changed)
+        forecaster.forecasts()
+
+    results["forecast.update[trend]"] = _time(update, repeat)
+    return results
+
+def bench_charts(snapshot: ledger.LedgerSnapshot, repeat: int, root=None) -> dict[str, dict[str, float]]:
+    """
+    Updating each persistent chart in place with the ledger's data and rendering it.
+    """
+    if snapshot.empty:
+        return {}
+
+    bar, trend, pie = CategoryBarChart(root), TrendChart(root), CategoryPieChart(root)
+    for chart in (bar, trend, pie):
+        if root is not None:
+            chart.widget.pack()
+
+    def render() -> None:
+        # Agg's draw_idle renders straight away; Tk's runs once the idle tasks are processed
+        if root is not None:
+            root.update_idletasks()
+
+    # Alternate between two data sets so every update really changes the artists
+    totals = [snapshot.category_totals, snapshot.category_totals * 1.5]
+    monthly = [snapshot.monthly, snapshot.monthly.assign(amount=snapshot.monthly["amount"] * 1.5)]
+    flip = iter(range(10 ** 9))
+
+    return {
+        "charts.bar": _time(lambda: (bar.update(totals[next(flip) % 2]), render()), repeat),
+        "charts.trend": _time(lambda: (trend.update(monthly[next(flip) % 2]), render()), repeat),
+        "charts.pie": _time(lambda: (pie.update(totals[next(flip) % 2]), render()), repeat),
+    }
+
+def _headless_refresh_cycle() -> Callable[[], None]:
+    """
+    The work BudgetApp does for one added transaction, without Tk: the insert, the snapshot reload,
+    the incremental forecast, the first page of the transaction list and the three chart updates.
+    """
+    bar, trend, pie = CategoryBarChart(), TrendChart(), CategoryPieChart()
+    forecaster: list[Forecaster] = []
+
+    def cycle() -> None:
+        db.add_transaction("2025-12-31", 12.34, "Food", "Benchmark")
+        snapshot = ledger.get_snapshot()
+        matrix = snapshot.category_monthly
+        if matrix is not None:
+            if not forecaster:
+                forecaster.append(Forecaster(matrix.to_numpy(), "trend", list(matrix.index)))
+            else:
+                forecaster[0].update(matrix.to_numpy(), list(matrix.index))
+            forecaster[0].forecasts()
+        db.get_transactions_page(limit=15)
+        bar.update(snapshot.category_totals)
+        trend.update(snapshot.monthly)
+        pie.update(snapshot.category_totals)
+
+    return cycle
+
+def _tk_refresh_cycle(root) -> Callable[[], None]:
+    """
+    One submit through a real BudgetApp: the form is filled in, submitted, and the coalesced
+    refresh runs to completion (the worker runs synchronously so the whole pass is timed).
+    """
+    import tkinter as tk
+    from budget.ui.app import BudgetApp
+
+    app = BudgetApp(root)
+    app.worker.synchronous = True
+    root.update()
+
+    def cycle() -> None:
+        app.amount_entry.delete(0, tk.END)
+        app.amount_entry.insert(0, "12.34")
+        app.category_var.set("Food")
+        app.description_entry.delete(0, tk.END)
+        app.description_entry.insert(0, "Benchmark")
+        app.submit_transaction()
+        app.scheduler.flush()
+        root.update_idletasks()
+
+    return cycle
+
+def run(rows: int, seed: int = 0, repeat: int = 10, use_tk: bool = False) -> dict[str, Any]:
+    """
+    Benchmarks one ledger size. Returns {"rows", "seed", "populate_s", "store_mb", "results": {name: timings}}.
+    """
+    root = None
+    if use_tk:
+        import tkinter as tk
+        root = tk.Tk()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db.open_database(str(Path(directory) / "bench.db"))
+        try:
+            db.initialise_database()
+            start = time.perf_counter()
+            populate(rows, seed)
+            populate_s = time.perf_counter() - start
+
+            results = bench_database(rows, repeat)
+            store, store_results = bench_store(repeat)
+            results.update(store_results)
+            store_mb = round(store.nbytes / 1e6, 2)
+            snapshot = ledger.get_snapshot()
+            results.update(bench_forecast(snapshot, repeat))
+            results.update(bench_charts(snapshot, repeat, root))
+
+            # Last, since every cycle adds a transaction
+            cycle = _tk_refresh_cycle(root) if root is not None else _headless_refresh_cycle()
+            results["refresh_cycle[add transaction]"] = _time(cycle, repeat)
+        finally:
+            db.close_database()
+            if root is not None:
+                root.destroy()
+
+    return {"rows": rows, "seed": seed, "populate_s": round(populate_s, 3), "store_mb": store_mb, "results": results}
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                                cwd=Path(__file__).resolve().parent)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+def environment() -> dict[str, Any]:
+    """
+    Where and on what the benchmark ran, stored alongside the results.
+    """
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+        "sqlite": sqlite3.sqlite_version,
+    }
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[tuple[int, str, float, float, float]]:
+    """
+    Returns (rows, name, baseline median, current median, current / baseline) for every
+    benchmark present in both result files.
+    """
+    before = {run["rows"]: run["results"] for run in baseline["runs"]}
+    rows = []
+    for run in current["runs"]:
+        for name, timing in run["results"].items():
+            old = before.get(run["rows"], {}).get(name)
+            if old and old["median_ms"]:
+                rows.append((run["rows"], name, old["median_ms"], timing["median_ms"],
+                             timing["median_ms"] / old["median_ms"]))
+    return rows
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS),
+                        help="Ledger sizes to benchmark (default: 10000 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic ledger (default 0)")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per benchmark (default 10)")
+    parser.add_argument("--tk", action="store_true", help="Run the refresh cycle through a real BudgetApp (needs a display)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help=f"Results file (default {DEFAULT_OUTPUT})")
+    parser.add_argument("--compare", metavar="BASELINE", help="Print the change against an earlier results file")
+    args = parser.parse_args(argv)
+
+    # The app's chart fonts fall back silently on machines without them; don't log every lookup
+    logging.getLogger("matplotlib.font_manager").setLevel(logging.ERROR)
+
+    report = {"environment": environment(), "repeat": args.repeat, "tk": args.tk, "runs": []}
+    for rows in args.rows:
+        print(f"Benchmarking {rows:,} transactions...", file=sys.stderr)
+        outcome = run(rows, args.seed, args.repeat, args.tk)
+        report["runs"].append(outcome)
+
+        print(f"\n{rows:,} transactions (populated in {outcome['populate_s']:.1f}s, store {outcome['store_mb']:.1f} MB)")
+        for name, timing in outcome["results"].items():
+            print(f"  {name:<45}{timing['median_ms']:>12.3f} ms")
+
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print(f"\nCompared with {args.compare} (commit {baseline['environment'].get('commit')}):")
+        print(f"  {'rows':>9}  {'benchmark':<45}{'before (ms)':>12}{'after (ms)':>12}{'ratio':>8}")
+        for size, name, old, new, ratio in compare(baseline, report):
+            print(f"  {size:>9,}  {name:<45}{old:>12.3f}{new:>12.3f}{ratio:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Seeded synthetic ledgers for the benchmarks.
+
+The same seed and size always give the same transactions, so timings from different commits
+are measured on identical data. The distributions are loosely modelled on a real personal ledger:
+
+- Activity grows over the years (more transactions per day in recent years)
+- Weekends are busier than weekdays and December is busier than the rest of the year
+- Categories are skewed (lots of Food and Drinks, few Holidays), Holidays cluster in the summer
+- Amounts are log-normal per category (small coffees, occasional large holidays)
+- Descriptions repeat from a small set of merchants per category, some are left blank
+"""
+
+# --- Standard library ---
+from typing import Optional
+
+# --- Third-party libraries ---
+import numpy as np
+import pandas as pd
+
+# --- Local database functions ---
+from budget import db
+
+DEFAULT_START = "2016-01-01"
+DEFAULT_END = "2025-12-31"
+
+# category: (share of transactions, median amount, log-normal sigma, merchants)
+CATEGORY_PROFILES: dict[str, tuple[float, float, float, list[str]]] = {
+    "Food": (0.36, 14.0, 0.7, ["Tesco", "Sainsbury's", "Lidl", "Pret", "Greggs", "Local market"]),
+    "Drinks": (0.20, 6.5, 0.6, ["Costa", "Starbucks", "The Red Lion", "Off licence"]),
+    "Transport": (0.18, 9.0, 0.8, ["TfL", "Uber", "Trainline", "Shell", "National Express"]),
+    "Entertainment": (0.13, 22.0, 0.7, ["Cinema", "Spotify", "Steam", "Concert tickets", "Bowling"]),
+    "Other": (0.11, 30.0, 1.0, ["Amazon", "Boots", "Argos", "IKEA", "Gift"]),
+    "Holidays": (0.02, 350.0, 0.9, ["Airbnb", "easyJet", "Booking.com", "Hotel"]),
+}
+CATEGORIES = list(CATEGORY_PROFILES)
+
+BLANK_DESCRIPTION_SHARE = 0.15
+
+def _day_weights(days: np.ndarray) -> np.ndarray:
+    """
+    Relative number of transactions on each day (growth, weekends and December).
+    """
+    weekday = (days.astype("datetime64[D]").view("int64") - 4) % 7  # 1970-01-01 was a Thursday, so Monday = 0
+    month = days.astype("datetime64[M]").astype(int) % 12 + 1
+    growth = np.linspace(0.5, 1.5, len(days))
+    weights = growth * np.where(weekday >= 5, 1.4, 1.0) * np.where(month == 12, 1.3, 1.0)
+    return weights / weights.sum()
+
+def generate_transactions(rows: int, seed: int = 0, start: str = DEFAULT_START,
+                          end: str = DEFAULT_END) -> pd.DataFrame:
+    """
+    Returns rows synthetic transactions (TRANSACTION_COLUMNS, ISO dates) in date order.
+    """
+    rng = np.random.default_rng(seed)
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+
+    shares = np.array([profile[0] for profile in CATEGORY_PROFILES.values()])
+    codes = rng.choice(len(CATEGORIES), size=rows, p=shares / shares.sum())
+    dates = rng.choice(days, size=rows, p=_day_weights(days))
+
+    # Move most holidays into June-August of the same year
+    holidays = np.flatnonzero(codes == CATEGORIES.index("Holidays"))
+    summer = holidays[rng.random(len(holidays)) < 0.6]
+    years = dates[summer].astype("datetime64[Y]")
+    dates[summer] = years.astype("datetime64[D]") + rng.integers(151, 243, size=len(summer))
+    dates = np.clip(dates, days[0], days[-1])
+
+    amounts = np.empty(rows)
+    descriptions = np.empty(rows, dtype=object)
+    for code, (_, median, sigma, merchants) in enumerate(CATEGORY_PROFILES.values()):
+        members = np.flatnonzero(codes == code)
+        amounts[members] = rng.lognormal(np.log(median), sigma, size=len(members))
+        descriptions[members] = np.array(merchants, dtype=object)[rng.integers(len(merchants), size=len(members))]
+    descriptions[rng.random(rows) < BLANK_DESCRIPTION_SHARE] = ""
+
+    order = np.argsort(dates, kind="stable")
+    return pd.DataFrame({
+        "date": dates[order].astype(str),
+        "amount": np.round(np.maximum(amounts[order], 0.01), 2),
+        "category": np.array(CATEGORIES, dtype=object)[codes[order]],
+        "description": descriptions[order],
+    })
+
+def populate(rows: int, seed: int = 0, batch_size: Optional[int] = None) -> db.BulkInsertResult:
+    """
+    Generates a synthetic ledger and bulk-inserts it into the current database.
+    """
+    batch = generate_transactions(rows, seed)
+    return db.add_transactions(batch, batch_size=batch_size or db.BULK_BATCH_SIZE)
@@ -0,0 +1,12 @@
+"""
+Entry point for `python -m budget` (the headless command-line interface).
+The GUI is started with `python -m budget.main`.
+"""
+
+# --- Standard library ---
+import sys
+
+# --- Local modules ---
+from .cli import main
+
+sys.exit(main())
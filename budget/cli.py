@@ -0,0 +1,272 @@
+"""
+Command-line interface for the Budget Tracker application.
+
+Runs batch jobs straight against budget.db, without Tkinter or Matplotlib, so they work from cron
+or on a server without a display. Every command can print JSON (--json) for piping into other tools:
+
+    python -m budget add 2025-07-01 20.50 Food "Groceries"
+    python -m budget import statement.csv
+    python -m budget export transactions.csv.gz --from 2025-01-01
+    python -m budget summary --json
+    python -m budget forecast --model smoothing --by-category
+    python -m budget check-summary
+
+pandas and NumPy are only imported by the commands that need them (import and forecast).
+Set BUDGET_INSTRUMENT=1 to print the time spent in each database function afterwards.
+"""
+
+# --- Standard library ---
+import argparse
+import json
+import sys
+from collections import defaultdict
+from typing import Any, Callable, Optional, Sequence
+
+# --- Local modules ---
+from . import db, instrumentation, partitions
+
+# Same choices as the GUI's forecast dropdown (see budget.forecast.MODELS)
+FORECAST_MODELS = ("trend", "smoothing", "seasonal", "average")
+
+class CommandError(Exception):
+    """
+    Raised by a command to stop with an error message and a non-zero exit status.
+    """
+
+def _filters(args: argparse.Namespace) -> Optional[db.TransactionFilter]:
+    """
+    Builds a TransactionFilter from the --from/--to/--category/--min/--max options (None if none were given).
+    """
+    if not (args.start_date or args.end_date or args.categories
+            or args.min_amount is not None or args.max_amount is not None):
+        return None
+    return db.TransactionFilter(
+        start_date=args.start_date,
+        end_date=args.end_date,
+        categories=tuple(args.categories) if args.categories else None,
+        min_amount=args.min_amount,
+        max_amount=args.max_amount,
+    )
+
+def _output(args: argparse.Namespace, data: dict[str, Any], lines: Sequence[str]) -> None:
+    """
+    Prints data as JSON with --json, otherwise the human-readable lines.
+    """
+    if args.json:
+        print(json.dumps(data, indent=2))
+    else:
+        print("\n".join(lines))
+
+def _monthly_amounts(filters: Optional[db.TransactionFilter]) -> tuple[list[str], dict[str, dict[str, float]]]:
+    """
+    Returns the months with spending (oldest first) and {category: {month: amount}}.
+    """
+    months: list[str] = []
+    by_category: dict[str, dict[str, float]] = defaultdict(dict)
+    for month, category, amount in db.get_monthly_category_amounts(filters):
+        if not months or months[-1] != month:
+            months.append(month)
+        by_category[category][month] = amount
+    return months, by_category
+
+# --- Commands ---
+
+def cmd_add(args: argparse.Namespace) -> None:
+    reason = db.validate_transaction(args.date, args.amount, args.category, args.description)
+    if reason:
+        raise CommandError(reason)
+
+    new_id = db.add_transaction(args.date, float(args.amount), args.category, args.description)
+    _output(args, {"id": new_id, "date": args.date, "amount": float(args.amount), "category": args.category,
+                   "description": args.description},
+            [f"Added transaction {new_id}."])
+
+def cmd_import(args: argparse.Namespace) -> None:
+    from .importer import import_csv
+
+    column_map = {}
+    for mapping in args.column_map:
+        field, _, column = mapping.partition("=")
+        if not column:
+            raise CommandError(f"--map expects FIELD=COLUMN, got '{mapping}'.")
+        column_map[field] = column
+
+    result = import_csv(args.path, column_map=column_map or None, chunk_size=args.chunk_size,
+                        dayfirst=not args.month_first)
+
+    lines = [f"Read {result.rows_read} rows: imported {result.inserted}, "
+             f"skipped {result.duplicates} duplicates, rejected {len(result.rejected)}."]
+    lines += [f"  line {line}: {reason}" for line, reason in result.rejected]
+    _output(args, {
+        "rows_read": result.rows_read,
+        "inserted": result.inserted,
+        "duplicates": result.duplicates,
+        "rejected": [{"line": line, "reason": reason} for line, reason in result.rejected],
+    }, lines)
+
+def cmd_export(args: argparse.Namespace) -> None:
+    from .exporter import export_transactions
+
+    rows = export_transactions(args.path, fmt=args.format, filters=_filters(args))
+    _output(args, {"path": args.path, "rows": rows}, [f"Exported {rows} transactions to {args.path}."])
+
+def cmd_summary(args: argparse.Namespace) -> None:
+    filters = _filters(args)
+    with db.consistent_read():
+        count = db.count_transactions(filters)
+        total = db.get_total_amount(filters)
+        top = db.get_top_categories(args.top, filters)
+        months, by_category = _monthly_amounts(filters)
+
+    month_totals = [sum(amounts.get(month, 0.0) for amounts in by_category.values()) for month in months]
+    monthly = [{"month": month, "amount": amount} for month, amount in zip(months, month_totals)]
+    # The mean of the monthly totals, as in the GUI (rows without a month count towards the total only)
+    average = sum(month_totals) / len(month_totals) if month_totals else 0.0
+
+    lines = [
+        f"Transactions: {count}",
+        f"Total amount spent = £{total:.2f}",
+        f"Average monthly spend = £{average:.2f}",
+    ]
+    if top:
+        lines.append(f"Top {len(top)} categories:")
+        lines += [f"  {i}. {category}: £{amount:.2f}" for i, (category, amount) in enumerate(top, start=1)]
+    _output(args, {
+        "count": count,
+        "total": total,
+        "monthly_average": average,
+        "monthly": monthly,
+        "top_categories": [{"category": category, "amount": amount} for category, amount in top],
+    }, lines)
+
+def cmd_forecast(args: argparse.Namespace) -> None:
+    from .forecast import Forecaster, fill_months, get_model
+
+    months, by_category = _monthly_amounts(_filters(args))
+    categories = sorted(by_category)
+    history = fill_months([[by_category[category].get(month, 0.0) for month in months] for category in categories],
+                          months) if categories else None
+
+    forecasts = Forecaster(history, args.model).forecasts() if history is not None else None
+    data: dict[str, Any] = {
+        "model": args.model,
+        "months": history.shape[1] if history is not None else 0,
+        "next_month": float(forecasts.sum()) if forecasts is not None else None,
+    }
+    if forecasts is None:
+        needed = get_model(args.model).min_months
+        lines = [f"Next month's predicted spend = Need at least {needed} month{'s' if needed != 1 else ''} of data"]
+    else:
+        lines = [f"Next month's predicted spend = £{data['next_month']:.2f}"]
+
+    if args.by_category:
+        data["categories"] = dict(zip(categories, map(float, forecasts))) if forecasts is not None else {}
+        lines += [f"  {category}: £{amount:.2f}" for category, amount in data["categories"].items()]
+    _output(args, data, lines)
+
+def cmd_check_summary(args: argparse.Namespace) -> int:
+    mismatches = db.check_summary()
+
+    if mismatches:
+        lines = [f"{len(mismatches)} month/category totals don't match (run rebuild-summary):"]
+        lines += [f"  {month} {category}: summary £{summary:.2f}, actual £{actual:.2f}"
+                  for month, category, summary, actual in mismatches]
+    else:
+        lines = ["Summary table matches the transactions."]
+    _output(args, {
+        "ok": not mismatches,
+        "mismatches": [{"month": month, "category": category, "summary": summary, "actual": actual}
+                       for month, category, summary, actual in mismatches],
+    }, lines)
+    return 1 if mismatches else 0
+
+def cmd_rebuild_summary(args: argparse.Namespace) -> None:
+    db.rebuild_summary()
+    _output(args, {"rebuilt": True}, ["Summary table rebuilt."])
+
+def cmd_partition(args: argparse.Namespace) -> None:
+    years = partitions.split_into_partitions()
+    path = db.get_connection_manager().path
+    _output(args, {"catalog": path, "years": years},
+            [f"Split {path} into {len(years)} year partition{'s' if len(years) != 1 else ''}"
+             + (f" ({years[0]}-{years[-1]})." if years else ".")])
+
+# --- Argument parsing ---
+
+def _add_filter_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--from", dest="start_date", metavar="YYYY-MM-DD", help="Only transactions on or after this date")
+    parser.add_argument("--to", dest="end_date", metavar="YYYY-MM-DD", help="Only transactions on or before this date")
+    parser.add_argument("--category", dest="categories", action="append", metavar="NAME",
+                        help="Only this category (repeat for several)")
+    parser.add_argument("--min", dest="min_amount", type=float, metavar="AMOUNT", help="Only amounts of at least this")
+    parser.add_argument("--max", dest="max_amount", type=float, metavar="AMOUNT", help="Only amounts of at most this")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="budget", description="Budget Tracker command-line interface.")
+    parser.add_argument("--db", help=f"Database file (default: {db.DB_NAME})")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def command(name: str, handler: Callable[[argparse.Namespace], Optional[int]], help: str) -> argparse.ArgumentParser:
+        sub = commands.add_parser(name, help=help, description=help)
+        sub.set_defaults(handler=handler)
+        # Also accepted after the command; SUPPRESS keeps a global --json from being overwritten
+        sub.add_argument("--json", action="store_true", default=argparse.SUPPRESS, help="Print results as JSON")
+        return sub
+
+    add = command("add", cmd_add, "Add a single transaction.")
+    add.add_argument("date", help="Date as YYYY-MM-DD")
+    add.add_argument("amount", help="Amount spent (a positive number)")
+    add.add_argument("category")
+    add.add_argument("description", nargs="?", default="")
+
+    bulk = command("import", cmd_import, "Import transactions from a CSV file, skipping duplicates.")
+    bulk.add_argument("path")
+    bulk.add_argument("--map", dest="column_map", action="append", default=[], metavar="FIELD=COLUMN",
+                      help="Use COLUMN for FIELD (date, amount, category or description)")
+    bulk.add_argument("--month-first", action="store_true", help="Dates are month-first (e.g. 07/01/2025)")
+    bulk.add_argument("--chunk-size", type=int, default=5000, help="Rows read per chunk")
+
+    export = command("export", cmd_export, "Export transactions to CSV, compressed CSV or Parquet.")
+    export.add_argument("path")
+    export.add_argument("--format", choices=("csv", "csv.gz", "parquet"), help="Defaults to the file extension")
+    _add_filter_options(export)
+
+    summary = command("summary", cmd_summary, "Show the total, monthly average and top categories.")
+    summary.add_argument("--top", type=int, default=3, help="Number of top categories (default 3)")
+    _add_filter_options(summary)
+
+    forecast = command("forecast", cmd_forecast, "Predict next month's spend.")
+    forecast.add_argument("--model", choices=FORECAST_MODELS, default="trend")
+    forecast.add_argument("--by-category", action="store_true", help="Also forecast each category")
+    _add_filter_options(forecast)
+
+    command("check-summary", cmd_check_summary, "Check the monthly summary table against the transactions.")
+    command("rebuild-summary", cmd_rebuild_summary, "Rebuild the monthly summary table from the transactions.")
+    command("partition", cmd_partition, "Split the database into one file per year (can't be undone).")
+    return parser
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Runs the CLI and returns the exit status (commands return non-zero to signal a failed check).
+    """
+    args = build_parser().parse_args(argv)
+    if args.db:
+        db.open_database(args.db)
+
+    instrument = instrumentation.requested()
+    if instrument:
+        instrumentation.enable()
+
+    try:
+        db.initialise_database()
+        instrumentation.begin_action(args.command)
+        return args.handler(args) or 0
+    except (CommandError, OSError, ValueError, RuntimeError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if instrument:
+            instrumentation.end_action()
+            print(instrumentation.report(), file=sys.stderr)
+        db.close_database()
@@ -2,89 +2,1603 @@
 Database module for the Budget Tracker application.
 
 Handles all interactions with the SQLite database, including:
-- Initialising the database and schema
-- Adding, retrieving, and deleting transactions
-- Calculating total amounts
+- Initialising the database and migrating its schema
+- Adding (singly or in bulk), retrieving, editing and deleting transactions (singly or
+  by id / filter)
+- Calculating total amounts and per-month / per-category aggregates in SQL
+- Full-text search over descriptions and categories (FTS5)
+- Managing a persistent, tuned set of SQLite connections
+- Optionally splitting the ledger into one file per year (see partitions.py)
 """
+from __future__ import annotations
 
 # --- Database and DataFrame modules
+import calendar
+import hashlib
+import heapq
+import json
+import math
+from collections import Counter
+from datetime import date as Date, datetime
 import sqlite3
-import pandas as pd
+import threading
+from itertools import islice
 
 # --- Type hints (Optional[int] = int or None)
-from typing import Optional
+from contextlib import AbstractContextManager, contextmanager
+from typing import (TYPE_CHECKING, Any, Callable, Generator, Iterable, Iterator,
+                    NamedTuple, Optional)
+
+# pandas is imported by the functions that build DataFrames, so opening the database
+# (e.g. before the GUI's first paint) doesn't pay for importing it
+if TYPE_CHECKING:
+    import pandas as pd
+
+# --- Connection management and year partitions ---
+from . import partitions
 
 # Set the database name
 DB_NAME = "budget.db"
 
+# Columns a caller supplies for each transaction (id is assigned by SQLite)
+TRANSACTION_COLUMNS = ["date", "amount", "category", "description"]
+
+# Default number of rows written per executemany() call by add_transactions
+BULK_BATCH_SIZE = 5000
+
+# Rejection reason used by add_transactions(skip_duplicates=True)
+DUPLICATE_REASON = "Duplicate transaction."
+
+# Columns returned by the transaction readers, in display/export order
+OUTPUT_COLUMNS = ["id"] + TRANSACTION_COLUMNS
+
+# Default number of rows fetched per chunk by iter_transactions
+FETCH_CHUNK_SIZE = 10000
+
+# --- Date storage ---
+# Dates are stored as whole days since 1970-01-01 ('day'), which sorts and compares as
+# an integer. 'month_key' (year * 12 + month, so consecutive months differ by one) is
+# generated from it and indexed, and every month bucket is grouped on it. The ISO 'date'
+# text callers see is generated too.
+
+_EPOCH_ORDINAL = Date(1970, 1, 1).toordinal()
+
+MONTH_KEY_SQL = ("CAST(strftime('%Y', day * 86400, 'unixepoch') AS INTEGER) * 12"
+                 " + CAST(strftime('%m', day * 86400, 'unixepoch') AS INTEGER)")
+DATE_SQL = "date(day * 86400, 'unixepoch')"
+
+# Undated rows (day NULL) are listed after every dated row. Keyset pages order by this
+# expression (indexed), which puts them below any real day, so the row comparisons reach
+# them too.
+UNDATED_DAY = -2 ** 31
+SORT_DAY_SQL = f"COALESCE(day, {UNDATED_DAY})"
+
+# Expression each sortable column is ordered by. None of them is NULL, so keyset
+# comparisons reach every row; missing values sort lowest, as NULLs would. Each has an
+# index with id (versions 5 and 8).
+SORT_EXPRESSIONS = {
+    "id": "id",
+    "date": SORT_DAY_SQL,
+    "amount": "COALESCE(amount, -9e999)",  # -9e999 is read as minus infinity
+    "category": "COALESCE(category, '')",
+    "description": "COALESCE(description, '')",
+}
+
+def month_label_sql(key: str) -> str:
+    """
+    SQL that turns a month key expression into its 'YYYY-MM' label.
+    """
+    return f"printf('%04d-%02d', ({key} - 1) / 12, ({key} - 1) % 12 + 1)"
+
+def to_day(date: str) -> int:
+    """
+    Converts an ISO date ('YYYY-MM-DD', anything after the day is ignored) to its stored
+    day number.
+    Raises ValueError if it isn't a valid date.
+    """
+    return Date.fromisoformat(str(date)[:10]).toordinal() - _EPOCH_ORDINAL
+
+def _sort_day(date: Optional[str]) -> int:
+    """
+    Converts a page key's date (None for an undated row) to its SORT_DAY_SQL value.
+    """
+    return UNDATED_DAY if date is None else to_day(date)
+
+def _sort_value(sort_by: str, value: Any) -> Any:
+    """
+    Converts a row's value in the sort column (None if missing) to its SORT_EXPRESSIONS
+    value.
+    """
+    if sort_by == "date":
+        return _sort_day(value)
+    if sort_by == "amount":
+        return -math.inf if value is None else value
+    if sort_by in ("category", "description"):
+        return value or ""
+    return value
+
+def from_day(day: int) -> str:
+    """
+    Converts a stored day number back to an ISO date.
+    """
+    return Date.fromordinal(day + _EPOCH_ORDINAL).isoformat()
+
+def to_month_key(date: str) -> int:
+    """
+    Returns the month key (year * 12 + month) of an ISO date or 'YYYY-MM' month.
+    """
+    year, month = (int(part) for part in str(date).split("-")[:2])
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month in '{date}'")
+    return year * 12 + month
+
+def month_label(key: int) -> str:
+    """
+    Returns the 'YYYY-MM' label of a month key (key 0, used for undated rows, is
+    '0000-00' as in SQL).
+    """
+    if key <= 0:
+        return "0000-00"
+    year, month = divmod(key - 1, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+# Shared manager used by all database functions below
+_manager: Optional[partitions.ConnectionManager] = None
+_manager_lock = threading.Lock()
+
+# Bumped by every write (and whenever a different database is opened) so caches know
+# when to reload
+_generation = 0
+
+def get_generation() -> int:
+    """
+    Returns the current data generation. It changes whenever the ledger may have
+    changed.
+    """
+    return _generation
+
+def _bump_generation() -> None:
+    global _generation
+    _generation += 1
+
+def get_connection_manager() -> partitions.ConnectionManager:
+    """
+    Returns the shared connection manager, reopening it if DB_NAME has changed.
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None or _manager.path != DB_NAME:
+            if _manager is not None:
+                _manager.close()
+            _manager = partitions.ConnectionManager(DB_NAME)
+            _bump_generation()
+        return _manager
+
+def open_database(path: Optional[str] = None, config: Optional[dict[str, Any]] = None
+                  ) -> partitions.ConnectionManager:
+    """
+    Points the database functions at a different file (or ':memory:') and/or pragma
+    config.
+    Any previously open connections are closed first.
+    """
+    global DB_NAME, _manager
+    with _manager_lock:
+        if path is not None:
+            DB_NAME = path
+        if _manager is not None:
+            _manager.close()
+        _manager = partitions.ConnectionManager(DB_NAME, config)
+        _bump_generation()
+        return _manager
+
+def close_database() -> None:
+    """
+    Closes all open connections. Safe to call more than once.
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.close()
+            _manager = None
+
+def _writer() -> AbstractContextManager[sqlite3.Connection]:
+    """
+    Shortcut for the shared manager's writer transaction.
+    """
+    return get_connection_manager().writer()
+
+def _reader() -> AbstractContextManager[sqlite3.Connection]:
+    """
+    Shortcut for the shared manager's reader connection.
+    """
+    return get_connection_manager().reader()
+
+def transaction_hash(date: Any, amount: Any, category: Any, description: Any) -> str:
+    """
+    Returns a stable hash of a transaction's contents, used to detect duplicate imports.
+    Amounts are rounded to pennies so 10, 10.0 and "10.00" hash the same.
+    """
+    try:
+        amount_text = f"{float(amount):.2f}"
+    except (TypeError, ValueError):
+        amount_text = str(amount)
+    key = f"{date}|{amount_text}|{category}|{description or ''}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+@contextmanager
+def consistent_read() -> Iterator[None]:
+    """
+    Runs every read made on this thread inside the block in one read transaction,
+    so several queries (e.g. a total and its breakdowns) all see the same data.
+    Reads reaching more than partitions.MAX_ATTACHED_PARTITIONS partitions restart it
+    (see ConnectionManager.attach).
+    """
+    with _reader() as conn:
+        if conn.in_transaction:
+            yield # Already inside a consistent read (or write) on this connection
+            return
+        conn.execute("BEGIN")
+        try:
+            yield
+        finally:
+            conn.commit()
+
+# --- Summary table ---
+# monthly_category_totals holds one row per (month key, category) with its total and row
+# count. Triggers keep it in step with every insert, update and delete on transactions,
+# so KPIs and charts read O(months x categories) rows however long the history gets.
+
+SUMMARY_TRIGGERS = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_summary_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO monthly_category_totals (month_key, category, amount, count)
+        VALUES (COALESCE(NEW.month_key, 0), COALESCE(NEW.category, ''),
+                COALESCE(NEW.amount, 0), 1)
+        ON CONFLICT (month_key, category)
+        DO UPDATE SET amount = amount + excluded.amount, count = count + 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_summary_delete AFTER DELETE ON transactions BEGIN
+        UPDATE monthly_category_totals
+        SET amount = amount - COALESCE(OLD.amount, 0), count = count - 1
+        WHERE month_key = COALESCE(OLD.month_key, 0)
+          AND category = COALESCE(OLD.category, '');
+        DELETE FROM monthly_category_totals
+        WHERE month_key = COALESCE(OLD.month_key, 0)
+          AND category = COALESCE(OLD.category, '') AND count <= 0;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_summary_update
+    AFTER UPDATE OF day, amount, category ON transactions BEGIN
+        UPDATE monthly_category_totals
+        SET amount = amount - COALESCE(OLD.amount, 0), count = count - 1
+        WHERE month_key = COALESCE(OLD.month_key, 0)
+          AND category = COALESCE(OLD.category, '');
+        DELETE FROM monthly_category_totals
+        WHERE month_key = COALESCE(OLD.month_key, 0)
+          AND category = COALESCE(OLD.category, '') AND count <= 0;
+        INSERT INTO monthly_category_totals (month_key, category, amount, count)
+        VALUES (COALESCE(NEW.month_key, 0), COALESCE(NEW.category, ''),
+                COALESCE(NEW.amount, 0), 1)
+        ON CONFLICT (month_key, category)
+        DO UPDATE SET amount = amount + excluded.amount, count = count + 1;
+    END
+    ''',
+]
+
+# --- Search index ---
+# transactions_fts is an external-content FTS5 index: it stores only the tokens of each
+# row's description and category (keyed by id) and reads the text back from
+# transactions. These triggers keep it in step; FTS5 removes a row's old tokens with the
+# special 'delete' insert.
+
+SEARCH_TRIGGERS = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_search_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts (rowid, description, category)
+        VALUES (NEW.id, NEW.description, NEW.category);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_search_delete AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts (transactions_fts, rowid, description, category)
+        VALUES ('delete', OLD.id, OLD.description, OLD.category);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_search_update
+    AFTER UPDATE OF description, category ON transactions BEGIN
+        INSERT INTO transactions_fts (transactions_fts, rowid, description, category)
+        VALUES ('delete', OLD.id, OLD.description, OLD.category);
+        INSERT INTO transactions_fts (rowid, description, category)
+        VALUES (NEW.id, NEW.description, NEW.category);
+    END
+    ''',
+]
+
+def _rebuild_summary(conn: sqlite3.Connection, schema: str = "main") -> None:
+    """
+    Recomputes the summary table of one database (main, or an attached partition) from
+    its transactions, on the given (writer) connection.
+    """
+    conn.execute(f"DELETE FROM {schema}.monthly_category_totals")
+    conn.execute(f'''
+        INSERT INTO {schema}.monthly_category_totals
+            (month_key, category, amount, count)
+        SELECT COALESCE(month_key, 0), COALESCE(category, ''), SUM(COALESCE(amount, 0)),
+               COUNT(*)
+        FROM {schema}.transactions GROUP BY 1, 2
+    ''')
+
+def rebuild_summary() -> None:
+    """
+    Rebuilds the monthly/category summary table from the transactions table.
+    For a partitioned database, each partition's summary is rebuilt and the catalog's is
+    their sum.
+    """
+    with _writer() as conn:
+        if not get_connection_manager().partitioned:
+            _rebuild_summary(conn)
+        else:
+            conn.execute("DELETE FROM main.monthly_category_totals")
+            for schema in partitions.sources(conn, writable=True):
+                _rebuild_summary(conn, schema)
+                conn.execute(f'''
+                    INSERT INTO main.monthly_category_totals
+                        (month_key, category, amount, count)
+                    SELECT month_key, category, amount, count
+                    FROM {schema}.monthly_category_totals WHERE true
+                    ON CONFLICT (month_key, category) DO UPDATE
+                    SET amount = amount + excluded.amount,
+                        count = count + excluded.count
+                ''')
+    _bump_generation()
+
+def _partitioned_summary_rows() -> list[tuple[str, str, float, float, int, int]]:
+    """
+    check_summary for a partitioned database: the catalog's summary against the
+    transactions of every partition, grouped one partition at a time (so not in a
+    single snapshot). Returns (month, category, summary amount, actual amount, summary
+    count, actual count) rows.
+    """
+    actual: dict[tuple[int, str], tuple[float, int]] = {}
+    with _reader() as conn:
+        for schema in partitions.sources(conn):
+            for month_key, category, amount, count in conn.execute(f'''
+                SELECT COALESCE(month_key, 0), COALESCE(category, ''),
+                       SUM(COALESCE(amount, 0)), COUNT(*)
+                FROM {schema}.transactions GROUP BY 1, 2
+            '''):
+                total, rows_so_far = actual.get((month_key, category), (0.0, 0))
+                actual[(month_key, category)] = (total + amount, rows_so_far + count)
+        summary: dict[tuple[int, str], tuple[float, int]] = {
+            (month_key, category): (amount, count)
+            for month_key, category, amount, count in conn.execute(
+                "SELECT month_key, category, amount, count"
+                " FROM main.monthly_category_totals"
+            )
+        }
+
+    rows = []
+    for key in sorted(actual.keys() | summary.keys()):
+        summary_amount, summary_count = summary.get(key, (0.0, 0))
+        actual_amount, actual_count = actual.get(key, (0.0, 0))
+        rows.append((month_label(key[0]), key[1], summary_amount, actual_amount,
+                     summary_count, actual_count))
+    return rows
+
+def check_summary(tolerance: float = 0.005) -> list[tuple[str, str, float, float]]:
+    """
+    Compares the summary table with a fresh aggregation of the transactions table.
+    Returns (month, category, summary amount, actual amount) for every group that
+    differs by more than tolerance or whose row count differs; an empty list means the
+    summary is consistent.
+    """
+    query = f'''
+        WITH actual AS (
+            SELECT COALESCE(month_key, 0) AS month_key,
+                   COALESCE(category, '') AS category,
+                   SUM(COALESCE(amount, 0)) AS amount, COUNT(*) AS count
+            FROM transactions GROUP BY 1, 2
+        )
+        SELECT {month_label_sql("a.month_key")}, a.category, COALESCE(s.amount, 0),
+               a.amount, COALESCE(s.count, 0), a.count
+        FROM actual a LEFT JOIN monthly_category_totals s
+            ON s.month_key = a.month_key AND s.category = a.category
+        UNION ALL
+        SELECT {month_label_sql("s.month_key")}, s.category, s.amount, 0, s.count, 0
+        FROM monthly_category_totals s
+        WHERE NOT EXISTS (SELECT 1 FROM actual a
+                          WHERE a.month_key = s.month_key AND a.category = s.category)
+    '''
+    if get_connection_manager().partitioned:
+        rows = _partitioned_summary_rows()
+    else:
+        with consistent_read(), _reader() as conn:
+            rows = conn.execute(query).fetchall()
+    return [
+        (month, category, summary_amount, actual_amount)
+        for month, category, summary_amount, actual_amount, summary_count, actual_count
+        in rows
+        if abs(summary_amount - actual_amount) > tolerance
+        or summary_count != actual_count
+    ]
+
+# --- Schema migrations ---
+# Each migration upgrades the schema by one version and is recorded in PRAGMA
+# user_version. Never edit a migration that has shipped; append a new one instead so
+# existing files upgrade in place.
+
+def _migration_create_transactions(conn: sqlite3.Connection) -> None:
+    """
+    Version 1: the original 'transactions' table (a no-op for databases created before
+    migrations).
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY,
+            date TEXT,
+            amount REAL,
+            category TEXT,
+            description TEXT
+        )
+    ''')
+
+def _migration_add_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Version 2: indexes for the newest-first listing and per-category grouping, then
+    fresh planner stats.
+    """
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_date_id"
+                 " ON transactions (date DESC, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_category_date"
+                 " ON transactions (category, date)")
+    conn.execute("ANALYZE")
+
+def _migration_add_content_hash(conn: sqlite3.Connection) -> None:
+    """
+    Version 3: a content hash per row (backfilled for existing rows) so imports can skip
+    duplicates.
+    """
+    conn.execute("ALTER TABLE transactions ADD COLUMN content_hash TEXT")
+    conn.create_function("transaction_hash", 4, transaction_hash, deterministic=True)
+    conn.execute("UPDATE transactions SET content_hash ="
+                 " transaction_hash(date, amount, category, description)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_content_hash"
+                 " ON transactions (content_hash)")
+
+# The version 4 summary, keyed by the 'YYYY-MM' prefix of the old text dates (replaced
+# in version 5)
+_V4_SUMMARY_TRIGGERS = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_summary_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO monthly_category_totals (month, category, amount, count)
+        VALUES (substr(NEW.date, 1, 7), COALESCE(NEW.category, ''),
+                COALESCE(NEW.amount, 0), 1)
+        ON CONFLICT (month, category)
+        DO UPDATE SET amount = amount + excluded.amount, count = count + 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_summary_delete AFTER DELETE ON transactions BEGIN
+        UPDATE monthly_category_totals
+        SET amount = amount - COALESCE(OLD.amount, 0), count = count - 1
+        WHERE month = substr(OLD.date, 1, 7) AND category = COALESCE(OLD.category, '');
+        DELETE FROM monthly_category_totals
+        WHERE month = substr(OLD.date, 1, 7) AND category = COALESCE(OLD.category, '')
+          AND count <= 0;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_summary_update
+    AFTER UPDATE OF date, amount, category ON transactions BEGIN
+        UPDATE monthly_category_totals
+        SET amount = amount - COALESCE(OLD.amount, 0), count = count - 1
+        WHERE month = substr(OLD.date, 1, 7) AND category = COALESCE(OLD.category, '');
+        DELETE FROM monthly_category_totals
+        WHERE month = substr(OLD.date, 1, 7) AND category = COALESCE(OLD.category, '')
+          AND count <= 0;
+        INSERT INTO monthly_category_totals (month, category, amount, count)
+        VALUES (substr(NEW.date, 1, 7), COALESCE(NEW.category, ''),
+                COALESCE(NEW.amount, 0), 1)
+        ON CONFLICT (month, category)
+        DO UPDATE SET amount = amount + excluded.amount, count = count + 1;
+    END
+    ''',
+]
+
+def _migration_add_summary_table(conn: sqlite3.Connection) -> None:
+    """
+    Version 4: a per-month, per-category summary table kept current by triggers, filled
+    from existing rows.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_category_totals (
+            month TEXT NOT NULL,
+            category TEXT NOT NULL,
+            amount REAL NOT NULL DEFAULT 0,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, category)
+        ) WITHOUT ROWID
+    ''')
+    for statement in _V4_SUMMARY_TRIGGERS:
+        conn.execute(statement)
+    conn.execute('''
+        INSERT INTO monthly_category_totals (month, category, amount, count)
+        SELECT substr(date, 1, 7), COALESCE(category, ''), SUM(COALESCE(amount, 0)),
+               COUNT(*)
+        FROM transactions GROUP BY 1, 2
+    ''')
+
+def _legacy_day(value: Any) -> Optional[int]:
+    """
+    Day number of a date stored as text before version 5: ISO, or day-first
+    ('DD-MM-YYYY' / 'DD/MM/YYYY'). Returns None if it can't be read as a date.
+    """
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        return to_day(text)
+    except ValueError:
+        pass
+    for pattern in ("%d-%m-%Y", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(text, pattern).toordinal() - _EPOCH_ORDINAL
+        except ValueError:
+            continue
+    return None
+
+def _migration_typed_dates(conn: sqlite3.Connection) -> None:
+    """
+    Version 5: dates stored as day numbers with a generated, indexed month key. The
+    table is rebuilt (generated columns can't be added in place) and the summary is
+    re-keyed by month_key. Dates that can't be read are kept as NULL and summarised
+    under month key 0.
+    """
+    conn.execute(f'''
+        CREATE TABLE transactions_v5 (
+            id INTEGER PRIMARY KEY,
+            day INTEGER,
+            amount REAL,
+            category TEXT,
+            description TEXT,
+            content_hash TEXT,
+            month_key INTEGER GENERATED ALWAYS AS ({MONTH_KEY_SQL}) STORED,
+            date TEXT GENERATED ALWAYS AS ({DATE_SQL}) VIRTUAL
+        )
+    ''')
+    # SQLite converts the valid ISO dates itself; anything else goes through _legacy_day
+    conn.create_function("legacy_day", 1, _legacy_day, deterministic=True)
+    conn.execute('''
+        INSERT INTO transactions_v5
+            (id, day, amount, category, description, content_hash)
+        SELECT id,
+               CASE WHEN date(date) = date
+                    THEN CAST(julianday(date) - 2440587.5 AS INTEGER)
+                    ELSE legacy_day(date) END,
+               amount, category, description, content_hash
+        FROM transactions
+    ''')
+    conn.execute("DROP TABLE transactions") # Also drops its indexes and triggers
+    conn.execute("ALTER TABLE transactions_v5 RENAME TO transactions")
+
+    conn.execute("CREATE INDEX idx_transactions_day_id ON transactions (day DESC, id)")
+    conn.execute("CREATE INDEX idx_transactions_sort_day_id"
+                 f" ON transactions ({SORT_DAY_SQL} DESC, id)")
+    conn.execute("CREATE INDEX idx_transactions_category_day"
+                 " ON transactions (category, day)")
+    conn.execute("CREATE INDEX idx_transactions_month_key"
+                 " ON transactions (month_key, category)")
+    conn.execute("CREATE INDEX idx_transactions_content_hash"
+                 " ON transactions (content_hash)")
+
+    conn.execute("DROP TABLE monthly_category_totals")
+    conn.execute('''
+        CREATE TABLE monthly_category_totals (
+            month_key INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            amount REAL NOT NULL DEFAULT 0,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (month_key, category)
+        ) WITHOUT ROWID
+    ''')
+    for statement in SUMMARY_TRIGGERS:
+        conn.execute(statement)
+    _rebuild_summary(conn)
+    conn.execute("ANALYZE")
+
+def _migration_search_index(conn: sqlite3.Connection) -> None:
+    """
+    Version 6: a full-text index over descriptions and categories, kept current by
+    triggers, filled from existing rows.
+    """
+    conn.execute('''
+        CREATE VIRTUAL TABLE transactions_fts USING fts5(
+            description, category,
+            content='transactions', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    ''')
+    # Description matches count double
+    conn.execute("INSERT INTO transactions_fts (transactions_fts, rank)"
+                 " VALUES ('rank', 'bm25(2.0, 1.0)')")
+    for statement in SEARCH_TRIGGERS:
+        conn.execute(statement)
+    conn.execute("INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild')")
+
+def _migration_add_amount_index(conn: sqlite3.Connection) -> None:
+    """
+    Version 7: an index on amount, for amount range filters.
+    """
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_amount"
+                 " ON transactions (amount)")
+
+def _migration_add_sort_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Version 8: an index on (sort expression, id) for the amount, category and
+    description orders, so the transaction list pages through them by keyset like the
+    date order.
+    """
+    for column in ("amount", "category", "description"):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_transactions_sort_{column}_id "
+                     f"ON transactions ({SORT_EXPRESSIONS[column]} DESC, id)")
+
+# Ordered list of migrations; the position in the list (starting at 1) is the schema
+# version
+MIGRATIONS = [
+    _migration_create_transactions,
+    _migration_add_indexes,
+    _migration_add_content_hash,
+    _migration_add_summary_table,
+    _migration_typed_dates,
+    _migration_search_index,
+    _migration_add_amount_index,
+    _migration_add_sort_indexes,
+]
+
+def get_schema_version() -> int:
+    """
+    Returns the schema version recorded in the database file.
+    """
+    with _reader() as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Applies the pending migrations to the database open on conn and returns its new
+    version.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS, start=1):
+        if number <= version:
+            continue
+        conn.execute("BEGIN")
+        try:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = number
+    return version
+
+def migrate() -> int:
+    """
+    Applies any pending migrations, each in its own transaction (to every partition too,
+    if partitioned).
+    Returns the schema version after migrating.
+    """
+    with _writer() as conn:
+        version = apply_migrations(conn)
+
+    manager = get_connection_manager()
+    if manager.partitioned:
+        with _reader() as conn:
+            files = [file for (file,) in conn.execute(
+                "SELECT file FROM main.partitions ORDER BY year"
+            )]
+        for file in files:
+            partitions.create_partition(manager, file)
+    return version
+
 def initialise_database() -> None:
     """
-    Creates the SQLite database and a 'transactions' table if it doesn't already exist.
+    Creates the SQLite database if needed and upgrades its schema to the latest version.
+    """
+    migrate()
+
+def add_transaction(date: str, amount: float, category: str, description: str) -> int:
+    """
+    Inserts a new transaction record into the database (date is ISO, 'YYYY-MM-DD').
+    Returns the new transaction's id.
     """
-    with sqlite3.connect(DB_NAME) as conn:
+    day = to_day(date)
+    content_hash = transaction_hash(date, amount, category, description)
+    with _writer() as conn:
+        schema, new_id = "main", None
+        if get_connection_manager().partitioned:
+            schema = partitions.writable_partition(conn, partitions.year_of(day))
+            new_id = partitions.allocate_ids(conn, 1)
         cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY,
-                date TEXT,
-                amount REAL,
-                category TEXT,
-                description TEXT
-            )
-        ''')
+        cursor.execute(f'''
+            INSERT INTO {schema}.transactions
+                (id, day, amount, category, description, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (new_id, day, amount, category, description, content_hash))
+        new_id = cursor.lastrowid
+    _bump_generation()
+    return new_id # type: ignore[return-value]
+
+def validate_transaction(date: Any, amount: Any, category: Any,
+                         description: Any = "") -> Optional[str]:
+    """
+    Checks a single transaction like validate_transactions does (without needing
+    pandas). Returns the reason it's invalid, or None if it can be stored. Dates must be
+    ISO ('YYYY-MM-DD').
+    """
+    if any(value is None or str(value).strip() == ""
+           for value in (date, amount, category)):
+        return "All fields must be filled in."
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        return "Amount must be a number."
+    if amount != amount: # NaN
+        return "Amount must be a number."
+    if amount < 0:
+        return "Amount must be a positive number."
+    try:
+        Date.fromisoformat(str(date))
+    except ValueError:
+        return "Date must be a valid date."
+    if str(description or "").isnumeric():
+        return "Description must not be a number."
+    return None
+
+class BulkInsertResult(NamedTuple):
+    """
+    Outcome of add_transactions: how many rows were written, their id range,
+    and a (row position, reason) pair for every rejected row.
+    """
+    inserted: int
+    first_id: Optional[int]
+    last_id: Optional[int]
+    rejected: list[tuple[int, str]]
+
+def validate_transactions(batch: pd.DataFrame
+                          ) -> tuple[pd.DataFrame, list[tuple[int, str]]]:
+    """
+    Vectorised version of the form checks in submit_transaction.
+    Returns the clean rows (ISO dates, float amounts, plus each date's day number in
+    'day') and (index, reason) pairs for the rejected rows.
+    """
+    import pandas as pd
+
+    batch = batch.reindex(columns=TRANSACTION_COLUMNS)
+
+    def is_blank(column: pd.Series) -> pd.Series:
+        return column.isna() | (column.astype(str).str.strip() == "")
+
+    missing = (is_blank(batch["date"]) | is_blank(batch["amount"])
+               | is_blank(batch["category"]))
+    amounts = pd.to_numeric(batch["amount"], errors="coerce")
+    dates = pd.to_datetime(batch["date"], errors="coerce", format="ISO8601")
+    descriptions = batch["description"].fillna("").astype(str)
+
+    # Checks run from lowest to highest priority, so each row keeps the same message the
+    # form would show
+    reasons = pd.Series(None, index=batch.index, dtype=object)
+    checks = [
+        (descriptions.str.isnumeric(), "Description must not be a number."),
+        (dates.isna(), "Date must be a valid date."),
+        (amounts < 0, "Amount must be a positive number."),
+        (amounts.isna(), "Amount must be a number."),
+        (missing, "All fields must be filled in."),
+    ]
+    for mask, reason in checks:
+        reasons[mask] = reason
+
+    valid = reasons.isna()
+    clean = pd.DataFrame({
+        "date": dates[valid].dt.strftime("%Y-%m-%d"),
+        "amount": amounts[valid].astype(float),
+        "category": batch.loc[valid, "category"].astype(str),
+        "description": descriptions[valid],
+        "day": dates[valid].to_numpy().astype("datetime64[D]").astype("int64"),
+    })
+    rejected_reasons = reasons[~valid]
+    rejected = [(int(index), str(reason))
+                for index, reason in zip(rejected_reasons.index.to_numpy(),
+                                         rejected_reasons)]
+    return clean, rejected
+
+def _iter_batches(rows: Any, batch_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Splits a DataFrame or any iterable of rows (tuples in TRANSACTION_COLUMNS order, or
+    dicts) into DataFrames of at most batch_size rows, indexed by their position in the
+    input.
+    """
+    import pandas as pd
+
+    if isinstance(rows, pd.DataFrame):
+        for start in range(0, len(rows), batch_size):
+            chunk = rows.iloc[start:start + batch_size]
+            yield chunk.set_axis(range(start, start + len(chunk)))
+        return
+
+    iterator = iter(rows)
+    start = 0
+    while True:
+        chunk_rows = list(islice(iterator, batch_size))
+        if not chunk_rows:
+            return
+        if isinstance(chunk_rows[0], dict):
+            chunk = pd.DataFrame.from_records(chunk_rows)
+        else:
+            chunk = pd.DataFrame.from_records(chunk_rows, columns=TRANSACTION_COLUMNS)
+        yield chunk.set_axis(range(start, start + len(chunk)))
+        start += len(chunk)
 
-def add_transaction(date: str, amount: float, category: str, description: str) -> None:
+def _find_duplicates(cursor: sqlite3.Cursor, clean: pd.DataFrame, seen: Counter[str],
+                     schema: str = "main") -> pd.Series:
     """
-    Inserts a new transaction record into the database.
+    Flags rows that are already stored, matching identical rows by occurrence rather
+    than by hash alone: the k-th copy of a row in an import is a duplicate only if at
+    least k copies were stored before it began. seen counts the copies of each hash read
+    earlier in the same import and is updated in place.
     """
-    with sqlite3.connect(DB_NAME) as conn:
+    hashes = clean["content_hash"]
+    stored = dict(cursor.execute(f'''
+        SELECT content_hash, COUNT(*) FROM {schema}.transactions
+        WHERE content_hash IN (SELECT value FROM json_each(?))
+        GROUP BY content_hash
+    ''', (json.dumps(hashes.unique().tolist()),)))
+
+    # Copies this import inserted are stored too, so (stored > occurrence) holds only
+    # for copies that predate it
+    occurrence = (hashes.groupby(hashes).cumcount()
+                  + hashes.map(lambda value: seen[value]))
+    seen.update(hashes)
+    return occurrence < hashes.map(lambda value: stored.get(value, 0))
+
+def add_transactions(rows: Iterable[Any] | pd.DataFrame,
+                     batch_size: int = BULK_BATCH_SIZE, skip_duplicates: bool = False,
+                     seen: Optional[Counter[str]] = None) -> BulkInsertResult:
+    """
+    Inserts many transactions in a single database transaction, batch_size rows per
+    executemany() call. Accepts a DataFrame or any iterable of rows (tuples or dicts
+    with the TRANSACTION_COLUMNS fields). Invalid rows (and, with skip_duplicates, rows
+    already in the database) are skipped and reported instead of aborting the whole
+    import. Identical rows within an import are all kept unless the database already
+    held that many copies; pass the same seen Counter to calls that make up one import.
+    In a partitioned database each row goes to its year's partition; an import spanning
+    more years than partitions.MAX_ATTACHED_PARTITIONS is committed in several steps.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    partitioned = get_connection_manager().partitioned
+    inserted = 0
+    rejected: list[tuple[int, str]] = []
+    seen = Counter() if seen is None else seen
+    insert_columns = ["id", "day", "amount", "category", "description", "content_hash"]
+    with _writer() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO transactions (date, amount, category, description)
-            VALUES (?, ?, ?, ?)
-        ''', (date, amount, category, description))
-        conn.commit()
+        if partitioned:
+            first_id = cursor.execute(
+                "SELECT next_id FROM main.partition_ids"
+            ).fetchone()[0]
+        else:
+            first_id = cursor.execute(
+                "SELECT COALESCE(MAX(id), 0) + 1 FROM transactions"
+            ).fetchone()[0]
+
+        for batch in _iter_batches(rows, batch_size):
+            clean, batch_rejected = validate_transactions(batch)
+            rejected.extend(batch_rejected)
+            clean["content_hash"] = [
+                transaction_hash(*row)
+                for row in clean[TRANSACTION_COLUMNS].itertuples(index=False, name=None)
+            ]
+            clean["id"] = None
+
+            # Duplicates share a date, so they always land in the same partition
+            groups: Iterable[tuple[Any, pd.DataFrame]]
+            if partitioned and not clean.empty:
+                groups = clean.groupby(clean["date"].str[:4].astype(int))
+            else:
+                groups = [(None, clean)]
+            for year, group in groups:
+                if year is None:
+                    schema = "main"
+                else:
+                    schema = partitions.writable_partition(conn, year)
+
+                # Earlier batches are already inserted (uncommitted) on this connection,
+                # so they are checked too
+                if skip_duplicates and not group.empty:
+                    duplicates = _find_duplicates(cursor, group, seen, schema)
+                    rejected.extend((int(index), DUPLICATE_REASON)
+                                    for index in group.index[duplicates])
+                    group = group[~duplicates]
+                if year is not None:
+                    first = partitions.allocate_ids(conn, len(group))
+                    group = group.assign(id=range(first, first + len(group)))
 
-def get_all_transactions() -> pd.DataFrame:
+                cursor.executemany(f'''
+                    INSERT INTO {schema}.transactions ({", ".join(insert_columns)})
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', group[insert_columns].itertuples(index=False, name=None))
+                inserted += len(group)
+
+        # Rows inserted in one call get consecutive ids after the previous maximum (or
+        # the catalog's next id)
+        if not inserted:
+            return BulkInsertResult(0, None, None, sorted(rejected))
+        if partitioned:
+            last_id = cursor.execute(
+                "SELECT next_id - 1 FROM main.partition_ids"
+            ).fetchone()[0]
+        else:
+            last_id = cursor.execute("SELECT MAX(id) FROM transactions").fetchone()[0]
+    _bump_generation()
+    return BulkInsertResult(inserted, first_id, last_id, sorted(rejected))
+def get_all_transactions(filters: Optional[TransactionFilter] = None) -> pd.DataFrame:
+    """
+    Retrieves all transactions (or those matching filters) from the database as a pandas
+    DataFrame. Returns the dataframe with the transaction records, ordered by date
+    descending (oldest id first on ties).
+    """
+    import pandas as pd
+
+    where, params = _filter_clause(filters)
+    with _reader() as conn:
+        frames = [
+            pd.read_sql(f"SELECT {', '.join(OUTPUT_COLUMNS)} FROM {schema}.transactions"
+                        f"{where} ORDER BY day DESC, id", conn, params=params)
+            for schema in partitions.sources(conn, filters, newest_first=True)
+        ]
+    # Partitions with no matching rows are left out: concatenating empty frames is
+    # deprecated in pandas
+    frames = [frame for frame in frames if not frame.empty] or frames[:1]
+    if len(frames) == 1:
+        return frames[0]
+    if not frames:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+class TransactionFilter(NamedTuple):
     """
-    Retrieves all transactions from the database as a pandas DataFrame.
-    Returns the dataframe with all transaction records, ordered by date descending.
+    Optional restrictions applied in SQL by the filtered readers.
+    Dates are inclusive ISO strings ('YYYY-MM-DD'); categories is a collection of
+    category names; min_amount and max_amount are inclusive bounds on the amount.
     """
-    with sqlite3.connect(DB_NAME) as conn:
-        return pd.read_sql('SELECT * FROM transactions ORDER BY date DESC', conn)
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    categories: Optional[tuple[str, ...]] = None
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+
+    @property
+    def has_amounts(self) -> bool:
+        return self.min_amount is not None or self.max_amount is not None
+
+def _filter_clause(filters: Optional[TransactionFilter],
+                   prefix: str = "") -> tuple[str, list[Any]]:
+    """
+    Builds a WHERE clause (or an empty string) and its parameters for the given filter.
+    prefix qualifies the column names (e.g. 't.') when the transactions table is joined.
+    """
+    if filters is None:
+        return "", []
+
+    conditions: list[str] = []
+    params: list[Any] = []
+    if filters.start_date:
+        conditions.append(f"{prefix}day >= ?")
+        params.append(to_day(filters.start_date))
+    if filters.end_date:
+        conditions.append(f"{prefix}day <= ?")
+        params.append(to_day(filters.end_date))
+    if filters.categories is not None:
+        placeholders = ",".join("?" * len(filters.categories))
+        conditions.append(f"{prefix}category IN ({placeholders})")
+        params.extend(filters.categories)
+    if filters.min_amount is not None:
+        conditions.append(f"{prefix}amount >= ?")
+        params.append(filters.min_amount)
+    if filters.max_amount is not None:
+        conditions.append(f"{prefix}amount <= ?")
+        params.append(filters.max_amount)
+
+    if not conditions:
+        return "", []
+    return " WHERE " + " AND ".join(conditions), params
+
+def count_transactions(filters: Optional[TransactionFilter] = None) -> int:
+    """
+    Returns how many transactions match the filter (counted from the summary table when
+    it can answer).
+    """
+    with _reader() as conn:
+        return sum(
+            conn.execute(
+                f"SELECT COALESCE({'SUM(count)' if summary else 'COUNT(*)'}, 0)"
+                f" FROM {table}{where}",
+                params,
+            ).fetchone()[0]
+            for table, where, params, summary in _aggregate_sources(conn, filters)
+        )
+
+# Columns the transaction list can be sorted by
+SORTABLE_COLUMNS = ("id", "date", "amount", "category", "description")
+
+def _order_clause(sort_by: str, descending: bool) -> str:
+    """
+    Builds an ORDER BY clause for the given column (by its SORT_EXPRESSIONS entry, so
+    the index on it is used). Ties are broken by id in the opposite direction, so the
+    default (date, descending) matches get_all_transactions.
+    """
+    if sort_by not in SORTABLE_COLUMNS:
+        raise ValueError(f"Cannot sort by '{sort_by}'. "
+                         f"Choose from: {', '.join(SORTABLE_COLUMNS)}.")
+    if sort_by == "id":
+        return f" ORDER BY id {'DESC' if descending else 'ASC'}"
+    expression = SORT_EXPRESSIONS[sort_by]
+    return (f" ORDER BY {expression} {'DESC' if descending else 'ASC'},"
+            f" id {'ASC' if descending else 'DESC'}")
+
+def get_transactions_slice(offset: int, limit: int, sort_by: str = "date",
+                           descending: bool = True,
+                           filters: Optional[TransactionFilter] = None) -> list[tuple]:
+    """
+    Returns up to limit rows (OUTPUT_COLUMNS) starting at position offset in the
+    requested ordering. Used by the transaction list to fetch only the rows around what
+    is on screen after a jump. A position has no key to seek from, so the rows before it
+    are skipped with OFFSET (walking the sort index, at a cost that grows with offset);
+    get_transactions_page seeks from a known row instead.
+    """
+    where, params = _filter_clause(filters)
+    order = _order_clause(sort_by, descending)
+    offset = max(offset, 0)
+
+    def select(schema: str) -> str:
+        return (f"SELECT {', '.join(OUTPUT_COLUMNS)} FROM {schema}.transactions"
+                f"{where}{order} LIMIT ?")
+
+    with _reader() as conn:
+        if not get_connection_manager().partitioned:
+            return conn.execute(select("main") + " OFFSET ?",
+                                params + [limit, offset]).fetchall()
+
+        if sort_by == "date":
+            # Partitions hold whole years, so date order is partition order: skip whole
+            # partitions by count
+            rows: list[tuple] = []
+            for schema in partitions.sources(conn, filters, newest_first=descending):
+                if offset:
+                    count = conn.execute(
+                        f"SELECT COUNT(*) FROM {schema}.transactions{where}", params
+                    ).fetchone()[0]
+                    if count <= offset:
+                        offset -= count
+                        continue
+                rows += conn.execute(select(schema) + " OFFSET ?",
+                                     params + [limit - len(rows), offset]).fetchall()
+                offset = 0
+                if len(rows) >= limit:
+                    break
+            return rows
+
+        # Other orders interleave the partitions: merge the first offset + limit rows of
+        # each
+        runs = [conn.execute(select(schema), params + [offset + limit]).fetchall()
+                for schema in partitions.sources(conn, filters)]
+    merged = heapq.merge(*runs, key=_sort_key(sort_by), reverse=descending)
+    return list(islice(merged, offset, offset + limit))
+
+def _sort_key(sort_by: str) -> Callable[[tuple], tuple]:
+    """
+    Python sort key matching _order_clause for OUTPUT_COLUMNS rows (missing values
+    first, ties by id reversed).
+    """
+    column = OUTPUT_COLUMNS.index(sort_by)
+    if sort_by == "id":
+        return lambda row: (row[0],)
+    return lambda row: (_sort_value(sort_by, row[column]), -row[0])
+
+class TransactionPage(NamedTuple):
+    """
+    One page of transactions in the requested order (by default ledger order: newest
+    date first, oldest id first on ties, undated rows last).
+    first_key/last_key are the (sort column value, id) keys to pass as 'after' for the
+    previous/next page.
+    """
+    rows: list[tuple]
+    first_key: Optional[tuple[Any, int]]
+    last_key: Optional[tuple[Any, int]]
+    # True if more rows exist beyond this page in the direction it was fetched
+    has_more: bool
+
+def get_transactions_page(after: Optional[tuple[Any, int]] = None, limit: int = 50,
+                          direction: str = "next",
+                          filters: Optional[TransactionFilter] = None,
+                          sort_by: str = "date",
+                          descending: bool = True) -> TransactionPage:
+    """
+    Returns a page of transactions using a keyset seek on the sort column's (value, id)
+    index instead of OFFSET, so page N costs the same as page 1. Keys are (value in the
+    sort column, id); rows missing the value (e.g. undated rows) sort lowest, and their
+    keys have None as the value.
+    'next' returns the rows that follow the key after (or the first page if after is
+    None); 'prev' returns the rows that precede it (or the last page). Rows are always
+    in the requested order.
+    """
+    if direction not in ("next", "prev"):
+        raise ValueError("direction must be 'next' or 'prev'")
+
+    # Rows are fetched moving away from the key, so a 'prev' page is read in reverse
+    # order
+    fetch_descending = descending if direction == "next" else not descending
+    order = _order_clause(sort_by, fetch_descending)
+    where, params = _filter_clause(filters)
+    conditions = [where[len(" WHERE "):]] if where else []
+    if after is not None:
+        after_value, after_id = after
+        value_op, id_op = ("<", ">") if fetch_descending else (">", "<")
+        if sort_by == "id":
+            conditions.append(f"id {value_op} ?")
+            params = params + [after_id]
+        else:
+            expression = SORT_EXPRESSIONS[sort_by]
+            value = _sort_value(sort_by, after_value)
+            conditions.append(f"{expression} {value_op}= ?"
+                              f" AND ({expression} {value_op} ? OR id {id_op} ?)")
+            params = params + [value, value, after_id]
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+    def select(schema: str) -> str:
+        return (f"SELECT {', '.join(OUTPUT_COLUMNS)} FROM {schema}.transactions"
+                f"{where}{order} LIMIT ?")
+
+    # Partitions hold whole years (undated rows in year 0), so in date order they're
+    # read in page order, skipping those beyond the key. Undated rows follow every dated
+    # key unless the filter has dates.
+    bounds = filters or TransactionFilter()
+    undated = not (bounds.start_date or bounds.end_date)
+    if after is not None and sort_by == "date":
+        if fetch_descending:
+            bounds = bounds._replace(end_date=after[0])
+        else:
+            bounds = bounds._replace(start_date=after[0])
+    rows: list[tuple] = []
+    with _reader() as conn:
+        if sort_by == "date" or not get_connection_manager().partitioned:
+            for schema in partitions.sources(conn, bounds, undated=undated,
+                                             newest_first=fetch_descending):
+                rows += conn.execute(select(schema),
+                                     params + [limit + 1 - len(rows)]).fetchall()
+                if len(rows) > limit:
+                    break
+        else:
+            # Other orders interleave the partitions: merge the first rows of each
+            runs = [conn.execute(select(schema), params + [limit + 1]).fetchall()
+                    for schema in partitions.sources(conn, filters)]
+            merged = heapq.merge(*runs, key=_sort_key(sort_by),
+                                 reverse=fetch_descending)
+            rows = list(islice(merged, limit + 1))
+
+    # One extra row was fetched just to find out whether another page exists
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == "prev":
+        rows.reverse()
+    if not rows:
+        return TransactionPage([], None, None, False)
+    column = OUTPUT_COLUMNS.index(sort_by)
+    return TransactionPage(rows, (rows[0][column], rows[0][0]),
+                           (rows[-1][column], rows[-1][0]), has_more)
+
+def _stream_rows(query: Callable[[str], str], params: list[Any], chunk_size: int,
+                 filters: Optional[TransactionFilter] = None,
+                 newest_first: bool = False) -> Generator[list[tuple], None, None]:
+    """
+    Runs query(schema) on this thread's reader for each source of rows matching filters,
+    in turn, and yields the rows in lists of at most chunk_size.
+    """
+    with _reader() as conn:
+        for schema in partitions.sources(conn, filters, newest_first):
+            cursor = conn.execute(query(schema), params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+
+def iter_transactions(filters: Optional[TransactionFilter] = None,
+                      chunk_size: int = FETCH_CHUNK_SIZE
+                      ) -> Generator[list[tuple], None, None]:
+    """
+    Streams matching transactions (OUTPUT_COLUMNS, newest first) as lists of at most
+    chunk_size rows, so callers never hold the whole ledger in memory.
+    """
+    where, params = _filter_clause(filters)
+    return _stream_rows(lambda schema: f"SELECT {', '.join(OUTPUT_COLUMNS)}"
+                                       f" FROM {schema}.transactions{where}"
+                                       " ORDER BY day DESC, id",
+                        params, chunk_size, filters, newest_first=True)
+
+def iter_stored_transactions(filters: Optional[TransactionFilter] = None,
+                             chunk_size: int = FETCH_CHUNK_SIZE
+                             ) -> Generator[list[tuple], None, None]:
+    """
+    Streams matching transactions as stored, (id, day, amount, category, description) in
+    id order (per partition, oldest year first, if partitioned), for loading into an
+    in-memory store without converting dates to text and back.
+    """
+    where, params = _filter_clause(filters)
+    return _stream_rows(lambda schema: "SELECT id, day, amount, category, description"
+                                       f" FROM {schema}.transactions{where}"
+                                       " ORDER BY id",
+                        params, chunk_size, filters)
+
+def _search_expression(query: str) -> str:
+    """
+    Turns what the user typed into an FTS5 query: every word must match the start of a
+    word in the description or category. Words are quoted, so FTS5 operators and
+    punctuation are taken literally.
+    """
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in query.split())
+
+def search_transactions(query: str, limit: int = 50,
+                        filters: Optional[TransactionFilter] = None) -> list[tuple]:
+    """
+    Returns up to limit transactions (OUTPUT_COLUMNS, optionally restricted by filters)
+    whose description or category contains words starting with each word of query, best
+    match first (BM25, with description matches counting double), then newest first.
+    An empty query matches nothing.
+    """
+    expression = _search_expression(query)
+    if not expression or limit <= 0:
+        return []
+    where, params = _filter_clause(filters, prefix="t.")
+    conditions = f" AND {where[len(' WHERE '):]}" if where else ""
+    columns = ", ".join(f"t.{column}" for column in OUTPUT_COLUMNS)
+    with _reader() as conn:
+        # Each partition ranks its own best matches; scores are merged, so the top rows
+        # are the same as a single search over every year would return up to BM25's
+        # per-file statistics
+        runs = [
+            conn.execute(
+                f"SELECT f.rank, t.day, {columns} FROM {schema}.transactions_fts f "
+                f"JOIN {schema}.transactions t ON t.id = f.rowid "
+                f"WHERE f.transactions_fts MATCH ?{conditions} "
+                "ORDER BY f.rank, t.day DESC, t.id LIMIT ?",
+                [expression] + params + [limit],
+            ).fetchall()
+            for schema in partitions.sources(conn, filters)
+        ]
+    if len(runs) == 1:
+        return [row[2:] for row in runs[0]]
+    merged = heapq.merge(*runs, key=lambda row: (
+        row[0], -row[1] if row[1] is not None else math.inf, row[2]
+    ))
+    return [row[2:] for row in islice(merged, limit)]
 
 def delete_latest_transaction() -> Optional[int]:
     """
     Deletes the most recently added transaction from the database.
-    Returns int or None (ID of the deleted transaction or None if there are no records).
+    Returns int or None (ID of the deleted transaction or None if there are no
+    records).
     """
-    with sqlite3.connect(DB_NAME) as conn:
+    with _writer() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT MAX(id) FROM transactions")
-        result = cursor.fetchone()
-        if result and result[0] is not None:
-            latest_id = result[0]
-            cursor.execute("DELETE FROM transactions WHERE id = ?", (latest_id,))
-            conn.commit()
-            return latest_id
-        return None
+        latest = max(
+            ((cursor.execute(f"SELECT MAX(id) FROM {schema}.transactions")
+              .fetchone()[0], schema)
+             for schema in partitions.sources(conn, writable=True)),
+            key=lambda found: found[0] if found[0] is not None else -1,
+            default=(None, "main"),
+        )
+        latest_id, schema = latest
+        if latest_id is None:
+            return None
+        cursor.execute(f"DELETE FROM {schema}.transactions WHERE id = ?", (latest_id,))
+    _bump_generation()
+    return latest_id
 
 def delete_all_transactions() -> None:
     """
     Deletes all transaction records from the database.
     """
-    with sqlite3.connect(DB_NAME) as conn:
+    with _writer() as conn:
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM transactions")
-        conn.commit()
+        for schema in partitions.sources(conn, writable=True):
+            cursor.execute(f"DELETE FROM {schema}.transactions")
+    _bump_generation()
+
+# Columns update_transactions can change
+EDITABLE_COLUMNS = ("date", "amount", "category", "description")
+
+def _selection_clause(selection: Iterable[int] | TransactionFilter
+                      ) -> Optional[tuple[str, list[Any], Optional[TransactionFilter]]]:
+    """
+    Builds the WHERE clause for a batch operation on a collection of ids or the rows
+    matching a filter. Returns (clause, parameters, filter to narrow the partitions by),
+    or None if no ids were given. Ids are passed as one JSON array, so any number of
+    them fits in a single statement.
+    """
+    if isinstance(selection, TransactionFilter):
+        where, params = _filter_clause(selection)
+        return where, params, selection
+    ids = [int(row_id) for row_id in selection]
+    if not ids:
+        return None
+    return " WHERE id IN (SELECT value FROM json_each(?))", [json.dumps(ids)], None
+
+def delete_transactions(selection: Iterable[int] | TransactionFilter) -> int:
+    """
+    Deletes the transactions with the given ids, or every transaction matching a filter,
+    with one DELETE per database in a single write transaction. Returns how many were
+    deleted.
+    """
+    clause = _selection_clause(selection)
+    if clause is None:
+        return 0
+    where, params, filters = clause
+    with _writer() as conn:
+        deleted = sum(
+            conn.execute(f"DELETE FROM {schema}.transactions{where}", params).rowcount
+            for schema in partitions.sources(conn, filters, writable=True)
+        )
+    if deleted:
+        _bump_generation()
+    return deleted
+
+def update_transactions(selection: Iterable[int] | TransactionFilter,
+                        **changes: Any) -> int:
+    """
+    Sets the given columns (any of EDITABLE_COLUMNS; the date as ISO) on the
+    transactions with the given ids, or on every transaction matching a filter, with one
+    UPDATE per database in a single write transaction. Content hashes are recomputed,
+    and the summary and search index follow via their triggers. Returns how many
+    transactions were changed. Raises ValueError for an unknown column, no changes, or
+    a value add_transaction would reject.
+    """
+    unknown = set(changes) - set(EDITABLE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Cannot update {', '.join(sorted(unknown))}. "
+                         f"Choose from: {', '.join(EDITABLE_COLUMNS)}.")
+    if not changes:
+        raise ValueError("No changes given.")
+    # Check the new values with the usual rules (columns that aren't changing get
+    # stand-ins that pass)
+    reason = validate_transaction(changes.get("date", "1970-01-01"),
+                                  changes.get("amount", 0),
+                                  changes.get("category", "-"),
+                                  changes.get("description", ""))
+    if reason:
+        raise ValueError(reason)
+    if "amount" in changes:
+        changes["amount"] = float(changes["amount"])
+
+    clause = _selection_clause(selection)
+    if clause is None:
+        return 0
+    where, params, filters = clause
+
+    # New value (a parameter) or the current one (the column) of each field, for the
+    # assignments and hash
+    changed = [column for column in EDITABLE_COLUMNS if column in changes]
+    values = {column: "?" if column in changes else column
+              for column in EDITABLE_COLUMNS}
+    new_params = [changes[column] for column in changed]
+    new_day = to_day(changes["date"]) if "date" in changes else None
+    assignments = ", ".join(f"{'day' if column == 'date' else column} = ?"
+                            for column in changed)
+    assignment_params = [new_day if column == "date" else changes[column]
+                         for column in changed]
+    content_hash = f"transaction_hash({', '.join(values.values())})"
+
+    update = f"SET {assignments}, content_hash = {content_hash}{where}"
+    update_params = assignment_params + new_params + params
+    updated = 0
+    with _writer() as conn:
+        conn.create_function("transaction_hash", 4, transaction_hash,
+                             deterministic=True)
+        if not get_connection_manager().partitioned or "date" not in changes:
+            for schema in partitions.sources(conn, filters, writable=True):
+                updated += conn.execute(f"UPDATE {schema}.transactions {update}",
+                                        update_params).rowcount
+        else:
+            # Rows already in the new date's year are updated in place; the others move
+            # to that year's partition (keeping their ids), after it's been updated so
+            # they aren't counted twice
+            year = partitions.year_of(new_day)
+            target = partitions.writable_partition(conn, year)
+            updated += conn.execute(f"UPDATE {target}.transactions {update}",
+                                    update_params).rowcount
+            for schema in partitions.sources(conn, filters, writable=True):
+                if schema == target:
+                    continue
+                # Re-attached if it was detached to make room
+                target = partitions.writable_partition(conn, year)
+                updated += conn.execute(
+                    f"INSERT INTO {target}.transactions"
+                    " (id, day, amount, category, description, content_hash)"
+                    f" SELECT id, {', '.join(values.values())}, {content_hash}"
+                    f" FROM {schema}.transactions{where}",
+                    update_params,
+                ).rowcount
+                conn.execute(f"DELETE FROM {schema}.transactions{where}", params)
+    if updated:
+        _bump_generation()
+    return updated
+
+def _summary_filter_clause(filters: Optional[TransactionFilter]
+                           ) -> Optional[tuple[str, list[Any]]]:
+    """
+    Translates a filter into a WHERE clause over the summary table, or returns None if
+    the summary can't answer it exactly (a date range that starts or ends part-way
+    through a month, or an amount range).
+    """
+    if filters is None:
+        return "", []
+    if filters.has_amounts:
+        return None
+
+    conditions: list[str] = []
+    params: list[Any] = []
+    if filters.start_date:
+        if Date.fromisoformat(filters.start_date[:10]).day != 1:
+            return None
+        conditions.append("month_key >= ?")
+        params.append(to_month_key(filters.start_date))
+    if filters.end_date:
+        end = Date.fromisoformat(filters.end_date[:10])
+        if end.day != calendar.monthrange(end.year, end.month)[1]:
+            return None
+        conditions.append("month_key <= ?")
+        params.append(to_month_key(filters.end_date))
+        if not filters.start_date:
+            # Undated rows (key 0) don't match a date range
+            conditions.append("month_key > 0")
+    if filters.categories is not None:
+        conditions.append(f"category IN ({','.join('?' * len(filters.categories))})")
+        params.extend(filters.categories)
+
+    if not conditions:
+        return "", []
+    return " WHERE " + " AND ".join(conditions), params
+
+def _aggregate_sources(conn: sqlite3.Connection, filters: Optional[TransactionFilter]
+                       ) -> Iterator[tuple[str, str, list[Any], bool]]:
+    """
+    Picks where aggregates are read from: the summary table when it can answer the
+    filter (in a partitioned database, the catalog's, which covers every year),
+    otherwise the transactions table of each source overlapping the filter. Both have a
+    month_key column to group by.
+    Yields (table, WHERE clause, parameters, whether it's the summary table).
+    """
+    summary = _summary_filter_clause(filters)
+    if summary is not None:
+        yield "main.monthly_category_totals", summary[0], summary[1], True
+        return
+    where, params = _filter_clause(filters)
+    for schema in partitions.sources(conn, filters):
+        yield f"{schema}.transactions", where, params, False
+
+def _grouped_totals(columns: str, filters: Optional[TransactionFilter]
+                    ) -> dict[tuple, float]:
+    """
+    Total amount per distinct value of columns ('month_key', 'category' or both), keyed
+    by tuples. Sources are grouped in SQL and their partial totals added up.
+    """
+    totals: dict[tuple, float] = {}
+    with _reader() as conn:
+        for table, where, params, _ in _aggregate_sources(conn, filters):
+            for *key, amount in conn.execute(
+                f"SELECT {columns}, SUM(amount) FROM {table}{where} GROUP BY {columns}",
+                params,
+            ):
+                totals[tuple(key)] = totals.get(tuple(key), 0.0) + (amount or 0.0)
+    return totals
 
-def get_total_amount() -> float:
+def get_total_amount(filters: Optional[TransactionFilter] = None) -> float:
     """
-    Calculates the total sum of all transaction amounts.
+    Calculates the total sum of all transaction amounts (optionally only those matching
+    the filter, e.g. a date range).
     Returns float (Total amount spent or 0.0 if no records exist.)
     """
-    with sqlite3.connect(DB_NAME) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT SUM(amount) FROM transactions")
-        result = cursor.fetchone()
-        return result[0] if result[0] is not None else 0.0
\ No newline at end of file
+    with _reader() as conn:
+        sums = [conn.execute(f"SELECT SUM(amount) FROM {table}{where}",
+                             params).fetchone()[0]
+                for table, where, params, _ in _aggregate_sources(conn, filters)]
+    sums = [amount for amount in sums if amount is not None]
+    return sum(sums) if sums else 0.0
+
+# --- Aggregate queries ---
+# Grouping happens in SQLite (normally over the small summary table), so callers receive
+# one row per month/category rather than the whole ledger. Partial totals from several
+# partitions are added up here.
+
+def get_monthly_totals(filters: Optional[TransactionFilter] = None) -> pd.DataFrame:
+    """
+    Returns total spend per month as a DataFrame with 'month' ('YYYY-MM') and 'amount'
+    columns, oldest first. Undated rows belong to no month, so they're left out.
+    """
+    import pandas as pd
+
+    totals = sorted((key, amount)
+                    for key, amount in _grouped_totals("month_key", filters).items()
+                    if key[0])
+    months = [month_label(month_key) for (month_key,), _ in totals]
+    amounts = pd.Series([amount for _, amount in totals], dtype=float)
+    return pd.DataFrame({"month": months, "amount": amounts})
+
+def get_category_totals(filters: Optional[TransactionFilter] = None) -> pd.Series:
+    """
+    Returns total spend per category as a Series indexed by category, sorted from lowest
+    to highest.
+    """
+    import pandas as pd
+
+    totals = _grouped_totals("category", filters)
+    rows = sorted(((category, amount) for (category,), amount in totals.items()),
+                  key=lambda row: (row[1], row[0]))
+    index = pd.Index([category for category, _ in rows], name="category")
+    return pd.Series([amount for _, amount in rows], index=index, name="amount",
+                     dtype=float)
+
+def get_monthly_category_amounts(filters: Optional[TransactionFilter] = None
+                                 ) -> list[tuple[str, str, float]]:
+    """
+    Returns total spend per month and category as (month, category, amount) tuples,
+    oldest month first (only the month/category pairs with spending are included, and
+    undated rows are left out). Doesn't need pandas.
+    """
+    # Undated rows have no month key in the transactions table and key 0 in the summary
+    totals = _grouped_totals("month_key, category", filters)
+    return [(month_label(month_key), category, amount)
+            for (month_key, category), amount in sorted(totals.items())
+            if month_key]
+
+def get_monthly_category_totals(filters: Optional[TransactionFilter] = None
+                                ) -> pd.DataFrame:
+    """
+    Returns total spend per month and category as a DataFrame with 'month', 'category'
+    and 'amount' columns, oldest month first (only the month/category pairs with
+    spending are included).
+    """
+    import pandas as pd
+
+    return pd.DataFrame(get_monthly_category_amounts(filters),
+                        columns=["month", "category", "amount"])
+
+def get_top_categories(n: int = 3, filters: Optional[TransactionFilter] = None
+                       ) -> list[tuple[str, float]]:
+    """
+    Returns the n categories with the highest total spend as (category, amount) pairs,
+    highest first.
+    """
+    rows = [(category, amount)
+            for (category,), amount in _grouped_totals("category", filters).items()]
+    return sorted(rows, key=lambda row: (-row[1], row[0]))[:n]
+
+def get_categories() -> list[str]:
+    """
+    Returns every category in use, alphabetically (read from the summary table, which
+    covers every year).
+    """
+    with _reader() as conn:
+        return [category for (category,) in conn.execute(
+            "SELECT DISTINCT category FROM main.monthly_category_totals"
+            " WHERE category <> '' ORDER BY category"
+        )]
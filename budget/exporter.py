@@ -0,0 +1,120 @@
+"""
+Export module for the Budget Tracker application.
+
+- Streams transactions out of the database in chunks (never the whole ledger at once)
+- Writes CSV, gzip-compressed CSV or columnar Parquet files
+- Supports progress reporting and cancellation so exports can run on a background thread
+"""
+
+# --- Standard library ---
+import csv
+import gzip
+import os
+import threading
+from typing import Callable, Optional
+
+# --- Local database functions ---
+from . import db
+
+# File formats supported by export_transactions, keyed by the name used in detect_format
+EXPORT_FORMATS = ("csv", "csv.gz", "parquet")
+
+class ExportCancelled(Exception):
+    """
+    Raised when an export is cancelled part-way through; the partial file is removed.
+    """
+
+def detect_format(path: str) -> str:
+    """
+    Works out the export format from the file extension (defaults to CSV).
+    """
+    lower = path.lower()
+    if lower.endswith(".csv.gz") or lower.endswith(".gz"):
+        return "csv.gz"
+    if lower.endswith(".parquet"):
+        return "parquet"
+    return "csv"
+
+def _write_csv(file, chunks, on_chunk: Callable[[int], None]) -> None:
+    """
+    Writes the header and then each chunk of rows to an open text file.
+    """
+    writer = csv.writer(file)
+    writer.writerow(db.OUTPUT_COLUMNS)
+    for rows in chunks:
+        writer.writerows(rows)
+        on_chunk(len(rows))
+
+def _write_parquet(path: str, chunks, on_chunk: Callable[[int], None]) -> None:
+    """
+    Writes each chunk of rows as a Parquet row group (needs the optional 'pyarrow' package).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise RuntimeError("Parquet export needs the optional 'pyarrow' package (pip install pyarrow).") from error
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("date", pa.string()),
+        ("amount", pa.float64()),
+        ("category", pa.string()),
+        ("description", pa.string()),
+    ])
+    with pq.ParquetWriter(path, schema, compression="snappy") as writer:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema
+            ))
+            on_chunk(len(rows))
+
+def export_transactions(
+    path: str,
+    fmt: Optional[str] = None,
+    filters: Optional[db.TransactionFilter] = None,
+    chunk_size: int = db.FETCH_CHUNK_SIZE,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> int:
+    """
+    Streams the matching transactions to a file and returns the number of rows written.
+    progress (if given) is called after each chunk with (rows written, total rows).
+    Setting cancel_event stops the export and raises ExportCancelled.
+    The file is written under a temporary name and only moved into place once complete.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'. Choose from: {', '.join(EXPORT_FORMATS)}.")
+
+    total = db.count_transactions(filters)
+    written = 0
+
+    def on_chunk(count: int) -> None:
+        nonlocal written
+        written += count
+        if progress:
+            progress(written, total)
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+
+    temp_path = path + ".part"
+    chunks = db.iter_transactions(filters, chunk_size)
+    try:
+        if fmt == "parquet":
+            _write_parquet(temp_path, chunks, on_chunk)
+        elif fmt == "csv.gz":
+            with gzip.open(temp_path, "wt", newline="", encoding="utf-8") as file:
+                _write_csv(file, chunks, on_chunk)
+        else:
+            with open(temp_path, "w", newline="", encoding="utf-8") as file:
+                _write_csv(file, chunks, on_chunk)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        chunks.close()
+    return written
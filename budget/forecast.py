@@ -0,0 +1,227 @@
+"""
+Spending forecasts for the Budget Tracker application.
+
+Every model is a closed-form NumPy computation over a 2-D array of monthly totals: one row
+per series (e.g. per category) and one column per month, oldest first. All the categories are
+therefore forecast in one vectorised call. The models are all linear in the data, so the forecast
+for total spend is simply the sum of the per-category forecasts.
+"""
+
+# --- Standard library ---
+from typing import Callable, NamedTuple, Optional, Sequence
+
+# --- Third-party libraries ---
+import numpy as np
+
+DEFAULT_MODEL = "trend"
+SMOOTHING_ALPHA = 0.5   # Weight of the latest month in exponential smoothing
+SEASON_LENGTH = 12      # Months in a season for the seasonal naive model
+AVERAGE_WINDOW = 3      # Months averaged by the moving average model
+
+def as_history(history) -> np.ndarray:
+    """
+    Returns history as a float matrix (series x months). A 1-D array is treated as a single series.
+    """
+    matrix = np.asarray(history, dtype=float)
+    if matrix.ndim == 1:
+        matrix = matrix[np.newaxis, :]
+    if matrix.ndim != 2:
+        raise ValueError("history must be a 1-D or 2-D array of monthly totals")
+    return matrix
+
+def fill_months(history, months: Sequence[str]) -> np.ndarray:
+    """
+    Spreads monthly totals labelled 'YYYY-MM' (one label per column, oldest first) over every calendar
+    month from the first label to the last, with 0 for months that had no spending. The models assume
+    consecutive columns are consecutive months, which totals grouped from the transactions don't guarantee.
+    """
+    y = as_history(history)
+    if len(months) != y.shape[1]:
+        raise ValueError("months must label every column of history")
+    if not len(months):
+        return y
+
+    # Months since year 0, so consecutive calendar months are consecutive integers
+    numbers = np.array([int(month[:4]) * 12 + int(month[5:7]) - 1 for month in months])
+    filled = np.zeros((y.shape[0], numbers[-1] - numbers[0] + 1))
+    filled[:, numbers - numbers[0]] = y
+    return filled
+
+# --- Models ---
+# Each takes a (series x months) matrix and returns next month's forecast for every series.
+
+def linear_trend(history) -> np.ndarray:
+    """
+    Fits an ordinary least squares line through each series and extrapolates it one month ahead.
+    Needs at least 2 months.
+    """
+    y = as_history(history)
+    months = y.shape[1]
+    x = np.arange(months, dtype=float)
+    x_centred = x - x.mean()
+    slope = (y - y.mean(axis=1, keepdims=True)) @ x_centred / (x_centred @ x_centred)
+    return y.mean(axis=1) + slope * (months - x.mean())
+
+def exponential_smoothing(history, alpha: float = SMOOTHING_ALPHA) -> np.ndarray:
+    """
+    Simple exponential smoothing, with the level starting at the first month.
+    The recursion is unrolled into one weight per month, so it's a single matrix-vector product.
+    """
+    y = as_history(history)
+    months = y.shape[1]
+    ages = np.arange(months - 1, -1, -1)  # Months before the latest
+    weights = alpha * (1 - alpha) ** ages
+    weights[0] = (1 - alpha) ** (months - 1)  # The initial level keeps whatever weight is left
+    return y @ weights
+
+def seasonal_naive(history, season: int = SEASON_LENGTH) -> np.ndarray:
+    """
+    Repeats the total from one season ago (the same month last year).
+    With less than a full season of history it falls back to repeating the latest month.
+    """
+    y = as_history(history)
+    months = y.shape[1]
+    return y[:, months - season] if months >= season else y[:, -1]
+
+def moving_average(history, window: int = AVERAGE_WINDOW) -> np.ndarray:
+    """
+    Averages the latest window months (or all of them, if there are fewer).
+    """
+    return as_history(history)[:, -window:].mean(axis=1)
+
+class Model(NamedTuple):
+    """
+    A forecasting model and the amount of history it needs.
+    """
+    name: str
+    function: Callable[[np.ndarray], np.ndarray]
+    min_months: int
+
+MODELS: dict[str, Model] = {
+    "trend": Model("trend", linear_trend, 2),
+    "smoothing": Model("smoothing", exponential_smoothing, 1),
+    "seasonal": Model("seasonal", seasonal_naive, 1),
+    "average": Model("average", moving_average, 1),
+}
+
+def get_model(name: str) -> Model:
+    if name not in MODELS:
+        raise ValueError(f"Unknown forecast model {name!r} (expected one of {', '.join(MODELS)})")
+    return MODELS[name]
+
+def forecast(history, model: str = DEFAULT_MODEL) -> Optional[np.ndarray]:
+    """
+    Forecasts next month for every series in history.
+    Returns None if there are fewer months than the model needs.
+    """
+    chosen = get_model(model)
+    matrix = as_history(history)
+    if matrix.shape[1] < chosen.min_months:
+        return None
+    return chosen.function(matrix)
+
+def forecast_total(amounts: Sequence[float] | np.ndarray, model: str = DEFAULT_MODEL) -> Optional[float]:
+    """
+    Forecasts next month's value of a single series (e.g. total monthly spend).
+    Returns None if there are fewer months than the model needs.
+    """
+    result = forecast(amounts, model)
+    return None if result is None else float(result[0])
+
+# --- Accuracy ---
+
+def backtest(history, model: str = DEFAULT_MODEL, min_train: int = 1) -> np.ndarray:
+    """
+    Rolling-origin backtest: forecasts each month from the months before it and returns the
+    mean absolute error per series (NaN where there was nothing to test).
+    """
+    chosen = get_model(model)
+    y = as_history(history)
+    start = max(chosen.min_months, min_train)
+    if y.shape[1] <= start:
+        return np.full(y.shape[0], np.nan)
+
+    errors = np.stack([np.abs(chosen.function(y[:, :month]) - y[:, month]) for month in range(start, y.shape[1])],
+                      axis=1)
+    return errors.mean(axis=1)
+
+# --- Incremental forecasts ---
+
+def _trend_from_sums(sum_y: np.ndarray, sum_xy: np.ndarray, months: int) -> np.ndarray:
+    """
+    Least squares forecast for month `months` from each series' sum of y and sum of x*y (x = 0, 1, ...).
+    """
+    sum_x = months * (months - 1) / 2
+    sum_xx = (months - 1) * months * (2 * months - 1) / 6
+    slope = (months * sum_xy - sum_x * sum_y) / (months * sum_xx - sum_x ** 2)
+    intercept = (sum_y - slope * sum_x) / months
+    return intercept + slope * months
+
+class Forecaster:
+    """
+    Holds the monthly history of a set of series (e.g. categories) and keeps their forecasts
+    up to date as monthly totals change. Changing one month only recomputes that series; for the
+    linear trend the running least squares sums are adjusted instead of refitting.
+    """
+    def __init__(self, history, model: str = DEFAULT_MODEL, labels: Optional[Sequence[str]] = None) -> None:
+        self.model = get_model(model)
+        self.labels = list(labels) if labels is not None else None
+        self._fit(as_history(history).copy())
+
+    @property
+    def months(self) -> int:
+        return self.history.shape[1]
+
+    def forecasts(self) -> Optional[np.ndarray]:
+        """
+        Returns next month's forecast per series, or None if there isn't enough history yet.
+        """
+        if self.months < self.model.min_months:
+            return None
+        return self._predictions.copy()
+
+    def set_total(self, series: int, month: int, amount: float) -> None:
+        """
+        Changes one month's total for one series and updates that series' forecast.
+        """
+        delta = amount - self.history[series, month]
+        if delta == 0:
+            return
+        self.history[series, month] = amount
+
+        if self.months < self.model.min_months:
+            return
+        if self.model.name == "trend":
+            self._sum_y[series] += delta
+            self._sum_xy[series] += delta * month
+            self._predictions[series] = _trend_from_sums(self._sum_y[series], self._sum_xy[series], self.months)
+        else:
+            self._predictions[series] = self.model.function(self.history[series])[0]
+
+    def update(self, history, labels: Optional[Sequence[str]] = None) -> int:
+        """
+        Brings the forecaster up to date with a newer history, applying only the months that changed.
+        A different shape or different labels (a new month or category) means a full refit.
+        Returns the number of changed months, or -1 after a refit.
+        """
+        new_history = as_history(history)
+        new_labels = list(labels) if labels is not None else None
+        if new_history.shape != self.history.shape or new_labels != self.labels:
+            self.labels = new_labels
+            self._fit(new_history.copy())
+            return -1
+
+        changed = np.argwhere(new_history != self.history)
+        for series, month in changed:
+            self.set_total(int(series), int(month), float(new_history[series, month]))
+        return len(changed)
+
+    def _fit(self, history: np.ndarray) -> None:
+        self.history = history
+        if self.model.name == "trend":
+            self._sum_y = history.sum(axis=1)
+            self._sum_xy = history @ np.arange(self.months, dtype=float)
+        if self.months >= self.model.min_months:
+            self._predictions = self.model.function(history)
+        else:
+            self._predictions = np.full(history.shape[0], np.nan)
@@ -0,0 +1,138 @@
+"""
+CSV import for the Budget Tracker application.
+
+- Streams a CSV file in chunks so memory use stays flat regardless of file size
+- Maps the file's columns onto date/amount/category/description
+- Normalises dates to the ISO format the app stores
+- Skips rows that are already in the database (matched by content hash)
+"""
+
+# --- Standard library ---
+import os
+from collections import Counter
+from typing import Callable, NamedTuple, Optional
+
+# --- Third-party libraries ---
+import pandas as pd
+
+# --- Local database functions ---
+from . import db
+
+# Rows read from the CSV (and written to the database) per chunk
+DEFAULT_CHUNK_SIZE = 5000
+
+# Category used when the CSV has no category column (e.g. raw bank statements)
+DEFAULT_CATEGORY = "Other"
+
+# Common header names in bank/spreadsheet exports, checked in order for each field
+COLUMN_ALIASES: dict[str, list[str]] = {
+    "date": ["date", "transaction date", "posted date", "booking date", "value date"],
+    "amount": ["amount", "value", "debit", "paid out"],
+    "category": ["category", "type"],
+    "description": ["description", "details", "memo", "narrative", "payee", "merchant"],
+}
+
+class ImportResult(NamedTuple):
+    """
+    Summary of a CSV import. Rejected rows are (line number in the file, reason) pairs.
+    """
+    rows_read: int
+    inserted: int
+    duplicates: int
+    rejected: list[tuple[int, str]]
+
+def resolve_columns(header: list[str], column_map: Optional[dict[str, str]] = None) -> dict[str, str]:
+    """
+    Works out which CSV column feeds each transaction field.
+    Explicit entries in column_map win; otherwise headers are matched against COLUMN_ALIASES (case-insensitive).
+    Raises ValueError if no date or amount column can be found.
+    """
+    lookup = {name.strip().lower(): name for name in header}
+    resolved: dict[str, str] = {}
+
+    for field, aliases in COLUMN_ALIASES.items():
+        if column_map and field in column_map:
+            if column_map[field] not in header:
+                raise ValueError(f"Column '{column_map[field]}' not found in CSV header.")
+            resolved[field] = column_map[field]
+            continue
+        for alias in aliases:
+            if alias in lookup:
+                resolved[field] = lookup[alias]
+                break
+
+    missing = [field for field in ("date", "amount") if field not in resolved]
+    if missing:
+        raise ValueError(f"CSV is missing required column(s): {', '.join(missing)}.")
+    return resolved
+
+def normalise_dates(dates: pd.Series, dayfirst: bool = True) -> pd.Series:
+    """
+    Converts mixed date strings (e.g. '01/07/2025', '2025-07-01') to 'YYYY-MM-DD'.
+    Unparseable values are returned unchanged so validation can reject them.
+    """
+    parsed = pd.to_datetime(dates, errors="coerce", dayfirst=dayfirst, format="mixed")
+    return parsed.dt.strftime("%Y-%m-%d").where(parsed.notna(), dates)
+
+def _prepare_chunk(chunk: pd.DataFrame, columns: dict[str, str], dayfirst: bool) -> pd.DataFrame:
+    """
+    Renames a raw CSV chunk to transaction fields and cleans the values.
+    """
+    prepared = pd.DataFrame(index=chunk.index)
+    prepared["date"] = normalise_dates(chunk[columns["date"]], dayfirst=dayfirst)
+
+    # Strip currency symbols and thousands separators, e.g. '£1,234.50'
+    prepared["amount"] = chunk[columns["amount"]].str.replace(r"[£$€,\s]", "", regex=True)
+
+    if "category" in columns:
+        prepared["category"] = chunk[columns["category"]].str.strip()
+    else:
+        prepared["category"] = DEFAULT_CATEGORY
+
+    if "description" in columns:
+        prepared["description"] = chunk[columns["description"]].str.strip()
+    else:
+        prepared["description"] = ""
+    return prepared
+
+def import_csv(
+    path: str,
+    column_map: Optional[dict[str, str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dayfirst: bool = True,
+    progress: Optional[Callable[[int, float], None]] = None,
+) -> ImportResult:
+    """
+    Streams a CSV file into the database chunk by chunk, skipping duplicates.
+    progress (if given) is called after each chunk with (rows read so far, fraction of the file read).
+    """
+    total_bytes = os.path.getsize(path) or 1
+    rows_read = inserted = duplicates = 0
+    rejected: list[tuple[int, str]] = []
+    # Copies of each row read so far, so repeats split across chunks are matched like repeats within one
+    seen: Counter[str] = Counter()
+
+    with open(path, "rb") as file:
+        reader = pd.read_csv(file, chunksize=chunk_size, dtype=str, keep_default_na=False, encoding="utf-8-sig",
+                             skipinitialspace=True)
+        columns: Optional[dict[str, str]] = None
+
+        for chunk in reader:
+            if columns is None:
+                columns = resolve_columns(list(chunk.columns), column_map)
+
+            result = db.add_transactions(_prepare_chunk(chunk, columns, dayfirst),
+                                         batch_size=chunk_size, skip_duplicates=True, seen=seen)
+            inserted += result.inserted
+            for position, reason in result.rejected:
+                if reason == db.DUPLICATE_REASON:
+                    duplicates += 1
+                else:
+                    # Line numbers count the header as line 1
+                    rejected.append((rows_read + position + 2, reason))
+            rows_read += len(chunk)
+
+            if progress:
+                progress(rows_read, min(file.tell() / total_bytes, 1.0))
+
+    return ImportResult(rows_read, inserted, duplicates, rejected)
@@ -0,0 +1,362 @@
+"""
+Opt-in timing instrumentation for the Budget Tracker application.
+
+Enabled with the BUDGET_INSTRUMENT=1 environment variable or `python -m budget.main --instrument`.
+install() wraps every budget.db function, the refresh methods of the tab mixins and the transaction
+list, and the chart updates and renders, so each call records its wall time and call count (and,
+for db functions, the number of rows returned or written).
+
+Calls are also grouped into actions: a button press (or tab switch) and the background refresh it
+triggers. When the app goes idle again the action's breakdown is logged, for example:
+
+    submit_transaction: 312.4 ms | db 9 calls, 1,210 rows, 14.2 ms | ui 11 calls, 290.5 ms | charts 4 calls, 251.0 ms
+
+report() summarises every instrumented function since install(). Nothing is wrapped until
+install() is called, so the normal build pays nothing for this.
+"""
+
+# --- Standard library ---
+import functools
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = "BUDGET_INSTRUMENT"
+
+# Layers each call is attributed to in an action's breakdown
+DB = "db"
+UI = "ui"
+CHARTS = "charts"
+LAYERS = (DB, UI, CHARTS)
+
+# budget.db functions that don't touch the database (or run once per row) and would only add noise
+SKIPPED_DB_FUNCTIONS = {"consistent_read", "get_connection_manager", "get_generation", "transaction_hash",
+                        "validate_transaction", "validate_transactions", "to_day", "from_day", "to_month_key",
+                        "month_label", "month_label_sql"}
+
+# Mixin and widget methods that refresh a view, by prefix (plus the refresh pipeline itself)
+REFRESH_PREFIXES = ("refresh", "update_", "show_", "render", "calculate_", "predict_")
+REFRESH_METHODS = {"_run_refresh", "_load_refresh_data", "_forecast_categories", "_apply_refresh", "_fetch_block", "fetch"}
+
+# Classes whose refresh methods are timed, if their module has been imported: (module, class)
+UI_CLASSES = (
+    ("budget.ui.transactions", "TransactionTabMixin"),
+    ("budget.ui.insights", "InsightsTabMixin"),
+    ("budget.ui.transaction_list", "VirtualTransactionList"),
+)
+
+# Methods that start a new action: (module, class, method)
+ACTION_METHODS = (
+    ("budget.ui.transactions", "TransactionTabMixin", "submit_transaction"),
+    ("budget.ui.transactions", "TransactionTabMixin", "delete_latest_transaction"),
+    ("budget.ui.transactions", "TransactionTabMixin", "delete_all_transactions"),
+    ("budget.ui.transactions", "TransactionTabMixin", "import_from_csv"),
+    ("budget.ui.transactions", "TransactionTabMixin", "export_to_csv"),
+    ("budget.ui.transactions", "TransactionTabMixin", "select_forecast_model"),
+    ("budget.ui.transactions", "TransactionTabMixin", "clear_form"),
+    ("budget.ui.transactions", "TransactionTabMixin", "run_search"),
+    ("budget.ui.transactions", "TransactionTabMixin", "apply_filters"),
+    ("budget.ui.transactions", "TransactionTabMixin", "delete_selected_transactions"),
+    ("budget.ui.transactions", "TransactionTabMixin", "edit_selected_transactions"),
+    ("budget.ui.transactions", "TransactionTabMixin", "apply_edits"),
+    ("budget.ui.transaction_list", "VirtualTransactionList", "sort_by"),
+    ("budget.ui.app", "BudgetApp", "_on_tab_changed"),
+)
+
+# Chart methods that are timed (the charts module is imported by install() when the GUI is loaded)
+CHART_METHODS = (
+    ("budget.ui.charts", "CategoryBarChart", "update"),
+    ("budget.ui.charts", "TrendChart", "update"),
+    ("budget.ui.charts", "CategoryPieChart", "update"),
+    ("matplotlib.backends.backend_agg", "FigureCanvasAgg", "draw"),  # The actual render (Agg and TkAgg)
+)
+
+class Stats:
+    """
+    Call count, total wall time and row count for one function or layer.
+    """
+    __slots__ = ("calls", "seconds", "rows")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows = 0
+
+    def add(self, seconds: float, rows: int = 0) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        self.rows += rows
+
+class Action:
+    """
+    One user action and the time each layer spent on it (outermost calls only, so a db function
+    calling another db function is counted once).
+    """
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = time.perf_counter()
+        self.seconds: Optional[float] = None  # Set when the action finishes
+        self.layers: dict[str, Stats] = {layer: Stats() for layer in LAYERS}
+
+    def summary(self) -> str:
+        elapsed = self.seconds if self.seconds is not None else time.perf_counter() - self.started
+        parts = [f"{self.name}: {elapsed * 1000:.1f} ms"]
+        for layer, stats in self.layers.items():
+            if stats.calls:
+                rows = f", {stats.rows:,} rows" if layer == DB else ""
+                parts.append(f"{layer} {stats.calls} call{'s' if stats.calls != 1 else ''}{rows}, "
+                             f"{stats.seconds * 1000:.1f} ms")
+        return " | ".join(parts)
+
+# --- Recorded data (shared by all threads) ---
+_lock = threading.Lock()
+_functions: dict[str, Stats] = {}
+_action: Optional[Action] = None
+_recent: deque[Action] = deque(maxlen=50)
+_depth = threading.local()  # Per-thread nesting depth per layer
+_patched: list[tuple[Any, str, Any]] = []  # (owner, attribute, original) for uninstall()
+
+def requested() -> bool:
+    """
+    True if the environment variable asks for instrumentation.
+    """
+    return os.environ.get(ENV_VAR, "").strip().lower() not in ("", "0", "false", "no", "off")
+
+def is_installed() -> bool:
+    return bool(_patched)
+
+def _record(name: str, layer: str, seconds: float, rows: int, outermost: bool) -> None:
+    with _lock:
+        _functions.setdefault(name, Stats()).add(seconds, rows)
+        if outermost and _action is not None:
+            _action.layers[layer].add(seconds, rows)
+
+def _count_rows(result: Any) -> int:
+    """
+    Rows a db function returned (or wrote): the length of a list/DataFrame/Series, the rows of a
+    page, the inserted count of a bulk insert, 1 for a scalar and 0 for None.
+    """
+    if result is None or isinstance(result, bool):
+        return 0
+    if isinstance(result, (int, float, str)):
+        return 1
+    for attribute in ("rows", "inserted"):  # TransactionPage, BulkInsertResult
+        value = getattr(result, attribute, None)
+        if isinstance(value, int):
+            return value
+        if isinstance(value, list):
+            return len(value)
+    try:
+        return len(result)
+    except TypeError:
+        return 0
+
+def _enter(layer: str) -> bool:
+    depths = _depth.__dict__
+    depths[layer] = depths.get(layer, 0) + 1
+    return depths[layer] == 1
+
+def _leave(layer: str) -> None:
+    _depth.__dict__[layer] -= 1
+
+def _timed_chunks(chunks: Iterator[Any], name: str, layer: str) -> Iterator[Any]:
+    """
+    Times a streaming db function while it's consumed, counting the rows in each chunk.
+    """
+    seconds = 0.0
+    rows = 0
+    outermost = False
+    try:
+        while True:
+            outermost = _enter(layer)
+            start = time.perf_counter()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            finally:
+                seconds += time.perf_counter() - start
+                _leave(layer)
+            rows += len(chunk)
+            yield chunk
+    finally:
+        chunks.close() # type: ignore[attr-defined]
+        _record(name, layer, seconds, rows, outermost)
+
+def _timed(func: Callable, name: str, layer: str) -> Callable:
+    """
+    Wraps func so every call records its wall time under name and layer.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        outermost = _enter(layer)
+        start = time.perf_counter()
+        result = None
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            _leave(layer)
+            if not inspect.isgenerator(result):
+                _record(name, layer, seconds, _count_rows(result) if layer == DB else 0, outermost)
+        if inspect.isgenerator(result):
+            return _timed_chunks(result, name, layer)
+        return result
+    return wrapper
+
+def _action_starter(func: Callable, name: str) -> Callable:
+    """
+    Wraps a UI entry point so calling it starts a new action.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        begin_action(name)
+        return func(*args, **kwargs)
+    return wrapper
+
+def _patch(owner: Any, attribute: str, replacement: Any) -> None:
+    _patched.append((owner, attribute, getattr(owner, attribute)))
+    setattr(owner, attribute, replacement)
+
+def _loaded_class(module: str, name: str) -> Optional[type]:
+    return getattr(sys.modules[module], name, None) if module in sys.modules else None
+
+def install() -> None:
+    """
+    Wraps the db functions and the loaded UI classes. Modules that imported db functions by name
+    (e.g. budget.ui.transactions) have their references replaced too. Call it before building
+    the app, since Tk keeps references to the bound methods it was given. Safe to call twice.
+    """
+    if _patched:
+        return
+    from . import db
+
+    # The charts are otherwise imported on first use, after the classes below have been patched
+    if "budget.ui.app" in sys.modules:
+        from .ui import charts # noqa: F401
+
+    # --- budget.db functions, wherever they were imported ---
+    for attribute, func in list(vars(db).items()):
+        if attribute.startswith("_") or attribute in SKIPPED_DB_FUNCTIONS:
+            continue
+        if not inspect.isfunction(func) or func.__module__ != db.__name__:
+            continue
+        wrapper = _timed(func, f"db.{attribute}", DB)
+        for module in [module for name, module in sys.modules.items() if name.split(".")[0] == "budget"]:
+            for name, value in list(vars(module).items()):
+                if value is func:
+                    _patch(module, name, wrapper)
+
+    # --- Refresh methods, actions and charts ---
+    for module_name, class_name in UI_CLASSES:
+        cls = _loaded_class(module_name, class_name)
+        if cls is None:
+            continue
+        for attribute, method in list(vars(cls).items()):
+            if inspect.isfunction(method) and (attribute.startswith(REFRESH_PREFIXES) or attribute in REFRESH_METHODS):
+                _patch(cls, attribute, _timed(method, f"{class_name}.{attribute}", UI))
+
+    for module_name, class_name, attribute in CHART_METHODS:
+        cls = _loaded_class(module_name, class_name)
+        if cls is not None:
+            _patch(cls, attribute, _timed(vars(cls)[attribute], f"{class_name}.{attribute}", CHARTS))
+
+    for module_name, class_name, attribute in ACTION_METHODS:
+        cls = _loaded_class(module_name, class_name)
+        if cls is not None:
+            _patch(cls, attribute, _action_starter(vars(cls)[attribute], attribute.lstrip("_")))
+
+def enable(stream=None) -> None:
+    """
+    Installs the instrumentation and logs each action's breakdown to stream (stderr by default).
+    """
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter("[instrumentation] %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    install()
+
+def uninstall() -> None:
+    """
+    Restores everything install() wrapped (used by tests).
+    """
+    while _patched:
+        owner, attribute, original = _patched.pop()
+        setattr(owner, attribute, original)
+
+# --- Actions ---
+
+def begin_action(name: str) -> None:
+    """
+    Starts attributing calls to a new action, finishing the current one first.
+    """
+    global _action
+    if not _patched:
+        return
+    end_action()
+    with _lock:
+        _action = Action(name)
+
+def end_action() -> Optional[Action]:
+    """
+    Finishes the current action (if any), logs its breakdown and returns it.
+    The app calls this whenever its background work is done.
+    """
+    global _action
+    with _lock:
+        action, _action = _action, None
+        if action is None:
+            return None
+        action.seconds = time.perf_counter() - action.started
+        _recent.append(action)
+    logger.info(action.summary())
+    return action
+
+def recent_actions() -> list[Action]:
+    with _lock:
+        return list(_recent)
+
+# --- Reporting ---
+
+def function_stats() -> dict[str, Stats]:
+    """
+    A copy of the per-function totals recorded so far.
+    """
+    with _lock:
+        copies = {}
+        for name, stats in _functions.items():
+            copy = Stats()
+            copy.calls, copy.seconds, copy.rows = stats.calls, stats.seconds, stats.rows
+            copies[name] = copy
+        return copies
+
+def reset() -> None:
+    """
+    Clears every recorded call and action.
+    """
+    global _action
+    with _lock:
+        _functions.clear()
+        _recent.clear()
+        _action = None
+
+def report() -> str:
+    """
+    A table of every instrumented function that was called, slowest in total first.
+    """
+    stats = function_stats()
+    if not stats:
+        return "Instrumentation: no calls recorded."
+
+    lines = [f"{'function':<48}{'calls':>8}{'total ms':>12}{'mean ms':>10}{'rows':>12}"]
+    for name, entry in sorted(stats.items(), key=lambda item: item[1].seconds, reverse=True):
+        lines.append(f"{name:<48}{entry.calls:>8}{entry.seconds * 1000:>12.1f}"
+                     f"{entry.seconds * 1000 / entry.calls:>10.2f}{entry.rows:>12,}")
+    return "\n".join(lines)
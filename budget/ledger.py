@@ -0,0 +1,83 @@
+"""
+Shared ledger snapshot for the Budget Tracker application.
+
+Every view used to query the database (and re-group the data) on its own, so one click cost
+several full table reads. A snapshot is loaded once per data generation (see db.get_generation)
+and hands the same aggregates to every consumer until the next write (or a change of filter:
+a snapshot can cover just the transactions matching a db.TransactionFilter, aggregated in SQL).
+"""
+from __future__ import annotations
+
+# --- Standard library ---
+import threading
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+# --- Third-party libraries (pandas is only needed for type hints; db imports it when loading) ---
+if TYPE_CHECKING:
+    import pandas as pd
+
+# --- Local database functions ---
+from . import db
+
+class LedgerSnapshot(NamedTuple):
+    """
+    Read-only view of the ledger at one data generation.
+    Consumers must not modify the frames in place, since they are shared.
+    """
+    generation: int
+    row_count: int                  # Number of transactions
+    total: float                    # Sum of all amounts
+    monthly: Optional[pd.DataFrame] # Columns 'month' ('YYYY-MM') and 'amount', oldest first; None if empty
+    category_totals: pd.Series      # Amount per category, sorted lowest to highest
+    category_monthly: Optional[pd.DataFrame] = None # Amount per category (rows) and month (columns, oldest first, 0 if none); None if empty
+    filters: Optional[db.TransactionFilter] = None  # Restriction the aggregates were computed with (None = whole ledger)
+
+    @property
+    def empty(self) -> bool:
+        return self.row_count == 0
+
+def load_snapshot(generation: int = 0, filters: Optional[db.TransactionFilter] = None) -> LedgerSnapshot:
+    """
+    Reads the ledger's aggregates (of the transactions matching filters) from the database in one
+    consistent read. Monthly and category totals are grouped by SQLite, not pandas, and individual
+    rows are never loaded (the transaction list pages them in itself).
+    """
+    with db.consistent_read():
+        monthly = db.get_monthly_totals(filters)
+        by_category = db.get_monthly_category_totals(filters)
+        return LedgerSnapshot(
+            generation=generation,
+            row_count=db.count_transactions(filters),
+            total=db.get_total_amount(filters),
+            monthly=None if monthly.empty else monthly,
+            category_totals=db.get_category_totals(filters),
+            category_monthly=None if by_category.empty else by_category.pivot_table(
+                index="category", columns="month", values="amount", aggfunc="sum", fill_value=0.0
+            ),
+            filters=filters,
+        )
+
+# Most recently loaded snapshot (shared by all views)
+_snapshot: Optional[LedgerSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+def get_snapshot(filters: Optional[db.TransactionFilter] = None) -> LedgerSnapshot:
+    """
+    Returns the current snapshot for filters, reloading it only if the database has been written to
+    since or it was loaded with a different filter.
+    """
+    global _snapshot
+    with _snapshot_lock:
+        # Read the generation first: a write landing mid-load leaves it stale, so the next call reloads
+        generation = db.get_generation()
+        if _snapshot is None or _snapshot.generation != generation or _snapshot.filters != filters:
+            _snapshot = load_snapshot(generation, filters)
+        return _snapshot
+
+def invalidate() -> None:
+    """
+    Drops the cached snapshot so the next get_snapshot() reloads from the database.
+    """
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
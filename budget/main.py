@@ -4,30 +4,90 @@ Main entrypoint for the Budget Tracker application.
 - Initialises the database
 - Starts the Tkinter GUI
 - Maximises the window on Windows systems
+- Closes the database connections on shutdown
+- Optionally reports how long startup took (--profile-startup)
+- Optionally times database calls and refreshes per action (--instrument or BUDGET_INSTRUMENT=1)
 """
 
 # --- Standard library ---
+import time
+_IMPORT_STARTED = time.perf_counter() # Before the app's own imports, so the profile includes them
+
+import argparse
 import platform
+import sys
 import tkinter as tk
 
 # --- Local application modules ---
-from budget.db import initialise_database
+from budget import instrumentation
+from budget.db import initialise_database, close_database
 from budget.ui.app import BudgetApp
 
-def run_app():
+# Modules that are slow to import and should stay off the path to the first paint
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib")
+
+def report_startup(marks: list[tuple[str, float]], stream=None) -> None:
+    """
+    Prints how long each startup phase took and which heavy modules had been imported by the end.
+    For a per-module breakdown run: python -X importtime -m budget.main
+    """
+    stream = stream or sys.stderr
+    previous = _IMPORT_STARTED
+    print("Startup profile (ms):", file=stream)
+    for label, moment in marks:
+        print(f"  {label:<14}{(moment - previous) * 1000:8.1f}", file=stream)
+        previous = moment
+    print(f"  {'total':<14}{(previous - _IMPORT_STARTED) * 1000:8.1f}", file=stream)
+
+    # Includes anything the background worker has imported in the meantime
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    print(f"Heavy modules imported: {', '.join(loaded) or 'none'}", file=stream)
+
+def run_app(profile_startup: bool = False, instrument: bool = False):
     """
     Starts the Budget Tracker GUI.
+    With profile_startup, prints the time taken by each startup phase once the window has painted.
+    With instrument (or BUDGET_INSTRUMENT=1), logs a timing breakdown of every action and prints
+    a per-function summary on exit.
     """
+    marks = [("imports", time.perf_counter())]
     initialise_database()
+    marks.append(("database", time.perf_counter()))
+
+    # Installed before the app is built, since Tk keeps the button callbacks it's given
+    instrument = instrument or instrumentation.requested()
+    if instrument:
+        instrumentation.enable()
+        instrumentation.begin_action("startup")
+
     root = tk.Tk()
     app = BudgetApp(root)
+    marks.append(("window built", time.perf_counter()))
 
     if platform.system() == 'Windows':
         root.state('zoomed')
 
-    root.mainloop()
+    if profile_startup:
+        def first_paint() -> None:
+            root.update_idletasks()
+            marks.append(("first paint", time.perf_counter()))
+            report_startup(marks)
+        root.after_idle(first_paint)
+
+    try:
+        root.mainloop()
+    finally:
+        app.worker.shutdown()
+        close_database()
+        if instrument:
+            instrumentation.end_action()
+            print(instrumentation.report(), file=sys.stderr)
     return root, app
 
 
 if __name__ == "__main__": # pragma: no cover
-    run_app()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Budget Tracker")
+    parser.add_argument("--profile-startup", action="store_true", help="Print how long startup took")
+    parser.add_argument("--instrument", action="store_true", help="Log the time spent in db calls, refreshes and charts per action")
+    args = parser.parse_args()
+    run_app(profile_startup=args.profile_startup, instrument=args.instrument)
\ No newline at end of file
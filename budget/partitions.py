@@ -0,0 +1,420 @@
+"""
+Connection management and year partitions for the Budget Tracker database.
+
+A partitioned database keeps each year's transactions in its own file next to
+db.DB_NAME (budget.db -> budget-2024.db, undated rows in budget-0000.db), so writes,
+vacuums and backups only touch the years that changed. Every partition is a complete
+ledger database with the normal schema.
+
+DB_NAME itself becomes a catalog: its transactions table stays empty, 'partitions'
+lists the files, 'partition_ids' hands out ids that are unique across years, and its
+summary table covers every year (kept current by TEMP triggers the writer adds to each
+partition it attaches), so month-aligned aggregates never open a partition. Everything
+else fans out, one statement per partition, to the partitions overlapping the filter's
+dates, which the ConnectionManager ATTACHes on demand (read-only for readers).
+split_into_partitions() converts a single-file database.
+"""
+from __future__ import annotations
+
+# --- Standard library ---
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date as Date, timedelta
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+# --- Local database functions ---
+from . import db
+
+# Pragmas applied to every connection opened by the connection manager
+DB_CONFIG: dict[str, Any] = {
+    "journal_mode": "WAL",     # Readers don't block the writer (and vice versa)
+    "synchronous": "NORMAL",   # Safe with WAL and much faster than FULL
+    "cache_size": -16000,      # Negative value = size in KiB (16 MB page cache)
+    "mmap_size": 268435456,    # 256 MB of memory-mapped I/O
+    "temp_store": "MEMORY",    # Sorts and temp indexes stay in RAM
+}
+
+# SQLite's default SQLITE_MAX_ATTACHED; connections detach least recently used
+# partitions beyond it
+MAX_ATTACHED_PARTITIONS = 10
+
+# Pragmas from the connection config that are set per attached database
+PARTITION_PRAGMAS = ("cache_size", "mmap_size", "synchronous")
+
+PARTITION_TABLES = [
+    "CREATE TABLE IF NOT EXISTS partitions"
+    " (year INTEGER PRIMARY KEY, file TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS partition_ids (next_id INTEGER NOT NULL)",
+]
+
+# Year of a stored day (0 for undated rows), as SQL
+YEAR_SQL = "COALESCE(CAST(strftime('%Y', day * 86400, 'unixepoch') AS INTEGER), 0)"
+
+_TRIGGER_HEADER = re.compile(
+    r"CREATE TRIGGER IF NOT EXISTS (\w+)\s+(.*?)\s+ON transactions BEGIN", re.DOTALL
+)
+
+_EPOCH = Date(1970, 1, 1)
+
+class ConnectionManager:
+    """
+    Owns one long-lived writer connection plus one reusable reader connection per
+    thread. Every connection has the pragmas from the config applied once, when it is
+    opened. For a partitioned database it also attaches the year partitions each
+    connection needs.
+    """
+    def __init__(self, path: str, config: Optional[dict[str, Any]] = None) -> None:
+        self.path = path
+        self.config = dict(DB_CONFIG if config is None else config)
+        self._lock = threading.RLock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        self._partitioned: Optional[bool] = None
+        # Year -> schema per connection, least recently used first
+        self._attached: dict[sqlite3.Connection, OrderedDict[int, str]] = {}
+
+    @property
+    def in_memory(self) -> bool:
+        """
+        True when the database lives in memory (every connection would get its own
+        copy).
+        """
+        return self.path == ":memory:"
+
+    def _connect(self, path: Optional[str] = None) -> sqlite3.Connection:
+        """
+        Opens a new connection (to the database, or to path) and applies the
+        configured pragmas. URI filenames are enabled so partitions can be attached
+        read-only.
+        """
+        conn = sqlite3.connect(path or self.path, check_same_thread=False, uri=True)
+        for name, value in self.config.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _get_writer(self) -> sqlite3.Connection:
+        if self._writer is None:
+            self._writer = self._connect()
+        return self._writer
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """
+        Yields the writer connection inside a transaction.
+        Commits on success and rolls back if the block raises.
+        """
+        with self._lock:
+            conn = self._get_writer()
+            with conn:
+                yield conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Yields this thread's reader connection, opening it on first use.
+        In-memory databases read through the writer, since a second connection would
+        be empty.
+        """
+        if self.in_memory:
+            with self._lock:
+                yield self._get_writer()
+            return
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._readers.append(conn)
+        yield conn
+
+    def release_reader(self) -> None:
+        """
+        Closes this thread's reader connection, e.g. at the end of a short-lived
+        background thread.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            if conn in self._readers:
+                self._readers.remove(conn)
+            self._attached.pop(conn, None)
+        conn.close()
+
+    def close(self) -> None:
+        """
+        Closes the writer and every reader connection handed out so far.
+        """
+        with self._lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+            self._attached.clear()
+            self._local = threading.local() # Drop the per-thread references
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    # --- Year partitions ---
+
+    @property
+    def partitioned(self) -> bool:
+        """
+        True when the database is a catalog of year partitions (see
+        split_into_partitions).
+        """
+        if self._partitioned is None:
+            with self.reader() as conn:
+                self._partitioned = conn.execute(
+                    "SELECT 1 FROM main.sqlite_master"
+                    " WHERE type = 'table' AND name = 'partitions'"
+                ).fetchone() is not None
+        return self._partitioned
+
+    def partition_path(self, file: str) -> str:
+        """
+        Full path of a partition file, which the catalog records relative to its own
+        directory.
+        """
+        return os.path.join(os.path.dirname(os.path.abspath(self.path)), file)
+
+    def attach(self, conn: sqlite3.Connection, year: int, file: str,
+               writable: bool = False) -> str:
+        """
+        Attaches a year partition to conn (read-only unless writable) and returns its
+        schema name. At most MAX_ATTACHED_PARTITIONS stay attached per connection, so
+        the least recently used one is detached to make room. A database can't be
+        detached mid-transaction, so the writer commits first if it has to, and a
+        reader inside db.consistent_read() ends its read transaction and starts
+        another: a read of more partitions than that is consistent partition by
+        partition, not as a whole (a write landing in between bumps the generation,
+        so cached snapshots reload).
+        """
+        with self._lock:
+            attached = self._attached.setdefault(conn, OrderedDict())
+            if year in attached:
+                attached.move_to_end(year)
+                return attached[year]
+
+            restart = False
+            if len(attached) >= MAX_ATTACHED_PARTITIONS:
+                if conn.in_transaction:
+                    restart = not writable
+                    conn.commit()
+                old_year, old_schema = attached.popitem(last=False)
+                if writable:
+                    for statement in _partition_triggers(old_schema, drop=True):
+                        conn.execute(statement)
+                conn.execute(f"DETACH DATABASE {old_schema}")
+
+            schema = f"y{year:04d}"
+            uri = Path(self.partition_path(file)).resolve().as_uri()
+            if not writable:
+                uri += "?mode=ro"
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (uri,))
+            for name in PARTITION_PRAGMAS:
+                # synchronous can't change mid-transaction; those attaches keep
+                # SQLite's (safer) default
+                if name not in self.config:
+                    continue
+                if name == "synchronous" and conn.in_transaction:
+                    continue
+                conn.execute(f"PRAGMA {schema}.{name} = {self.config[name]}")
+            if writable:
+                for statement in _partition_triggers(schema):
+                    conn.execute(statement)
+            attached[year] = schema
+            if restart:
+                conn.execute("BEGIN")
+            return schema
+
+def _partition_triggers(schema: str, drop: bool = False) -> list[str]:
+    """
+    Statements creating (or dropping) TEMP copies of db.SUMMARY_TRIGGERS on an
+    attached partition's transactions table, which keep the catalog's summary table
+    in step with the partition's rows.
+    """
+    statements = []
+    for trigger in db.SUMMARY_TRIGGERS:
+        match = _TRIGGER_HEADER.search(trigger)
+        if match is None:
+            raise ValueError("Summary triggers must start with"
+                             " 'CREATE TRIGGER IF NOT EXISTS name ... ON transactions'")
+        name = f"{schema}_{match.group(1)}"
+        if drop:
+            statements.append(f"DROP TRIGGER IF EXISTS temp.{name}")
+        else:
+            statements.append(
+                f"{trigger[:match.start()]}CREATE TEMP TRIGGER IF NOT EXISTS {name}"
+                f" {match.group(2)} ON {schema}.transactions"
+                f" BEGIN{trigger[match.end():]}"
+            )
+    return statements
+
+def year_of(day: Optional[int]) -> int:
+    """
+    Partition year of a stored day number (0 for undated rows).
+    """
+    return 0 if day is None else (_EPOCH + timedelta(days=day)).year
+
+def _partition_file(manager: ConnectionManager, year: int) -> str:
+    """
+    File name of a year's partition, derived from the catalog's:
+    budget.db -> budget-2024.db.
+    """
+    stem, extension = os.path.splitext(os.path.basename(manager.path))
+    return f"{stem}-{year:04d}{extension}"
+
+def create_partition(manager: ConnectionManager, file: str) -> None:
+    """
+    Creates a partition file (or brings an existing one up to date) with the latest
+    schema.
+    """
+    conn = manager._connect(manager.partition_path(file))
+    try:
+        db.apply_migrations(conn)
+    finally:
+        conn.close()
+
+def sources(conn: sqlite3.Connection, filters: Optional[db.TransactionFilter] = None,
+            newest_first: bool = False, writable: bool = False,
+            undated: bool = False) -> Iterator[str]:
+    """
+    Yields the schema of each database that can hold transactions matching the
+    filter: 'main' for a single-file database, otherwise every partition overlapping
+    the filter's dates (oldest year first unless newest_first), attached to conn as
+    it is reached. Undated rows only match undated filters, unless undated is set
+    (for date bounds that aren't a filter, such as a page key).
+    """
+    manager = db.get_connection_manager()
+    if not manager.partitioned:
+        yield "main"
+        return
+
+    first_year, last_year = 0, 9999
+    if filters is not None and (filters.start_date or filters.end_date):
+        first_year = int(filters.start_date[:4]) if filters.start_date else 1
+        last_year = int(filters.end_date[:4]) if filters.end_date else 9999
+    if undated:
+        first_year = 0
+    partitions = conn.execute(
+        "SELECT year, file FROM main.partitions"
+        " WHERE year BETWEEN ? AND ? ORDER BY year",
+        (first_year, last_year),
+    ).fetchall()
+    for year, file in (reversed(partitions) if newest_first else partitions):
+        yield manager.attach(conn, year, file, writable)
+
+def writable_partition(conn: sqlite3.Connection, year: int) -> str:
+    """
+    Attaches the year's partition to the writer, creating and cataloguing it on first
+    use. Returns its schema name.
+    """
+    manager = db.get_connection_manager()
+    row = conn.execute(
+        "SELECT file FROM main.partitions WHERE year = ?", (year,)
+    ).fetchone()
+    if row is not None:
+        return manager.attach(conn, year, row[0], writable=True)
+
+    file = _partition_file(manager, year)
+    create_partition(manager, file)
+    schema = manager.attach(conn, year, file, writable=True)
+    conn.execute("INSERT INTO main.partitions (year, file) VALUES (?, ?)", (year, file))
+    return schema
+
+def allocate_ids(conn: sqlite3.Connection, count: int) -> int:
+    """
+    Reserves count consecutive transaction ids in a partitioned database and returns
+    the first.
+    """
+    first_id = conn.execute("SELECT next_id FROM main.partition_ids").fetchone()[0]
+    conn.execute("UPDATE main.partition_ids SET next_id = ?", (first_id + count,))
+    return first_id
+
+def split_into_partitions() -> list[int]:
+    """
+    Converts the current single-file database into a catalog plus one partition file
+    per year. Each year's rows are copied (keeping their ids) into a new file, then
+    the catalog's own rows are removed, keeping its summary table, which already
+    covers every year, and the file is vacuumed. Returns the years created.
+    Raises ValueError if the database is in memory or already partitioned, and
+    FileExistsError if a partition file is in the way.
+    """
+    manager = db.get_connection_manager()
+    if manager.in_memory:
+        raise ValueError("An in-memory database can't be partitioned.")
+    if manager.partitioned:
+        raise ValueError("The database is already partitioned.")
+    db.migrate()
+
+    with manager.reader() as conn:
+        years = [year for (year,) in conn.execute(
+            f"SELECT DISTINCT {YEAR_SQL} FROM transactions ORDER BY 1"
+        )]
+        # Generated columns (month_key, date) are recomputed by each partition
+        columns = ", ".join(
+            row[1] for row in conn.execute("PRAGMA main.table_xinfo(transactions)")
+            if row[6] == 0
+        )
+    files = {year: _partition_file(manager, year) for year in years}
+    for file in files.values():
+        if os.path.exists(manager.partition_path(file)):
+            raise FileExistsError(
+                f"Partition file already exists: {manager.partition_path(file)}"
+            )
+
+    with manager._lock:
+        conn = manager._get_writer()
+        for year, file in files.items():
+            create_partition(manager, file)
+            schema = f"y{year:04d}"
+            conn.execute(f"ATTACH DATABASE ? AS {schema}",
+                         (manager.partition_path(file),))
+            try:
+                with conn:
+                    if year == 0:
+                        where, params = "day IS NULL", []
+                    else:
+                        where = "day BETWEEN ? AND ?"
+                        params = [db.to_day(f"{year:04d}-01-01"),
+                                  db.to_day(f"{year:04d}-12-31")]
+                    conn.execute(
+                        f"INSERT INTO {schema}.transactions ({columns})"
+                        f" SELECT {columns} FROM main.transactions"
+                        f" WHERE {where} ORDER BY id",
+                        params,
+                    )
+                conn.execute(f"ANALYZE {schema}")
+            finally:
+                conn.execute(f"DETACH DATABASE {schema}")
+
+        with conn:
+            for statement in PARTITION_TABLES:
+                conn.execute(statement)
+            conn.executemany("INSERT INTO partitions (year, file) VALUES (?, ?)",
+                             files.items())
+            conn.execute("INSERT INTO partition_ids (next_id)"
+                         " SELECT COALESCE(MAX(id), 0) + 1 FROM transactions")
+            # Without its triggers the catalog's summary survives emptying the table,
+            # and the search index is cleared in one step instead of row by row
+            triggers = db.SUMMARY_TRIGGERS + db.SEARCH_TRIGGERS
+            for match in map(_TRIGGER_HEADER.search, triggers):
+                if match is not None:
+                    conn.execute(f"DROP TRIGGER IF EXISTS {match.group(1)}")
+            conn.execute("DELETE FROM transactions")
+            conn.execute(
+                "INSERT INTO transactions_fts (transactions_fts) VALUES ('delete-all')"
+            )
+        conn.execute("VACUUM")
+
+    db.open_database() # Reconnect so every connection sees the catalog
+    return years
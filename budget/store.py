@@ -0,0 +1,289 @@
+"""
+Compact in-memory ledger for the Budget Tracker application.
+
+A LedgerStore keeps the transactions as parallel NumPy arrays (id, day number, amount, category
+code, description code) instead of a DataFrame of Python strings. Categories and descriptions are
+interned: each distinct string is stored once in a StringPool and rows hold its integer code, so
+a million transactions take about 28 MB. Totals and month/category groupings are vectorised
+(np.bincount), and rows can be appended or deleted without reloading.
+"""
+
+# --- Standard library ---
+import sys
+from typing import Iterable, Optional, Sequence
+
+# --- Third-party libraries ---
+import numpy as np
+
+# --- Local database functions ---
+from . import db
+
+# Month key (year * 12 + month) of the month containing day 0 (January 1970)
+_EPOCH_MONTH_KEY = 1970 * 12 + 1
+
+# Day number stored for rows without a date. Days before 1970 are negative, so it's the
+# smallest int32 (the same value the database sorts undated rows by) rather than -1.
+MISSING_DAY = db.UNDATED_DAY
+
+class StringPool:
+    """
+    Interns strings: each distinct value is stored once and identified by an integer code.
+    """
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def __getitem__(self, code: int) -> str:
+        return self.strings[code]
+
+    def code(self, value: Optional[str]) -> int:
+        """
+        Returns the code of value, adding it to the pool if it's new (None is stored as '').
+        """
+        value = value or ""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def codes(self, values: Iterable[Optional[str]], count: int = -1) -> np.ndarray:
+        """
+        Interns every value and returns their codes as an int32 array.
+        """
+        return np.fromiter((self.code(value) for value in values), dtype=np.int32, count=count)
+
+    def lookup(self, values: Iterable[str]) -> np.ndarray:
+        """
+        Returns the codes of values already in the pool (unknown values are skipped, not added).
+        """
+        return np.array([self._codes[value] for value in values if value in self._codes], dtype=np.int32)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory used by the pooled strings.
+        """
+        return sum(sys.getsizeof(value) for value in self.strings)
+
+class LedgerStore:
+    """
+    Column store of transactions. The arrays are over-allocated and grow by doubling, so appends
+    are amortised O(1); the properties return views of the filled part. Rows stay in insertion order,
+    which is id order when loaded from the database and appended as new transactions are added.
+    """
+    # Array name -> dtype
+    COLUMNS = {"ids": np.int64, "days": np.int32, "amounts": np.float64,
+               "category_codes": np.int32, "description_codes": np.int32}
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.categories = StringPool()
+        self.descriptions = StringPool()
+        self._size = 0
+        self._arrays = {name: np.empty(max(capacity, 1), dtype=dtype) for name, dtype in self.COLUMNS.items()}
+
+    @classmethod
+    def from_database(cls, filters: Optional[db.TransactionFilter] = None,
+                      chunk_size: int = db.FETCH_CHUNK_SIZE) -> "LedgerStore":
+        """
+        Loads the matching transactions from the database in bulk, chunk by chunk.
+        """
+        store = cls(capacity=db.count_transactions(filters))
+        for rows in db.iter_stored_transactions(filters, chunk_size):
+            ids, days, amounts, categories, descriptions = zip(*rows)
+            store.extend(ids, days, amounts, categories, descriptions)
+        return store
+
+    def __len__(self) -> int:
+        return self._size
+
+    # --- Columns (read-only views) ---
+
+    def _column(self, name: str) -> np.ndarray:
+        view = self._arrays[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._column("ids")
+
+    @property
+    def days(self) -> np.ndarray:
+        return self._column("days")
+
+    @property
+    def amounts(self) -> np.ndarray:
+        return self._column("amounts")
+
+    @property
+    def category_codes(self) -> np.ndarray:
+        return self._column("category_codes")
+
+    @property
+    def description_codes(self) -> np.ndarray:
+        return self._column("description_codes")
+
+    @property
+    def month_keys(self) -> np.ndarray:
+        """
+        Month key (year * 12 + month) of every row, computed from the day numbers.
+        """
+        months_since_epoch = self.days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int32)
+        return months_since_epoch + _EPOCH_MONTH_KEY
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory used by the arrays (including spare capacity) and the string pools.
+        """
+        return sum(array.nbytes for array in self._arrays.values()) + self.categories.nbytes + self.descriptions.nbytes
+
+    def row(self, position: int) -> tuple[int, Optional[str], float, str, str]:
+        """
+        Returns the row at position as (id, ISO date or None, amount, category, description).
+        """
+        if not 0 <= position < self._size:
+            raise IndexError("row position out of range")
+        arrays = self._arrays
+        day = int(arrays["days"][position])
+        return (int(arrays["ids"][position]), None if day == MISSING_DAY else db.from_day(day),
+                float(arrays["amounts"][position]), self.categories[int(arrays["category_codes"][position])],
+                self.descriptions[int(arrays["description_codes"][position])])
+
+    # --- Changes ---
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = len(self._arrays["ids"])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, array in self._arrays.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._arrays[name] = grown
+
+    def extend(self, ids: Sequence[int], days: Sequence[int], amounts: Sequence[float],
+               categories: Sequence[Optional[str]], descriptions: Sequence[Optional[str]]) -> None:
+        """
+        Appends many rows at once. Dates are day numbers (see db.to_day); missing days become MISSING_DAY.
+        """
+        count = len(ids)
+        if count == 0:
+            return
+        self._reserve(count)
+        end = self._size + count
+        arrays = self._arrays
+        arrays["ids"][self._size:end] = ids
+        arrays["days"][self._size:end] = [MISSING_DAY if day is None else day for day in days]
+        arrays["amounts"][self._size:end] = np.asarray(amounts, dtype=float)
+        arrays["category_codes"][self._size:end] = self.categories.codes(categories, count)
+        arrays["description_codes"][self._size:end] = self.descriptions.codes(descriptions, count)
+        self._size = end
+
+    def append(self, id: int, date: str, amount: float, category: str, description: str = "") -> None:
+        """
+        Appends one transaction (date is ISO, as passed to db.add_transaction).
+        """
+        self.extend([id], [db.to_day(date)], [amount], [category], [description])
+
+    def delete(self, ids: Iterable[int]) -> int:
+        """
+        Removes the rows with the given ids and returns how many were removed.
+        Only the rows after the first removed one are moved, so deleting recent rows is cheap.
+        """
+        targets = np.fromiter(ids, dtype=np.int64)
+        matches = np.flatnonzero(np.isin(self.ids, targets))
+        if len(matches) == 0:
+            return 0
+
+        start = matches[0]
+        keep = np.ones(self._size - start, dtype=bool)
+        keep[matches - start] = False
+        for array in self._arrays.values():
+            tail = array[start:self._size][keep]
+            array[start:start + len(tail)] = tail
+        self._size -= len(matches)
+        return len(matches)
+
+    def clear(self) -> None:
+        self._size = 0
+
+    # --- Vectorised queries ---
+
+    def mask(self, filters: Optional[db.TransactionFilter] = None) -> Optional[np.ndarray]:
+        """
+        Boolean mask of the rows matching filters (None if there's nothing to filter).
+        """
+        if filters is None or not (filters.start_date or filters.end_date or filters.categories is not None
+                                   or filters.has_amounts):
+            return None
+        selected = np.ones(self._size, dtype=bool)
+        if filters.start_date:
+            selected &= self.days >= db.to_day(filters.start_date)
+        if filters.end_date:
+            # Undated rows only match filters without dates, as in the database
+            selected &= (self.days <= db.to_day(filters.end_date)) & (self.days != MISSING_DAY)
+        if filters.categories is not None:
+            selected &= np.isin(self.category_codes, self.categories.lookup(filters.categories))
+        if filters.min_amount is not None:
+            selected &= self.amounts >= filters.min_amount
+        if filters.max_amount is not None:
+            selected &= self.amounts <= filters.max_amount
+        return selected
+
+    def total(self, filters: Optional[db.TransactionFilter] = None) -> float:
+        selected = self.mask(filters)
+        return float(self.amounts.sum() if selected is None else self.amounts[selected].sum())
+
+    def category_totals(self, filters: Optional[db.TransactionFilter] = None) -> tuple[list[str], np.ndarray]:
+        """
+        Returns (categories, totals) for the categories with at least one matching row, in pool order.
+        """
+        selected = self.mask(filters)
+        codes, amounts = self.category_codes, self.amounts
+        if selected is not None:
+            codes, amounts = codes[selected], amounts[selected]
+
+        counts = np.bincount(codes, minlength=len(self.categories))
+        totals = np.bincount(codes, weights=amounts, minlength=len(self.categories))
+        present = np.flatnonzero(counts)
+        return [self.categories[int(code)] for code in present], totals[present]
+
+    def monthly_totals(self, filters: Optional[db.TransactionFilter] = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (month keys, totals) for the months with at least one matching row, oldest first.
+        """
+        months, _, matrix = self.monthly_category_totals(filters)
+        return months, matrix.sum(axis=0)
+
+    def monthly_category_totals(self, filters: Optional[db.TransactionFilter] = None
+                                ) -> tuple[np.ndarray, list[str], np.ndarray]:
+        """
+        Returns (month keys, categories, totals) where totals is a (category x month) matrix like the
+        one the forecasts take. Only months and categories with matching rows are included.
+        """
+        selected = self.mask(filters)
+        dated = self.days != MISSING_DAY
+        valid = dated if selected is None else selected & dated
+        months, codes, amounts = self.month_keys[valid], self.category_codes[valid], self.amounts[valid]
+        if len(months) == 0:
+            return np.empty(0, dtype=np.int32), [], np.empty((0, 0))
+
+        first = months.min()
+        offsets = months - first
+        width = len(self.categories)
+        cells = offsets.astype(np.int64) * width + codes
+        size = (int(offsets.max()) + 1) * width
+        counts = np.bincount(cells, minlength=size).reshape(-1, width)
+        totals = np.bincount(cells, weights=amounts, minlength=size).reshape(-1, width)
+
+        month_rows = np.flatnonzero(counts.any(axis=1))
+        category_columns = np.flatnonzero(counts.any(axis=0))
+        matrix = totals[np.ix_(month_rows, category_columns)].T
+        return month_rows.astype(np.int32) + first, [self.categories[int(code)] for code in category_columns], matrix
@@ -5,13 +5,13 @@ from typing import Optional
 import tkinter as tk
 from tkinter import ttk
 
-# --- Third-party libraries ---
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
 # --- Local mixins ---
 from .transactions import TransactionTabMixin
 from .insights import InsightsTabMixin
+from .worker import BackgroundWorker
+from .scheduler import RefreshScheduler
+from .filter_bar import FilterBar
+from ..db import TransactionFilter
 
 class BudgetApp(TransactionTabMixin, InsightsTabMixin):
     """
@@ -21,22 +21,12 @@ class BudgetApp(TransactionTabMixin, InsightsTabMixin):
     def __init__(self, root) -> None:
         self.root = root
 
-        # --- Global Matplotlib styling for consistent graph text ---
-        plt.rcParams.update({
-            "font.family": "Segoe UI",
-            "font.size": 14,
-            "axes.titlesize": 16,
-            "axes.titleweight": "bold",
-            "axes.labelsize": 14,
-            "xtick.labelsize": 14,
-            "ytick.labelsize": 14,
-            "figure.facecolor": "#F8FAFC",
-            "axes.facecolor": "#F8FAFC"
-        })
-
-        self.canvas: Optional[FigureCanvasTkAgg] = None # Graph canvas; set to None initially so mypy knows type
-        self.trend_canvas: Optional[FigureCanvasTkAgg] = None # Trend graph canvas; set to None initially so mypy knows type
-        self.pie_canvas: Optional[FigureCanvasTkAgg] = None # Pie graph canvas; set to None initially so mypy knows type
+        # Background worker for database reads, aggregation and forecasting
+        self.worker = BackgroundWorker(self.root)
+
+        # Coalesces refresh requests into one pass per idle cycle
+        self.scheduler = RefreshScheduler(self.root, on_flush=self._run_refresh)
+
         self.root.option_add('*Font', ('Segoe UI', 14))
         self.root.configure(bg='#D7E3F4')
         self.root.title("Budget Tracker")
@@ -61,11 +51,32 @@ class BudgetApp(TransactionTabMixin, InsightsTabMixin):
         self.notebook.add(self.transactions_tab, text=" Transactions ")
         self.notebook.add(self.insights_tab, text=" Insights ")
 
+        # --- Filter shared by both tabs (None = the whole ledger), with each tab's controls (see apply_filters) ---
+        self.filters: Optional[TransactionFilter] = None
+        self.filter_bars: list[FilterBar] = []
+
         # --- Build tab contents ---
         self.setup_transactions_tab()
         self.setup_insights_tab()
 
-        # --- Populate initial data for Transactions tab
-        self.update_transaction_list()
-        self.refresh_graph()
-        self.refresh_insights()
\ No newline at end of file
+        # --- Hidden tabs skip rendering; catch up when one is selected ---
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+        # --- Report busy state while background work runs ---
+        self.worker.on_busy_change = self._set_busy
+
+        # --- Populate initial data (loaded in the background; Insights renders when first shown) ---
+        self.refresh_all()
+
+    def is_tab_visible(self, tab: tk.Frame) -> bool:
+        """
+        True if tab is the notebook's selected tab.
+        """
+        return self.notebook.select() == str(tab)
+
+    def _on_tab_changed(self, event=None) -> None:
+        """
+        Renders whatever changed while the newly selected tab was hidden.
+        """
+        self.show_pending_graph()
+        self.show_pending_insights()
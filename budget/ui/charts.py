@@ -0,0 +1,201 @@
+# --- Standard library ---
+import math
+from typing import Optional
+
+# --- Third-party libraries ---
+import pandas as pd
+import matplotlib
+from matplotlib import colormaps
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+# --- Global Matplotlib styling for consistent graph text ---
+# Applied when this module is first imported, i.e. just before the first chart is created,
+# so starting the app doesn't have to import Matplotlib
+CHART_STYLE = {
+    "font.family": "Segoe UI",
+    "font.size": 14,
+    "axes.titlesize": 16,
+    "axes.titleweight": "bold",
+    "axes.labelsize": 14,
+    "xtick.labelsize": 14,
+    "ytick.labelsize": 14,
+    "figure.facecolor": "#F8FAFC",
+    "axes.facecolor": "#F8FAFC"
+}
+matplotlib.rcParams.update(CHART_STYLE)
+
+class _PersistentChart:
+    """
+    Base for charts that own one figure, canvas and set of artists for the app's lifetime.
+    Refreshes update the artists in place and call draw_idle, instead of building a new
+    Figure and FigureCanvasTkAgg (and destroying the old Tk widget) every time.
+    With master=None the chart renders to a plain Agg canvas (headless benchmarks and tests).
+    """
+    def __init__(self, master, figsize: tuple[float, float]) -> None:
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+        self.canvas: FigureCanvasAgg
+        if master is None:
+            self.canvas = FigureCanvasAgg(self.figure)
+        else:
+            self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+
+    @property
+    def widget(self):
+        """
+        The Tk widget to place in the layout (only for charts created with a Tk master).
+        """
+        return self.canvas.get_tk_widget() # type: ignore[attr-defined]
+
+class CategoryBarChart(_PersistentChart):
+    """
+    Horizontal bar chart of the total amount spent per category (Transactions tab).
+    """
+    def __init__(self, master=None) -> None:
+        super().__init__(master, figsize=(4.9, 2))
+        self.categories: list[str] = []
+        self.bars: list = []
+
+        # Set chart title and axis labels
+        self.ax.set_title('Total Spent per Category')
+        self.ax.set_xlabel('Amount (£)')
+        self.ax.set_ylabel('Category')
+
+        # Add padding to avoid clipping and improve layout
+        self.figure.subplots_adjust(left=0.4, right=0.95, top=0.85, bottom=0.3)
+
+        # Reduce font size of axis tick labels for a cleaner look
+        self.ax.tick_params(labelsize=9)
+
+    def update(self, totals: pd.Series) -> None:
+        """
+        Shows totals (indexed by category, lowest first). Bars are resized in place; they are
+        only recreated when the set of categories changes.
+        """
+        categories = [str(category) for category in totals.index]
+        values = totals.to_numpy(dtype=float)
+
+        if categories != self.categories:
+            for bar in self.bars:
+                bar.remove()
+            positions = range(len(categories))
+            self.bars = list(self.ax.barh(positions, values, height=0.5, color='#4CAF50'))
+            self.ax.set_yticks(positions, labels=categories)
+            self.categories = categories
+        else:
+            for bar, value in zip(self.bars, values):
+                bar.set_width(value)
+
+        self.ax.set_ylim(-0.5, len(categories) - 0.5)
+        self.ax.set_xlim(0, max(values.max(initial=0.0), 1.0) * 1.05)
+        self.canvas.draw_idle()
+
+class TrendChart(_PersistentChart):
+    """
+    Line chart of the total amount spent per month (Insights tab).
+    """
+    def __init__(self, master=None) -> None:
+        super().__init__(master, figsize=(6.5, 3.5))
+        self.months: list[str] = []
+        self.line, = self.ax.plot(
+            [], [],
+            marker='o', markersize=8, linewidth=3, color='#2E8B57',
+            markerfacecolor='#4CAF50', markeredgecolor='black'
+        )
+
+        # --- Add subtle style tweaks ---
+        self.ax.set_title('Monthly Spending Trend')
+        self.ax.set_xlabel('Month')
+        self.ax.set_ylabel('Total Spent (£)')
+        self.ax.tick_params(axis='x', rotation=45)
+        self.ax.grid(True, linestyle='--', alpha=0.4)
+
+        self.figure.subplots_adjust(left=0.15, right=0.98, top=0.88, bottom=0.28)
+
+    def update(self, monthly: pd.DataFrame) -> None:
+        """
+        Shows monthly totals (columns 'month' and 'amount', oldest first) by replacing the line's data.
+        """
+        months = monthly['month'].astype(str).tolist()
+        amounts = monthly['amount'].to_numpy(dtype=float)
+        positions = range(len(months))
+
+        self.line.set_data(positions, amounts)
+
+        # Tick labels are only rebuilt when the months change (e.g. a new month starts)
+        if months != self.months:
+            self.ax.set_xticks(positions, labels=months)
+            self.ax.set_xlim(-0.5, len(months) - 0.5)
+            self.months = months
+
+        # Pad the y-axis so the markers aren't clipped
+        low, high = float(amounts.min()), float(amounts.max())
+        padding = (high - low) * 0.1 or max(abs(high) * 0.1, 1.0)
+        self.ax.set_ylim(low - padding, high + padding)
+        self.canvas.draw_idle()
+
+class CategoryPieChart(_PersistentChart):
+    """
+    Pie chart of spending by category (Insights tab).
+    """
+    START_ANGLE = 90
+    LABEL_DISTANCE = 1.1
+    PCT_DISTANCE = 0.6
+
+    def __init__(self, master=None) -> None:
+        super().__init__(master, figsize=(3.5, 3.5))
+        self.categories: list[str] = []
+        self.wedges: list = []
+        self.labels: list = []
+        self.autotexts: list = []
+        self.ax.set_title("Spending by Category")
+
+    def update(self, totals: pd.Series) -> None:
+        """
+        Shows totals (indexed by category). Wedge angles and label positions are updated in place;
+        the wedges are only recreated when the set of categories changes.
+        """
+        totals = totals.sort_index()
+        categories = [str(category) for category in totals.index]
+        values = totals.to_numpy(dtype=float)
+
+        if categories != self.categories:
+            self._create_wedges(categories, values)
+            self.canvas.draw_idle()
+            return
+
+        fractions = values / values.sum()
+        theta1 = float(self.START_ANGLE)
+        for wedge, label, autotext, fraction in zip(self.wedges, self.labels, self.autotexts, fractions):
+            theta2 = theta1 + 360 * fraction
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+
+            # Labels sit on the wedge's middle angle, like Axes.pie places them
+            middle = math.radians((theta1 + theta2) / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            label.set_position((self.LABEL_DISTANCE * x, self.LABEL_DISTANCE * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            autotext.set_position((self.PCT_DISTANCE * x, self.PCT_DISTANCE * y))
+            autotext.set_text(f"{fraction * 100:.0f}%")
+            theta1 = theta2
+        self.canvas.draw_idle()
+
+    def _create_wedges(self, categories: list[str], values) -> None:
+        for artist in self.wedges + self.labels + self.autotexts:
+            artist.remove()
+        # With autopct, pie also returns the percentage texts (the stubs don't tie the two forms to it)
+        self.wedges, self.labels, *autotexts = self.ax.pie(
+            values, labels=categories, autopct="%1.0f%%", startangle=self.START_ANGLE,
+            colors=colormaps["Set3"].colors, labeldistance=self.LABEL_DISTANCE, pctdistance=self.PCT_DISTANCE, # type: ignore[attr-defined]
+        )
+        self.autotexts = autotexts[0]
+        self.categories = categories
+
+def has_values(totals: Optional[pd.Series]) -> bool:
+    """
+    True if there is anything worth charting (a pie of all-zero totals can't be drawn).
+    """
+    return totals is not None and not totals.empty and float(totals.sum()) > 0
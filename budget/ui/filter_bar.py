@@ -0,0 +1,155 @@
+# --- Standard library ---
+from datetime import datetime
+from typing import Callable, Optional, Sequence
+
+# --- Tkinter GUI modules ---
+import tkinter as tk
+from tkinter import ttk
+
+# --- Local database functions ---
+from ..db import TransactionFilter
+
+# Category choice that means "no category filter"
+ALL_CATEGORIES = "All categories"
+
+def parse_date(text: str) -> Optional[str]:
+    """
+    Reads a date typed as DD-MM-YYYY (like the Add Transaction form) or YYYY-MM-DD.
+    Returns it as ISO, None if text is blank, or raises ValueError.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    for pattern in ("%d-%m-%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, pattern).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    raise ValueError(f"'{text}' is not a date (use DD-MM-YYYY).")
+
+def parse_amount(text: str) -> Optional[float]:
+    """
+    Reads an amount bound. Returns None if text is blank, or raises ValueError.
+    """
+    text = text.strip().lstrip("£")
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f"'{text}' is not an amount.") from None
+
+def _display_date(date: Optional[str]) -> str:
+    """
+    Shows an ISO date as DD-MM-YYYY (blank for None).
+    """
+    return datetime.strptime(date, "%Y-%m-%d").strftime("%d-%m-%Y") if date else ""
+
+class FilterBar(tk.Frame):
+    """
+    Date range, category and amount range controls. on_apply receives the TransactionFilter built
+    from the fields (None when every field is blank); the filtering itself happens in the database.
+    Each tab has its own bar, and show() keeps them in step.
+    """
+    def __init__(self, master, on_apply: Callable[[Optional[TransactionFilter]], None],
+                 categories: Callable[[], Sequence[str]], bg: str = "", **kwargs) -> None:
+        super().__init__(master, bg=bg, **kwargs)
+        self.on_apply = on_apply
+        self.categories = categories  # Called each time the category list is opened
+
+        tk.Label(self, text="From", bg=bg).grid(row=0, column=0, sticky="w", padx=(0, 6))
+        self.start_entry = tk.Entry(self, width=11)
+        self.start_entry.grid(row=0, column=1, sticky="ew", pady=2)
+
+        tk.Label(self, text="To", bg=bg).grid(row=0, column=2, sticky="w", padx=6)
+        self.end_entry = tk.Entry(self, width=11)
+        self.end_entry.grid(row=0, column=3, sticky="ew", pady=2)
+
+        self.category_var = tk.StringVar(value=ALL_CATEGORIES)
+        self.category_dropdown = ttk.Combobox(self, width=16, textvariable=self.category_var, state="readonly",
+                                              values=[ALL_CATEGORIES], postcommand=self._load_categories)
+        self.category_dropdown.grid(row=0, column=4, columnspan=2, sticky="ew", padx=(6, 0), pady=2)
+
+        tk.Label(self, text="Min £", bg=bg).grid(row=1, column=0, sticky="w", padx=(0, 6))
+        self.min_entry = tk.Entry(self, width=11)
+        self.min_entry.grid(row=1, column=1, sticky="ew", pady=2)
+
+        tk.Label(self, text="Max £", bg=bg).grid(row=1, column=2, sticky="w", padx=6)
+        self.max_entry = tk.Entry(self, width=11)
+        self.max_entry.grid(row=1, column=3, sticky="ew", pady=2)
+
+        tk.Button(self, text="Apply", command=self.apply, fg="white", bg="#3F51B5").grid(
+            row=1, column=4, sticky="ew", padx=(6, 0), pady=2)
+        tk.Button(self, text="Clear", command=self.clear, fg="white", bg="#A9A9A9").grid(
+            row=1, column=5, sticky="ew", padx=(6, 0), pady=2)
+
+        # Error message for fields that can't be read (hidden until needed)
+        self.error_label = tk.Label(self, text="", bg=bg, fg="red")
+        self.error_label.grid(row=2, column=0, columnspan=6, sticky="w")
+        self.error_label.grid_remove()
+
+        for entry in (self.start_entry, self.end_entry, self.min_entry, self.max_entry):
+            entry.bind("<Return>", lambda event: self.apply())
+        self.category_dropdown.bind("<<ComboboxSelected>>", lambda event: self.apply())
+
+    def read(self) -> Optional[TransactionFilter]:
+        """
+        Builds a filter from the fields (None if they're all blank). Raises ValueError if one can't be read.
+        """
+        start_date, end_date = parse_date(self.start_entry.get()), parse_date(self.end_entry.get())
+        min_amount, max_amount = parse_amount(self.min_entry.get()), parse_amount(self.max_entry.get())
+        category = self.category_var.get()
+
+        if start_date and end_date and start_date > end_date:
+            raise ValueError("The 'From' date is after the 'To' date.")
+        if min_amount is not None and max_amount is not None and min_amount > max_amount:
+            raise ValueError("The minimum amount is above the maximum.")
+
+        filters = TransactionFilter(
+            start_date=start_date,
+            end_date=end_date,
+            categories=(category,) if category and category != ALL_CATEGORIES else None,
+            min_amount=min_amount,
+            max_amount=max_amount,
+        )
+        return None if filters == TransactionFilter() else filters
+
+    def apply(self) -> None:
+        """
+        Passes the filter in the fields to on_apply, or shows why it can't be read.
+        """
+        try:
+            filters = self.read()
+        except ValueError as error:
+            self.error_label.config(text=str(error))
+            self.error_label.grid()
+            return
+        self.error_label.grid_remove()
+        self.on_apply(filters)
+
+    def clear(self) -> None:
+        """
+        Empties every field and applies the (now empty) filter.
+        """
+        self.show(None)
+        self.apply()
+
+    def show(self, filters: Optional[TransactionFilter]) -> None:
+        """
+        Fills the fields from filters (e.g. one applied from the other tab's bar).
+        """
+        filters = filters or TransactionFilter()
+        values = {
+            self.start_entry: _display_date(filters.start_date),
+            self.end_entry: _display_date(filters.end_date),
+            self.min_entry: "" if filters.min_amount is None else f"{filters.min_amount:.2f}",
+            self.max_entry: "" if filters.max_amount is None else f"{filters.max_amount:.2f}",
+        }
+        for entry, value in values.items():
+            entry.delete(0, tk.END)
+            entry.insert(0, value)
+        self.category_var.set(filters.categories[0] if filters.categories else ALL_CATEGORIES)
+        self.error_label.grid_remove()
+
+    def _load_categories(self) -> None:
+        self.category_dropdown.config(values=[ALL_CATEGORIES, *self.categories()])
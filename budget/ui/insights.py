@@ -1,36 +1,41 @@
+from __future__ import annotations
+
 # --- Standard library ---
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
 # --- Tkinter GUI modules ---
 import tkinter as tk
 
-# --- Third-party libraries ---
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+# --- Local data layer ---
+from ..ledger import LedgerSnapshot, get_snapshot
+from ..db import TransactionFilter, get_categories
+from .filter_bar import FilterBar
 
-# --- Local database functions ---
-from ..db import get_all_transactions
+if TYPE_CHECKING:
+    import pandas as pd
+    from .charts import TrendChart, CategoryPieChart
 
 class InsightsTabMixin:
     """
     Contains all code for the Insights tab:
     - layout for the insights tab
+    - filter controls (the same filter as the Transactions tab)
     - monthly trend line chart
     - category pie chart
     - top categories list
     - insight summary messages
     """
     # --- Attributes coming from BudgetApp (parent class) ---
-    update_transaction_list: Callable  # type: ignore[attr-defined]
     amount_spent: tk.Label  # type: ignore[attr-defined]
     month_spent: tk.Label  # type: ignore[attr-defined]
     predict_spent: tk.Label  # type: ignore[attr-defined]
-
-    trend_canvas: FigureCanvasTkAgg | None  # type: ignore[assignment]
-    pie_canvas: FigureCanvasTkAgg | None  # type: ignore[assignment]
+    category_forecast: Optional[pd.Series]  # type: ignore[attr-defined]
 
     insights_tab: tk.Frame  # type: ignore[attr-defined]
+    is_tab_visible: Callable[[tk.Frame], bool]  # type: ignore[attr-defined]
+    filters: Optional[TransactionFilter]  # type: ignore[attr-defined]
+    filter_bars: list[FilterBar]  # type: ignore[attr-defined]
+    apply_filters: Callable[[Optional[TransactionFilter]], None]  # type: ignore[attr-defined]
 
     def setup_insights_tab(self) -> None:
         """
@@ -49,7 +54,12 @@ class InsightsTabMixin:
             bg=bg_color,
             font=('Segoe UI', 20, 'bold')
         )
-        title.pack(pady=(0, 20))
+        title.pack(pady=(0, 10))
+
+        # --- Filters (shared with the Transactions tab) ---
+        filter_bar = FilterBar(frame, on_apply=self.apply_filters, categories=get_categories, bg=bg_color)
+        filter_bar.pack(pady=(0, 10))
+        self.filter_bars.append(filter_bar)
 
         # --- KPI Row (Top) ---
         self.kpi_frame = tk.Frame(frame, bg=bg_color)
@@ -76,12 +86,21 @@ class InsightsTabMixin:
         self.pie_frame = tk.LabelFrame(charts_frame, text="🥧 Spending by Category", bg=bg_color, padx=8, pady=8)
         self.pie_frame.pack(side="left", fill="both", expand=True)
 
+        # Both charts are created on first render, then updated in place on every refresh (packed when there is data)
+        self._trend_chart: Optional[TrendChart] = None
+        self._pie_chart: Optional[CategoryPieChart] = None
+
+        # Latest data not yet rendered because the tab was hidden (rendered when the tab is selected)
+        self._pending_insights: Optional[LedgerSnapshot] = None
+
         # --- Top Categories (below charts) ---
         self.top_frame = tk.LabelFrame(frame, text="Top 3 Categories", bg=bg_color, padx=8, pady=8)
         self.top_frame.pack(fill="x", pady=(0, 10))
 
-        self.top_label = tk.Label(self.top_frame, text="No data yet.", bg=bg_color, font=("Segoe UI", 13))
-        self.top_label.pack(anchor="w")
+        # Left-aligned so the numbered list of categories lines up
+        self.top_label = tk.Label(self.top_frame, text="No data yet.", bg=bg_color, font=("Segoe UI", 14),
+                                  justify="left", anchor="w")
+        self.top_label.pack(anchor="w", pady=(6, 0))
 
         # --- Insights Text Section ---
         self.text_frame = tk.LabelFrame(frame, text="Insights", bg=bg_color, padx=12, pady=8)
@@ -90,42 +109,82 @@ class InsightsTabMixin:
         self.insight_text = tk.Label(self.text_frame, text="No insights yet.", bg=bg_color, font=('Segoe UI', 14))
         self.insight_text.pack(anchor="w")
 
-    def refresh_insights(self) -> None:
+    @property
+    def trend_chart(self) -> TrendChart:
+        """
+        The monthly trend chart, created (and Matplotlib imported) the first time it's needed.
+        """
+        if self._trend_chart is None:
+            from .charts import TrendChart
+            self._trend_chart = TrendChart(self.trend_frame)
+        return self._trend_chart
+
+    @property
+    def pie_chart(self) -> CategoryPieChart:
+        """
+        The category pie chart, created (and Matplotlib imported) the first time it's needed.
+        """
+        if self._pie_chart is None:
+            from .charts import CategoryPieChart
+            self._pie_chart = CategoryPieChart(self.pie_frame)
+        return self._pie_chart
+
+    @property
+    def insights_dirty(self) -> bool:
+        """
+        True if the data changed while the Insights tab was hidden and it hasn't been rendered since.
+        """
+        return self._pending_insights is not None
+
+    def refresh_insights(self, snapshot: Optional[LedgerSnapshot] = None) -> None:
+        """
+        Brings the Insights tab up to date. It's only rendered while it's visible; otherwise
+        it's marked dirty and rendered when the user switches to it (see show_pending_insights).
+        """
+        # Use the shared snapshot (already loaded by the Transactions tab in the same refresh)
+        snapshot = snapshot or get_snapshot(self.filters)
+        if not self.is_tab_visible(self.insights_tab):
+            self._pending_insights = snapshot
+            return
+
+        self._pending_insights = None
+        self.render_insights(snapshot)
+
+    def show_pending_insights(self) -> None:
+        """
+        Renders the Insights tab if the data changed while it was hidden and it's now visible.
+        """
+        if self._pending_insights is not None and self.is_tab_visible(self.insights_tab):
+            snapshot, self._pending_insights = self._pending_insights, None
+            self.render_insights(snapshot)
+
+    def render_insights(self, snapshot: LedgerSnapshot) -> None:
         """
-        Syncs KPI text from Transactions tab to the Insights tab.
+        Syncs KPI text from Transactions tab to the Insights tab and redraws the charts.
         """
-        self.update_transaction_list() # type: ignore[attr-defined]
         self.total_label.config(text=self.amount_spent.cget("text")) # type: ignore[attr-defined]
         self.avg_label.config(text=self.month_spent.cget("text")) # type: ignore[attr-defined]
         self.pred_label.config(text=self.predict_spent.cget("text")) # type: ignore[attr-defined]
-        
-        # Fetch data once
-        df = get_all_transactions()
-        if df.empty:
-            # Clear trend chart
-            if self.trend_canvas:
-                self.trend_canvas.get_tk_widget().destroy()
-                self.trend_canvas = None
-
-            # Clear pie chart
-            if self.pie_canvas:
-                self.pie_canvas.get_tk_widget().destroy()
-                self.pie_canvas = None
+
+        if snapshot.empty:
+            # Hide the charts (they're kept for when data comes back)
+            for chart in (self._trend_chart, self._pie_chart):
+                if chart is not None:
+                    chart.widget.pack_forget()
 
             # Clear top categories
-            if self.top_label:
-                self.top_label.config(text="No data yet.")
+            self.top_label.config(text="No data yet.")
 
             # Clear insights summary
             self.insight_text.config(text="No insights yet.")
 
             return
         
-        monthly = self._get_monthly_totals(df)
+        monthly = snapshot.monthly
 
-        self.show_monthly_trend(df)
-        self.show_category_pie(df)
-        self.show_top_categories(df)
+        self.show_monthly_trend(snapshot)
+        self.show_category_pie(snapshot)
+        self.show_top_categories(snapshot)
 
         if monthly is None or len(monthly) < 2:
             msg = "Add more transactions to see spending trends."
@@ -142,117 +201,52 @@ class InsightsTabMixin:
 
         self.insight_text.config(text=msg)
 
-    def show_monthly_trend(self, df) -> None:
+    def show_monthly_trend(self, snapshot: LedgerSnapshot) -> None:
         """
         Displays a line chart of total amount spent per month in the Insights tab
         """
-        monthly = self._get_monthly_totals(df)
+        monthly = snapshot.monthly
         if monthly is None or monthly.empty:
             return
-        
-        # Destroy old canvas if it exists
-        if self.trend_canvas:
-            self.trend_canvas.get_tk_widget().destroy()
-
-        # Convert month period to string for plotting
-        monthly['month'] = monthly['month'].astype(str)
-
-        # Create a larger, cleaner figure
-        fig, ax = plt.subplots(figsize=(6.5, 3.5))
-        ax.plot(
-            monthly['month'], monthly['amount'],
-            marker='o', markersize=8, linewidth=3, color='#2E8B57',
-            markerfacecolor='#4CAF50', markeredgecolor='black'
-        )
-
-        # --- Add subtle style tweaks ---
-        ax.set_title('Monthly Spending Trend')
-        ax.set_xlabel('Month')
-        ax.set_ylabel('Total Spent (£)')
-        ax.tick_params(axis='x', rotation=45)
-        ax.grid(True, linestyle='--', alpha=0.4)
-
-        plt.subplots_adjust(left=0.15, right=0.98, top=0.88, bottom=0.28)
 
-        # Embed the Matplotlib figure into the Tkinter chart frame
-        self.trend_canvas = FigureCanvasTkAgg(fig, master=self.trend_frame)
-        self.trend_canvas.draw()
-        self.trend_canvas.get_tk_widget().pack(fill="both", expand=True)
+        # Replace the line's data and redraw with draw_idle
+        self.trend_chart.update(monthly)
+        if not self.trend_chart.widget.winfo_manager():
+            self.trend_chart.widget.pack(fill="both", expand=True)
 
-        # Ensure the figure is closed to avoid lingering state
-        plt.close(fig)
-
-    def show_category_pie(self, df) -> None:
+    def show_category_pie(self, snapshot: LedgerSnapshot) -> None:
         """
         Displays a pie chart of spending by category in the Insights tab
         """
-        if df.empty:
-            return
-        
-        # Destroy old canvas if it exists
-        if self.pie_canvas:
-            self.pie_canvas.get_tk_widget().destroy()
+        from .charts import has_values
 
-        grouped = df.groupby("category")["amount"].sum()
-        fig, ax = plt.subplots(figsize=(3.5, 3.5))
-
-        ax.pie(grouped, labels=grouped.index, autopct="%1.0f%%", startangle=90, colors=plt.cm.Set3.colors, labeldistance=1.1) # type: ignore[attr-defined]
-        ax.set_title("Spending by Category")
+        if snapshot.empty or not has_values(snapshot.category_totals):
+            if self._pie_chart is not None:
+                self._pie_chart.widget.pack_forget()
+            return
 
-        # Embed the Matplotlib figure into the Tkinter chart frame
-        self.pie_canvas = FigureCanvasTkAgg(fig, master=self.pie_frame)
-        self.pie_canvas.draw()
-        self.pie_canvas.get_tk_widget().pack(fill="both", expand=True)
-        
-        # Ensure the figure is closed to avoid lingering state
-        plt.close(fig)
+        # Move the existing wedges and redraw with draw_idle
+        self.pie_chart.update(snapshot.category_totals)
+        if not self.pie_chart.widget.winfo_manager():
+            self.pie_chart.widget.pack(fill="both", expand=True)
 
-    def show_top_categories(self, df) -> None:
+    def show_top_categories(self, snapshot: LedgerSnapshot) -> None:
         """
         Displays top 3 categories by total spend in the Insights tab.
         """
-        if df.empty:
+        if snapshot.empty:
             return
 
         # Calculate top 3 categories
-        grouped = df.groupby("category")["amount"].sum().sort_values(ascending=False).head(3)
+        grouped = snapshot.category_totals.sort_values(ascending=False).head(3)
 
         # Build a numbered list of the top 3 categories and their total amounts
+        forecasts = {} if self.category_forecast is None else self.category_forecast.to_dict()
         lines = []
         for i, (category, amount) in enumerate(grouped.items(), start=1):
             line = f"{i}. {category}: £{amount:.2f}"
+            if category in forecasts:
+                line += f" (next month ≈ £{max(forecasts[category], 0.0):.2f})"
             lines.append(line)
 
-        top_text = "\n".join(lines)
-
-        # Destroy old label if it exists
-        if self.top_label:
-            self.top_label.destroy()
-
-        # Create a label that's *properly left-aligned*
-        self.top_label = tk.Label(
-            self.top_frame,
-            text=top_text,
-            bg="#E8F4EA",
-            font=("Segoe UI", 14),
-            justify="left",   # Ensures all lines align left
-            anchor="w"        # Keeps it anchored to the left edge
-        )
-        self.top_label.pack(anchor="w", pady=(6, 0))
-
-    def _get_monthly_totals(self, df) -> Optional[pd.DataFrame]:
-        """
-        Returns a DataFrame with monthly total spend.
-        Returns None if there's no data.
-        """
-        if df.empty:
-            return None
-        
-        df = df.copy()
-        
-        # Convert 'date' column to datetime format
-        df['date'] = pd.to_datetime(df['date'], dayfirst=True)
-        df['month'] = df['date'].dt.to_period('M')
-
-        # Group by month and sum amounts, then convert to a clean DataFrame
-        return df.groupby('month')['amount'].sum().reset_index()
\ No newline at end of file
+        self.top_label.config(text="\n".join(lines))
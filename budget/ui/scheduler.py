@@ -0,0 +1,69 @@
+# --- Standard library ---
+from collections import Counter
+from typing import Callable, Optional
+
+# Views that can be refreshed
+LIST = "list"          # The transactions table
+KPIS = "kpis"          # Total, monthly average and forecast labels
+GRAPH = "graph"        # The Transactions tab bar chart
+INSIGHTS = "insights"  # The Insights tab (charts, top categories, summary)
+ALL_VIEWS = (LIST, KPIS, GRAPH, INSIGHTS)
+
+class RefreshScheduler:
+    """
+    Coalesces refresh requests from anywhere in the UI into a single pass per Tk idle cycle.
+
+    Components call request() with the views they've made stale; however many requests arrive
+    before Tk goes idle, on_flush runs once with the union of the requested views, so each view
+    is refreshed at most once per pass. The counters let tests check how much work an action caused.
+    """
+    def __init__(self, root, on_flush: Optional[Callable[[frozenset[str]], None]] = None) -> None:
+        self.root = root
+        self.on_flush = on_flush
+        self._pending: set[str] = set()
+        self._after_id: Optional[str] = None
+
+        # Counters (see reset_counters)
+        self.requests = 0                     # request() calls
+        self.passes = 0                       # Flushes that did some work
+        self.refreshes: Counter[str] = Counter()  # Times each view was included in a pass
+
+    @property
+    def pending(self) -> frozenset[str]:
+        return frozenset(self._pending)
+
+    def request(self, *views: str) -> None:
+        """
+        Marks views as needing a refresh (all of them if none are given) and schedules a pass
+        for the next idle cycle, unless one is already scheduled.
+        """
+        unknown = set(views) - set(ALL_VIEWS)
+        if unknown:
+            raise ValueError(f"Unknown view(s): {', '.join(sorted(unknown))}")
+
+        self.requests += 1
+        self._pending.update(views or ALL_VIEWS)
+        if self._after_id is None:
+            self._after_id = self.root.after_idle(self.flush)
+
+    def flush(self) -> None:
+        """
+        Runs the pending pass now (normally called by Tk when it goes idle).
+        """
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+        views, self._pending = frozenset(self._pending), set()
+        if not views:
+            return
+
+        self.passes += 1
+        self.refreshes.update(views)
+        if self.on_flush is not None:
+            self.on_flush(views)
+
+    def reset_counters(self) -> None:
+        self.requests = 0
+        self.passes = 0
+        self.refreshes.clear()
@@ -0,0 +1,351 @@
+# --- Standard library ---
+from functools import partial
+from typing import Callable, NamedTuple, Optional
+
+# --- Tkinter GUI modules ---
+import tkinter as tk
+from tkinter import ttk
+
+# --- Local database functions ---
+from .. import db
+
+class ListView(NamedTuple):
+    """
+    The list's filters, order and scroll position, captured on the main thread for fetch().
+    """
+    filters: Optional[db.TransactionFilter]
+    sort_column: str
+    descending: bool
+    top: int
+    visible_rows: int
+
+class FetchedRows(NamedTuple):
+    """
+    What fetch() read for a view: the matching row count and a block of rows from position start.
+    """
+    view: ListView
+    total: int
+    start: int
+    rows: list[tuple]
+
+class VirtualTransactionList(tk.Frame):
+    """
+    A sortable transactions table that only holds the rows currently on screen.
+    Rows are fetched from the database in blocks as the user scrolls (keyset pages seeking from the
+    cached rows, in any sort order), so memory use and redraw time don't depend on how many
+    transactions exist.
+    It can also show a fixed set of rows, such as search results, in place of the ledger (show_results).
+    Several rows can be selected (click, Ctrl+click, Shift+click); the selection is kept by id, so it
+    survives scrolling even though the selected rows' items are recreated.
+    """
+    COLUMNS = ("id", "date", "amount", "category", "description")
+    HEADINGS = {"id": "ID", "date": "Date", "amount": "Amount (£)", "category": "Category", "description": "Description"}
+    WIDTHS = {"id": 60, "date": 120, "amount": 110, "category": 140, "description": 260}
+    ROW_HEIGHT = 28
+
+    def __init__(self, master, visible_rows: int = 15, block_size: int = 200, **kwargs) -> None:
+        super().__init__(master, **kwargs)
+        self.visible_rows = visible_rows
+        self.block_size = block_size  # Rows fetched per query (the on-screen rows plus a buffer either side)
+
+        # Scroll position and ordering
+        self.total = 0
+        self.top = 0  # Index of the first row on screen
+        self.sort_column = "date"
+        self.descending = True
+        self.filters: Optional[db.TransactionFilter] = None
+
+        # Rows shown instead of the ledger (None = the ledger). They keep the order they were given
+        # in (e.g. search ranking) until a heading is clicked, then they're sorted in memory
+        self.results: Optional[list[tuple]] = None
+        self._ranked = False
+
+        # Ids of the selected transactions (on screen or not); on_select is told how many there are
+        self.selected_ids: set[int] = set()
+        self.on_select: Optional[Callable[[int], None]] = None
+
+        # Cached block of rows: self._block holds rows [self._block_start, self._block_start + len(self._block))
+        self._block_start = 0
+        self._block: list[tuple] = []
+
+        # Taller rows so the 14pt app font fits
+        style = ttk.Style(self)
+        style.configure("Transactions.Treeview", rowheight=self.ROW_HEIGHT)
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings", height=visible_rows,
+                                 style="Transactions.Treeview", selectmode="extended")
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=self.HEADINGS[column], command=partial(self.sort_by, column))
+            self.tree.column(column, width=self.WIDTHS[column], anchor="e" if column == "amount" else "w",
+                             stretch=column == "description")
+        self.tree.grid(row=0, column=0, sticky="nsew")
+
+        # The scrollbar represents the whole ledger, not just the rows held by the tree
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        # Mouse wheel (Windows/macOS send <MouseWheel>, X11 sends buttons 4/5) and resizing
+        for widget in (self.tree, self):
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+            widget.bind("<Button-4>", lambda event: self.scroll_rows(-3))
+            widget.bind("<Button-5>", lambda event: self.scroll_rows(3))
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+
+        self._update_headings()
+
+    # --- Public API ---
+
+    def refresh(self) -> None:
+        """
+        Re-reads the row count and redraws the visible rows (call after the data changes).
+        Results shown with show_results are kept; whoever produced them should show fresh ones.
+        To read on a worker thread instead, pass view() to fetch() there and its result to show_fetched().
+        """
+        if self.results is not None:
+            self.render()
+            return
+        self.show_fetched(self.fetch(self.view()))
+
+    def view(self) -> ListView:
+        """
+        Returns the current filters, order and scroll position (main thread).
+        """
+        return ListView(self.filters, self.sort_column, self.descending, self.top, self.visible_rows)
+
+    def fetch(self, view: ListView) -> FetchedRows:
+        """
+        Reads the row count and a block of rows centred on the view's visible rows.
+        Touches no widgets, so it can run on a worker thread.
+        """
+        total = db.count_transactions(view.filters)
+        top = max(0, min(view.top, total - view.visible_rows))
+        start = max(top - max(self.block_size - view.visible_rows, 0) // 2, 0)
+        rows = db.get_transactions_slice(start, self.block_size, view.sort_column, view.descending, view.filters)
+        return FetchedRows(view, total, start, rows)
+
+    def show_fetched(self, fetched: FetchedRows) -> None:
+        """
+        Redraws the visible rows from a fetch() result (main thread). If the list has been re-sorted
+        since, only the count is used and the rows are fetched again in the new order; if it has been
+        filtered differently, the result is ignored (the new filter's refresh follows).
+        """
+        if self.results is not None:
+            self.render()
+            return
+        view = fetched.view
+        if view.filters != self.filters:
+            return
+        self.total = fetched.total
+        if (view.sort_column, view.descending) == (self.sort_column, self.descending):
+            self._block_start, self._block = fetched.start, fetched.rows
+        else:
+            self._block = []
+        self.top = self._clamp(self.top)
+        self.render()
+
+    def show_results(self, rows: list[tuple]) -> None:
+        """
+        Shows rows (OUTPUT_COLUMNS, e.g. from db.search_transactions) in their given order instead of the ledger.
+        """
+        self.results = list(rows)
+        self._ranked = True
+        self.total = len(self.results)
+        self.top = 0
+        self._block = []
+        self._update_headings()
+        self.render()
+
+    def clear_results(self) -> None:
+        """
+        Goes back to showing the whole ledger.
+        """
+        self.results = None
+        self._ranked = False
+        self.top = 0
+        self._update_headings()
+        self.refresh()
+
+    def clear_selection(self) -> None:
+        """
+        Deselects every row.
+        """
+        self.selected_ids.clear()
+        self.tree.selection_set([])
+        if self.on_select is not None:
+            self.on_select(0)
+
+    def sort_by(self, column: str) -> None:
+        """
+        Sorts by a column; clicking the current sort column again reverses the direction.
+        """
+        if column == self.sort_column and not self._ranked:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            self.descending = column in ("date", "amount", "id")  # Newest / biggest first by default
+        self._ranked = False
+        self.top = 0
+        self._block = []
+        self._update_headings()
+        self.render()
+
+    def scroll_rows(self, count: int) -> None:
+        """
+        Scrolls by count rows (negative scrolls up).
+        """
+        self.scroll_to(self.top + count)
+
+    def scroll_to(self, index: int) -> None:
+        """
+        Makes the row at position index the first row on screen.
+        """
+        index = self._clamp(index)
+        if index != self.top:
+            self.top = index
+            self.render()
+
+    def visible_values(self) -> list[tuple]:
+        """
+        Returns the rows currently shown in the tree.
+        """
+        return [tuple(self.tree.item(item, "values")) for item in self.tree.get_children()]
+
+    # --- Rendering ---
+
+    def render(self) -> None:
+        """
+        Replaces the tree's items with the rows for the current scroll position.
+        Only visible_rows items ever exist, however large the ledger is.
+        """
+        self.tree.delete(*self.tree.get_children())
+
+        if self.total == 0:
+            message = "No transactions found." if self.results is None else "No matching transactions."
+            self.tree.insert("", tk.END, values=("", "", "", "", message))
+            self.scrollbar.set(0.0, 1.0)
+            return
+
+        for row in self._rows(self.top, self.top + self.visible_rows):
+            row_id, date, amount, category, description = row
+            self.tree.insert("", tk.END, iid=str(row_id),
+                             values=(row_id, date, f"{amount:.2f}" if amount is not None else "", category, description))
+        self.tree.selection_set([iid for iid in self.tree.get_children() if int(iid) in self.selected_ids])
+
+        first = self.top / self.total
+        last = min(self.top + self.visible_rows, self.total) / self.total
+        self.scrollbar.set(first, last)
+
+    def _rows(self, start: int, end: int) -> list[tuple]:
+        """
+        Returns rows [start, end), fetching a new block from the database if they aren't cached.
+        """
+        block_end = self._block_start + len(self._block)
+        cached = self._block and start >= self._block_start and (end <= block_end or block_end >= self.total)
+        if not cached:
+            self._fetch_block(start, end)
+        offset = start - self._block_start
+        return self._block[offset:offset + (end - start)]
+
+    def _fetch_block(self, start: int, end: int) -> None:
+        """
+        Loads a block of rows covering [start, end).
+        Scrolling next to the cached block uses keyset seeks from the block's edge rows, in whatever
+        order is shown. A jump to an arbitrary position has no row to seek from, so it falls back to
+        an OFFSET query.
+        """
+        if self.results is not None:
+            self._block_start, self._block = 0, self._sorted_results()
+            return
+
+        block_end = self._block_start + len(self._block)
+        column = self.COLUMNS.index(self.sort_column)
+
+        if self._block and self._block_start < start <= block_end:
+            # Scrolling down: continue after the row just above the new top
+            anchor = self._block[start - 1 - self._block_start]
+            page = db.get_transactions_page(after=(anchor[column], anchor[0]), limit=self.block_size,
+                                            direction="next", filters=self.filters, sort_by=self.sort_column,
+                                            descending=self.descending)
+            self._block_start, self._block = start, page.rows
+            return
+
+        if self._block and start < self._block_start <= end:
+            # Scrolling up: prepend the rows before the block, keeping the start of the old block
+            new_start = max(end - self.block_size, 0)
+            first = self._block[0]
+            page = db.get_transactions_page(after=(first[column], first[0]), limit=self._block_start - new_start,
+                                            direction="prev", filters=self.filters, sort_by=self.sort_column,
+                                            descending=self.descending)
+            kept = self._block[:self.block_size - len(page.rows)]
+            self._block_start, self._block = self._block_start - len(page.rows), page.rows + kept
+            return
+
+        # Jump: centre the block on the requested rows
+        buffer = max(self.block_size - (end - start), 0) // 2
+        self._block_start = max(start - buffer, 0)
+        self._block = db.get_transactions_slice(self._block_start, self.block_size, self.sort_column,
+                                                self.descending, self.filters)
+
+    def _sorted_results(self) -> list[tuple]:
+        """
+        The shown results, in their given order or sorted by the current column (missing values first).
+        """
+        results = self.results or []
+        if self._ranked:
+            return results
+        column = self.COLUMNS.index(self.sort_column)
+        return sorted(results, key=lambda row: (row[column] is not None, row[column]), reverse=self.descending)
+
+    def _clamp(self, index: int) -> int:
+        return max(0, min(index, self.total - self.visible_rows))
+
+    def _update_headings(self) -> None:
+        """
+        Shows an arrow on the heading of the current sort column.
+        """
+        for column in self.COLUMNS:
+            arrow = (" ▼" if self.descending else " ▲") if column == self.sort_column and not self._ranked else ""
+            self.tree.heading(column, text=self.HEADINGS[column] + arrow)
+
+    # --- Event handlers ---
+
+    def _on_scrollbar(self, action: str, *args) -> None:
+        """
+        Handles scrollbar drags ('moveto', fraction) and clicks ('scroll', count, 'units'/'pages').
+        """
+        if action == "moveto":
+            self.scroll_to(round(float(args[0]) * self.total))
+        elif action == "scroll":
+            count, unit = int(args[0]), args[1]
+            self.scroll_rows(count * self.visible_rows if unit == "pages" else count)
+
+    def _on_select(self, event=None) -> None:
+        """
+        Updates the selected ids from the rows on screen (rows scrolled out of view stay selected).
+        """
+        shown = {int(iid) for iid in self.tree.get_children() if iid.isdigit()}
+        chosen = {int(iid) for iid in self.tree.selection() if iid.isdigit()}
+        self.selected_ids = (self.selected_ids - shown) | chosen
+        if self.on_select is not None:
+            self.on_select(len(self.selected_ids))
+
+    def _on_mousewheel(self, event) -> str:
+        # Windows reports multiples of 120, macOS small deltas
+        step = -int(event.delta / 120) if abs(event.delta) >= 120 else -event.delta
+        self.scroll_rows(step * 3)
+        return "break"  # Stop the Treeview's own scrolling
+
+    def _on_resize(self, event) -> None:
+        """
+        Shows as many rows as fit in the new height.
+        """
+        heading_height = self.ROW_HEIGHT
+        rows = max(1, (event.height - heading_height) // self.ROW_HEIGHT)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.top = self._clamp(self.top)
+            self.render()
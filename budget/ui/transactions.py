@@ -1,41 +1,91 @@
+from __future__ import annotations
+
 # --- Standard library ---
-from datetime import date
-from typing import Callable, Optional
+import threading
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional
 
 # --- Tkinter GUI modules ---
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
 # --- Third-party libraries ---
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+# Only what the form needs to paint is imported here; pandas, NumPy and Matplotlib
+# are imported on first use (first refresh, forecast and chart render respectively)
 from tkcalendar import DateEntry
-from sklearn.linear_model import LinearRegression
 
 # --- Local database functions ---
 from ..db import (
     initialise_database,
     add_transaction,
-    get_all_transactions,
     delete_latest_transaction as delete_latest,
     delete_all_transactions as delete_all,
-    get_total_amount,
+    delete_transactions,
+    update_transactions,
+    count_transactions,
+    search_transactions,
+    get_categories,
+    validate_transaction,
+    TransactionFilter,
 )
+from ..ledger import LedgerSnapshot, get_snapshot
+from .transaction_list import FetchedRows, ListView, VirtualTransactionList
+from .filter_bar import FilterBar, parse_date
+from .worker import BackgroundWorker
+from .scheduler import RefreshScheduler, ALL_VIEWS, LIST, KPIS, GRAPH, INSIGHTS
+from ..exporter import export_transactions, ExportCancelled
+from .. import instrumentation
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from .charts import CategoryBarChart
+    from ..forecast import Forecaster
+
+# Forecast models offered in the UI (display name -> budget.forecast model name)
+FORECAST_MODELS = {
+    "Linear trend": "trend",
+    "Exponential smoothing": "smoothing",
+    "Seasonal naive": "seasonal",
+    "3-month average": "average",
+}
+
+# Search-as-you-type: wait this long after the last keystroke, and show at most this many matches
+SEARCH_DELAY_MS = 250
+SEARCH_LIMIT = 500
+
+def forecast_next_month(monthly: Optional[pd.DataFrame], model: str = "trend") -> Optional[float]:
+    """
+    Predicts next month's spend from the monthly totals with one of the budget.forecast models.
+    Returns None if there are fewer months than the model needs. Safe to call from a worker thread.
+    """
+    from ..forecast import fill_months, forecast_total
+
+    if monthly is None or monthly.empty:
+        return None
+    return forecast_total(fill_months(monthly['amount'].to_numpy(), list(monthly['month']))[0], model)
 
 class TransactionTabMixin:
     """
     Contains all methods related to the Transactions tab:
     - setup_transactions_tab layout
-    - adding / deleting transactions
-    - refreshing the transactions list
+    - adding / deleting transactions, and editing or deleting the rows selected in the list
+    - importing transactions from CSV
+    - exporting transactions in the background
+    - refreshing the transactions list (loaded on the background worker)
+    - searching descriptions and categories as the user types
+    - filtering every view by date range, category and amount (applied in the database)
     - calculating KPI values
+    - forecasting next month's spend (overall and per category) with a selectable model
     - generating the bar chart
     """
      # --- Attributes provided by BudgetApp but used here ---
     refresh_insights: Callable  # type: ignore[attr-defined]
-    _get_monthly_totals: Callable  # type: ignore[attr-defined]
-    canvas: FigureCanvasTkAgg | None  # type: ignore[assignment]
+    root: tk.Tk  # type: ignore[attr-defined]
+    worker: BackgroundWorker  # type: ignore[attr-defined]
+    scheduler: RefreshScheduler  # type: ignore[attr-defined]
+    is_tab_visible: Callable[[tk.Frame], bool]  # type: ignore[attr-defined]
+    filters: Optional[TransactionFilter]  # type: ignore[attr-defined]
+    filter_bars: list[FilterBar]  # type: ignore[attr-defined]
 
     def setup_transactions_tab(self) -> None:
         """
@@ -109,9 +159,27 @@ class TransactionTabMixin:
                                       command=self.delete_all_transactions, fg='white', bg='#CD5C5C')
         delete_all_button.grid(row=9, column=1, sticky="ew", padx=4, pady=(5,50))
 
-        export_button = tk.Button(self.form_frame, text="Export to CSV",
+        import_button = tk.Button(self.form_frame, text="Import from CSV",
+                                      command=self.import_from_csv, fg='white', bg='#3F51B5')
+        import_button.grid(row=10, column=1, sticky="ew", padx=4, pady=(5))
+
+        export_button = tk.Button(self.form_frame, text="Export...",
                                       command=self.export_to_csv, fg='white', bg='#3F51B5')
-        export_button.grid(row=10, column=1, sticky="ew", padx=4, pady=(5))
+        export_button.grid(row=11, column=1, sticky="ew", padx=4, pady=(5))
+
+        # Buttons that change data are disabled while background work is running
+        self.action_buttons = [submit_button, delete_button, delete_all_button, import_button, export_button]
+        self._busy_after: Optional[str] = None
+
+        # Progress bar for imports/exports and a cancel button for exports (hidden until needed)
+        self.progress_bar = ttk.Progressbar(self.form_frame, mode="determinate", maximum=100)
+        self.cancel_button = tk.Button(self.form_frame, text="Cancel export",
+                                       command=self.cancel_export, fg='white', bg='#A9A9A9')
+
+        # Export state; export_filters narrows what gets exported (None = everything)
+        self.export_filters: Optional[TransactionFilter] = None
+        self._export_running = False
+        self._export_cancel = threading.Event()
 
         # --- Right: Transactions and Data Visualisation form ---
         self.right = tk.Frame(self.transactions_tab, bg=bg_color) # type: ignore[attr-defined]
@@ -126,11 +194,44 @@ class TransactionTabMixin:
         # Transactions area
         tx_box = tk.LabelFrame(self.right, text="Transactions", bg=bg_color, padx=8, pady=8)
         tx_box.grid(row=0, column=0, sticky="nsew")
-        tx_box.grid_rowconfigure(0, weight=1)
+        tx_box.grid_rowconfigure(2, weight=1)
         tx_box.grid_columnconfigure(0, weight=1)
 
-        self.text_output = tk.Text(tx_box, height=15, width=60)
-        self.text_output.grid(row=0, column=0, sticky="nsew")
+        # Filters (shared with the Insights tab): date range, category and amount range
+        filter_bar = FilterBar(tx_box, on_apply=self.apply_filters, categories=get_categories, bg=bg_color)
+        filter_bar.grid(row=0, column=0, sticky="w", pady=(0, 8))
+        self.filter_bars.append(filter_bar)
+
+        # Search box: matching transactions replace the list while it has text (Escape clears it)
+        search_bar = tk.Frame(tx_box, bg=bg_color)
+        search_bar.grid(row=1, column=0, sticky="ew", pady=(0, 8))
+        search_bar.grid_columnconfigure(1, weight=1)
+        tk.Label(search_bar, text="Search", bg=bg_color).grid(row=0, column=0, sticky="w", padx=(0, 10))
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(search_bar, textvariable=self.search_var)
+        self.search_entry.grid(row=0, column=1, sticky="ew")
+        self.search_entry.bind("<Escape>", lambda event: self.search_var.set(""))
+        self.search_var.trace_add("write", lambda *args: self.schedule_search())
+        self._search_after: Optional[str] = None
+
+        # Virtual list: only the rows on screen are fetched from the database
+        self.transaction_list = VirtualTransactionList(tx_box, visible_rows=15, bg=bg_color)
+        self.transaction_list.grid(row=2, column=0, sticky="nsew")
+
+        # Batch edits of the selected rows (Ctrl/Shift+click selects several)
+        selection_bar = tk.Frame(tx_box, bg=bg_color)
+        selection_bar.grid(row=3, column=0, sticky="ew", pady=(8, 0))
+        selection_bar.grid_columnconfigure(0, weight=1)
+        self.selection_label = tk.Label(selection_bar, text="No transactions selected.", bg=bg_color)
+        self.selection_label.grid(row=0, column=0, sticky="w")
+        edit_selected_button = tk.Button(selection_bar, text="Edit selected...", command=self.edit_selected_transactions,
+                                         fg='white', bg='#3F51B5')
+        edit_selected_button.grid(row=0, column=1, padx=(6, 0))
+        delete_selected_button = tk.Button(selection_bar, text="Delete selected", command=self.delete_selected_transactions,
+                                           fg='white', bg='#CD5C5C')
+        delete_selected_button.grid(row=0, column=2, padx=(6, 0))
+        self.transaction_list.on_select = self._show_selection_count
+        self.action_buttons += [edit_selected_button, delete_selected_button]
 
         # Stats area
         stats = tk.Frame(self.right, bg=bg_color, padx=8, pady=8)
@@ -147,82 +248,253 @@ class TransactionTabMixin:
         self.predict_spent = tk.Label(stats, text="", bg=bg_color, fg="black", font=('bold', 18))
         self.predict_spent.grid(row=3, column=0, sticky="w")
 
+        # Forecast model picker (changing it re-runs the forecast in the background)
+        tk.Label(stats, text="Forecast model", bg=bg_color).grid(row=2, column=1, sticky="e")
+        self.forecast_model = FORECAST_MODELS["Linear trend"]
+        self.forecast_model_var = tk.StringVar(value="Linear trend")
+        self.forecast_dropdown = ttk.Combobox(
+            stats, width=20, textvariable=self.forecast_model_var, values=list(FORECAST_MODELS), state='readonly'
+        )
+        self.forecast_dropdown.grid(row=3, column=1, sticky="e")
+        self.forecast_dropdown.bind("<<ComboboxSelected>>", self.select_forecast_model)
+
+        # Per-category forecasts from the last refresh; the Forecaster is kept between refreshes
+        # so only the months that changed are recomputed (it's used from worker threads, hence the lock)
+        self.category_forecast: Optional[pd.Series] = None
+        self._forecaster: Optional[Forecaster] = None
+        self._forecast_lock = threading.Lock()
+
+        # Views covered by the refresh pass currently running on the worker
+        self._refreshing_views: frozenset[str] = frozenset()
+
         # Graph area
         self.graph_frame = tk.LabelFrame(self.right, text="Data Visualisation", bg=bg_color, padx=8, pady=8)
         self.graph_frame.grid(row=2, column=0, sticky="nsew")
         self.graph_frame.grid_rowconfigure(0, weight=1)
         self.graph_frame.grid_columnconfigure(0, weight=1)
 
+        # The bar chart is created on first render, then updated in place on every refresh (gridded when there is data)
+        self._bar_chart: Optional[CategoryBarChart] = None
+        self.graph_visible = False
+
+        # Latest data not yet charted because the tab was hidden (drawn when the tab is selected again)
+        self._pending_graph: Optional[LedgerSnapshot] = None
+
+    @property
+    def bar_chart(self) -> CategoryBarChart:
+        """
+        The category bar chart, created (and Matplotlib imported) the first time it's needed.
+        """
+        if self._bar_chart is None:
+            from .charts import CategoryBarChart
+            self._bar_chart = CategoryBarChart(self.graph_frame)
+        return self._bar_chart
+
     def submit_transaction(self) -> None:
         """
         Validates user input, then saves the transaction to the database and updates the GUI.
         """
         raw_date = self.date_entry.get()
-        date = pd.to_datetime(raw_date, dayfirst=True).strftime("%Y-%m-%d")
+        date = datetime.strptime(raw_date, "%d-%m-%Y").strftime("%Y-%m-%d") if raw_date else "" # Matches the DateEntry's date_pattern
         amount = self.amount_entry.get()
         category = self.category_var.get()
         description = self.description_entry.get()
 
-        # Ensure all fields are filled (except description)
-        if not all([date, amount, category]):
-            self.status_label.config(text="All fields must be filled in.", fg="red")
-            return
-
-        # Validate amount is a positive number
-        try:
-            amount_float = float(amount)
-            if amount_float < 0:
-                self.status_label.config(text="Amount must be a positive number.", fg="red")
-                return
-        except ValueError:
-            self.status_label.config(text="Amount must be a number.", fg="red")
-            return
-
-        # Validate description is NOT a number
-        if description.isnumeric():
-            self.status_label.config(text="Description must not be a number.", fg="red")
+        # Same rules as imports and batch edits: all fields but the description filled in,
+        # a positive amount, and a description that isn't a number
+        reason = validate_transaction(date, amount, category, description)
+        if reason:
+            self.status_label.config(text=reason, fg="red")
             return
 
         # Add transaction and refresh the GUI
-        add_transaction(date, amount_float, category, description)
+        add_transaction(date, float(amount), category, description)
         self.status_label.config(text="Transaction added successfully.", fg="green")
         self.clear_form(show_status=False) # Keep the transaction message visible
-        self.update_transaction_list()
 
-        # Call the function to refresh the graph
-        self.refresh_graph()
+        # Reload the list, KPIs and charts in the background
+        self.refresh_all()
+
+    def refresh_all(self) -> None:
+        """
+        Asks for every view (list, KPIs, charts, Insights) to be refreshed. Requests made before
+        Tk goes idle are coalesced by the scheduler into a single pass (see _run_refresh).
+        """
+        self.scheduler.request()
+
+    def _run_refresh(self, views: frozenset[str]) -> None:
+        """
+        Runs one coalesced refresh pass (called by the scheduler at most once per idle cycle).
+        The snapshot, the list's visible rows, and the forecast if the KPIs need it, are loaded on the
+        background worker, then each requested view is updated once on the main thread.
+        """
+        # A pass still in flight will have its result discarded, so its views are carried over
+        views = views | self._refreshing_views
+        self._refreshing_views = views
+        filters = self.filters
+        # Search results are re-run instead (see _apply_refresh), so the ledger's rows aren't needed
+        shows_ledger = LIST in views and self.transaction_list.results is None
+        list_view = self.transaction_list.view() if shows_ledger else None
+        self.worker.submit("refresh", lambda: self._load_refresh_data(views, filters, list_view),
+                           lambda data: self._apply_refresh(views, data))
+
+    def _load_refresh_data(self, views: frozenset[str] = frozenset(ALL_VIEWS), filters: Optional[TransactionFilter] = None,
+                           list_view: Optional[ListView] = None
+                           ) -> tuple[LedgerSnapshot, Optional[float], Optional[pd.Series], Optional[FetchedRows]]:
+        """
+        Runs on a worker thread, so it must not touch any widgets (filters and list_view are read on the main thread).
+        """
+        # Import the chart module here, so the first chart render on the main thread doesn't pay for Matplotlib
+        from . import charts # noqa: F401
 
-        # Update insights tab
-        self.refresh_insights() # type: ignore[attr-defined]
+        snapshot = get_snapshot(filters)
+        fetched = self.transaction_list.fetch(list_view) if list_view is not None else None
+        if KPIS not in views:
+            return snapshot, None, None, fetched
+        return (snapshot, *self._forecast_categories(snapshot), fetched)
 
-    def update_transaction_list(self) -> None:
+    def _forecast_categories(self, snapshot: LedgerSnapshot) -> tuple[Optional[float], Optional[pd.Series]]:
+        """
+        Forecasts next month for every category in one batched computation (worker thread).
+        Every model is linear in the data, so the total forecast is the sum of the category forecasts.
+        """
+        import pandas as pd
+        from ..forecast import Forecaster, fill_months
+
+        matrix = snapshot.category_monthly
+        if matrix is None:
+            return None, None
+
+        # Months without spending are missing from the pivot, but the models need every month
+        model, labels = self.forecast_model, list(matrix.index)
+        history = fill_months(matrix.to_numpy(), [str(month) for month in matrix.columns])
+        with self._forecast_lock:
+            if self._forecaster is None or self._forecaster.model.name != model:
+                self._forecaster = Forecaster(history, model, labels)
+            else:
+                self._forecaster.update(history, labels)
+            forecasts = self._forecaster.forecasts()
+
+        if forecasts is None:
+            return None, None
+        return float(forecasts.sum()), pd.Series(forecasts, index=matrix.index, name="forecast")
+
+    def _apply_refresh(self, views: frozenset[str], data: tuple[LedgerSnapshot, Optional[float],
+                                                                Optional[pd.Series], Optional[FetchedRows]]) -> None:
         """
-        Fetches all the transactions and updates the display area, total amount spent and monthly average spend.
+        Applies a finished background refresh to the requested views (main thread).
         """
-        df = get_all_transactions()
-        self.text_output.delete('1.0', tk.END)
-        if df.empty:
-            self.text_output.insert(tk.END, "No transactions found.")
+        self._refreshing_views = frozenset()
+        snapshot, prediction, category_forecast, fetched = data
+
+        if LIST in views:
+            if fetched is not None:
+                self.transaction_list.show_fetched(fetched)
+            else:
+                self.transaction_list.refresh()
+            if self.transaction_list.results is not None:
+                self.run_search() # Re-run the search so its results include the changes
+        if KPIS in views:
+            self.category_forecast = category_forecast
+            self.update_kpis(snapshot, prediction)
+        if GRAPH in views:
+            self.refresh_graph(snapshot)
+        if INSIGHTS in views:
+            self.refresh_insights(snapshot) # type: ignore[attr-defined]
+
+        # When instrumented, the action that caused this refresh ends once the charts queued above have rendered
+        if instrumentation.is_installed():
+            self.root.after_idle(instrumentation.end_action)
+
+    def _set_busy(self, busy: bool) -> None:
+        """
+        Shows a busy cursor and disables the data buttons while background work runs.
+        The busy state only appears if the work takes longer than a moment, to avoid flicker.
+        """
+        if self._busy_after is not None:
+            self.root.after_cancel(self._busy_after)
+            self._busy_after = None
+
+        def apply(state: Literal["normal", "disabled"], cursor: str) -> None:
+            self._busy_after = None
+            self.root.config(cursor=cursor)
+            for button in self.action_buttons:
+                button.config(state=state)
+
+        if busy:
+            self._busy_after = self.root.after(150, apply, "disabled", "watch")
         else:
-            # Display transactions as a formatted table (no index)
-            self.text_output.insert(tk.END, df.to_string(index=False))
-        
+            apply("normal", "")
+
+    def update_transaction_list(self, snapshot: Optional[LedgerSnapshot] = None,
+                                prediction: Optional[float] = None) -> None:
+        """
+        Updates the transactions list, total amount spent and monthly average spend from the shared ledger snapshot.
+        """
+        # Redraw the visible rows (the list fetches just those rows itself)
+        self.transaction_list.refresh()
+        self.update_kpis(snapshot, prediction)
+
+    def apply_filters(self, filters: Optional[TransactionFilter]) -> None:
+        """
+        Restricts every view (list, search, KPIs, charts, Insights and exports) to the transactions matching
+        filters (None shows everything), and shows the filter in both tabs' filter bars.
+        """
+        self.filters = filters
+        self.export_filters = filters
+        for filter_bar in self.filter_bars:
+            filter_bar.show(filters)
+
+        self.transaction_list.filters = filters
+        self.transaction_list.top = 0
+        self.refresh_all()
+
+    def schedule_search(self) -> None:
+        """
+        Restarts the search timer on every keystroke, so the search only runs once typing pauses.
+        """
+        if self._search_after is not None:
+            self.root.after_cancel(self._search_after)
+        self._search_after = self.root.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self) -> None:
+        """
+        Searches for the text in the search box on the background worker and shows the matches,
+        best first. An empty box shows the whole ledger again.
+        """
+        self._search_after = None
+        query = self.search_var.get().strip()
+
+        # A search still queued for older text is cancelled, and one already running is ignored
+        self.worker.cancel("search")
+        if not query:
+            if self.transaction_list.results is not None:
+                self.transaction_list.clear_results()
+            return
+        filters = self.filters
+        self.worker.submit("search", lambda: search_transactions(query, SEARCH_LIMIT, filters),
+                           self.transaction_list.show_results)
+
+    def update_kpis(self, snapshot: Optional[LedgerSnapshot] = None, prediction: Optional[float] = None) -> None:
+        """
+        Updates the total amount spent, monthly average and predicted spend labels.
+        """
+        snapshot = snapshot or get_snapshot(self.filters)
+
         # Update total amount spent 
-        amount = get_total_amount()
-        self.amount_spent.config(text="Total amount spent = £{:.2f}".format(amount))
+        self.amount_spent.config(text="Total amount spent = £{:.2f}".format(snapshot.total))
 
         # Update average monthly spend
-        self.calculate_monthly_avg()
+        self.calculate_monthly_avg(snapshot)
 
         # Update predicted spend
-        self.predict_next_month_spend()
+        self.predict_next_month_spend(snapshot, prediction)
 
-    def calculate_monthly_avg(self) -> None:
+    def calculate_monthly_avg(self, snapshot: Optional[LedgerSnapshot] = None) -> None:
         """
         Calculates and displays the average amount spent per month.
         """
-        df = get_all_transactions()
-        monthly = self._get_monthly_totals(df) # type: ignore[attr-defined]
+        monthly = (snapshot or get_snapshot(self.filters)).monthly
 
         if monthly is None or monthly.empty:
             self.month_spent.config(text="Average monthly spend = £0.00")
@@ -232,34 +504,33 @@ class TransactionTabMixin:
         avg = monthly['amount'].mean()
         self.month_spent.config(text="Average monthly spend = £{:.2f}".format(avg))
 
-    def predict_next_month_spend(self) -> None:
+    def predict_next_month_spend(self, snapshot: Optional[LedgerSnapshot] = None,
+                                 prediction: Optional[float] = None) -> None:
         """
-        Predicts the next month's spending using linear regression based on historical monthly totals.
+        Predicts the next month's spending with the selected forecast model, based on historical monthly totals.
+        A prediction already computed on the worker can be passed in to skip the forecast.
         """
-        df = get_all_transactions()
-        monthly = self._get_monthly_totals(df) # type: ignore[attr-defined]
+        from ..forecast import get_model
 
-        if monthly is None or len(monthly) < 2:
-            self.predict_spent.config(text="Next month's predicted spend = Need at least 2 months of data")
-            return
-        
-        # Creates a numeric sequence for months: 0, 1, 2 etc
-        monthly['month_num'] = range(len(monthly))
+        if prediction is None:
+            prediction = forecast_next_month((snapshot or get_snapshot(self.filters)).monthly, self.forecast_model)
 
-        # Takes the input (month) and output (amount)
-        X = monthly[['month_num']]
-        y = monthly['amount']
-        
-        # Initalise a simple linear regression model
-        model = LinearRegression()
-        model.fit(X, y)
-
-        # Predict for the next month
-        next_month = pd.DataFrame([[len(monthly)]], columns=['month_num']) # E.g. if we have 5 months, predict month 5 (zero-indexed)
-        prediction = model.predict(next_month)[0] # Get the predicted value from the result array
+        if prediction is None:
+            months = get_model(self.forecast_model).min_months
+            self.predict_spent.config(
+                text=f"Next month's predicted spend = Need at least {months} month{'s' if months != 1 else ''} of data"
+            )
+            return
 
         self.predict_spent.config(text="Next month's predicted spend = £{:.2f}".format(prediction))
 
+    def select_forecast_model(self, event=None) -> None:
+        """
+        Switches the forecast model to the one picked in the dropdown and re-runs the forecast.
+        """
+        self.forecast_model = FORECAST_MODELS[self.forecast_model_var.get()]
+        self.scheduler.request(KPIS, INSIGHTS)
+
     def clear_form(self, show_status=True) -> None:
         """
         Clears the form.
@@ -282,15 +553,11 @@ class TransactionTabMixin:
         latest_id = delete_latest()
         if latest_id:
             self.status_label.config(text=f"Transaction with ID {latest_id} deleted.", fg="green")
-            self.update_transaction_list()
         else:
             self.status_label.config(text="No transaction to delete.", fg="red")
 
-        # Call the function to refresh the graph
-        self.refresh_graph()
-
-        # Update insights tab
-        self.refresh_insights() # type: ignore[attr-defined]
+        # Reload the list, KPIs and charts in the background
+        self.refresh_all()
 
     def delete_all_transactions(self) -> None:
         """
@@ -299,90 +566,264 @@ class TransactionTabMixin:
         confirm = messagebox.askyesno("Confirm Delete", "Are you sure you want to delete all transactions?")
         if confirm:
             delete_all()
+            self.transaction_list.clear_selection()
             self.status_label.config(text="All transactions have been deleted.", fg="green")
-            self.update_transaction_list()
         else:
             self.status_label.config(text="Delete cancelled.", fg="red")
 
-        # Call the function to refresh the graph
-        self.refresh_graph()
+        # Reload the list, KPIs and charts in the background
+        self.refresh_all()
 
-        # Update insights tab
-        self.refresh_insights() # type: ignore[attr-defined]
+    def _show_selection_count(self, count: int) -> None:
+        self.selection_label.config(
+            text=f"{count} transaction{'s' if count != 1 else ''} selected." if count else "No transactions selected.")
 
-    def show_transaction_graph(self) -> None:
+    def delete_selected_transactions(self) -> None:
         """
-        Displays a bar chart of the total amount spent per category inside the Tkinter window.
+        Deletes every transaction selected in the list, in one statement, after confirmation.
         """
-        df = get_all_transactions()
-        if df.empty:
+        ids = sorted(self.transaction_list.selected_ids)
+        if not ids:
+            self.status_label.config(text="Select transactions to delete first.", fg="red")
+            return
+        if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {len(ids)} selected transactions?"):
+            self.status_label.config(text="Delete cancelled.", fg="red")
             return
 
-        # Destroy old canvas if it exists
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
+        deleted = delete_transactions(ids)
+        self.transaction_list.clear_selection()
+        self.status_label.config(text=f"Deleted {deleted} transactions.", fg="green")
 
-        # Group transactions by category, sum their amounts, and sort from lowest to highest
-        grouped = df.groupby('category')['amount'].sum().sort_values()
+        # Reload the list, KPIs and charts in the background
+        self.refresh_all()
 
-        # Create a horizontal bar chart figure sized to match the layout
-        fig, ax = plt.subplots(figsize=(4.9, 2))
-        grouped.plot(kind='barh', ax=ax, color='#4CAF50')
+    def edit_selected_transactions(self) -> None:
+        """
+        Opens a dialog that changes the date, amount, category or description of every selected
+        transaction at once (fields left blank keep their current values).
+        """
+        ids = sorted(self.transaction_list.selected_ids)
+        if not ids:
+            self.status_label.config(text="Select transactions to edit first.", fg="red")
+            return
+
+        bg_color = '#D7E3F4'
+        dialog = tk.Toplevel(self.root, bg=bg_color, padx=12, pady=12)
+        dialog.title(f"Edit {len(ids)} transaction{'s' if len(ids) != 1 else ''}")
+        dialog.transient(self.root)
+        dialog.grid_columnconfigure(1, weight=1)
+        tk.Label(dialog, text="Fill in only what should change:", bg=bg_color).grid(
+            row=0, column=0, columnspan=2, sticky="w", pady=(0, 8))
+
+        fields: dict[str, tk.Entry] = {}
+        labels = {"date": "Date (DD-MM-YYYY)", "amount": "Amount", "category": "Category", "description": "Description"}
+        for row, (name, label) in enumerate(labels.items(), start=1):
+            tk.Label(dialog, text=label, bg=bg_color).grid(row=row, column=0, sticky="w", padx=(0, 10), pady=4)
+            if name == "category":
+                fields[name] = ttk.Combobox(dialog, values=self.category_dropdown["values"])
+            else:
+                fields[name] = tk.Entry(dialog)
+            fields[name].grid(row=row, column=1, sticky="ew", pady=4)
+
+        error_label = tk.Label(dialog, text="", bg=bg_color, fg="red")
+        error_label.grid(row=5, column=0, columnspan=2, sticky="w")
+
+        def apply() -> None:
+            error = self.apply_edits(ids, {name: field.get() for name, field in fields.items()})
+            if error:
+                error_label.config(text=error)
+            else:
+                dialog.destroy()
+
+        tk.Button(dialog, text="Apply", command=apply, fg='white', bg='#4CAF50').grid(
+            row=6, column=1, sticky="ew", pady=(8, 0))
+        fields["date"].focus_set()
+
+    def apply_edits(self, ids: list[int], values: dict[str, str]) -> Optional[str]:
+        """
+        Applies the non-blank values typed in the edit dialog to the given transactions in one statement.
+        Returns the reason the values were rejected, or None once the change is saved.
+        """
+        changes: dict[str, Any] = {name: value.strip() for name, value in values.items() if value.strip()}
+        if not changes:
+            return "Nothing to change."
+        try:
+            if "date" in changes:
+                changes["date"] = parse_date(changes["date"])  # Not blank, so an ISO date or ValueError
+            updated = update_transactions(ids, **changes)
+        except ValueError as error:
+            return str(error)
 
-        # Set chart title and axis labels
-        ax.set_title('Total Spent per Category')
-        ax.set_xlabel('Amount (£)')
-        ax.set_ylabel('Category')
+        self.status_label.config(text=f"Updated {updated} transactions.", fg="green")
 
-        # Add padding to avoid clipping and improve layout
-        plt.subplots_adjust(left=0.4, right=0.95, top=0.85, bottom=0.3)
+        # Reload the list, KPIs and charts in the background
+        self.refresh_all()
+        return None
 
-        # Reduce font size of axis tick labels for a cleaner look
-        ax.tick_params(labelsize=9)
+    def show_transaction_graph(self, snapshot: Optional[LedgerSnapshot] = None) -> None:
+        """
+        Displays a bar chart of the total amount spent per category inside the Tkinter window.
+        """
+        snapshot = snapshot or get_snapshot(self.filters)
+        if snapshot.empty:
+            return
 
-        # Embed the Matplotlib figure into the Tkinter graph frame
-        self.canvas = FigureCanvasTkAgg(fig, master=self.graph_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
+        # Category totals come pre-grouped and sorted from lowest to highest;
+        # the existing bars are resized and redrawn with draw_idle
+        self.bar_chart.update(snapshot.category_totals)
 
-        # Ensure the figure is closed to avoid lingering state
-        plt.close(fig)
+        if not self.graph_visible:
+            self.bar_chart.widget.grid(row=0, column=0, sticky="nsew")
 
-    def refresh_graph(self) -> None:
+    def refresh_graph(self, snapshot: Optional[LedgerSnapshot] = None) -> None:
         """
-        Updates or removes the graph whether there is data
+        Updates or hides the graph whether there is data.
+        While the Transactions tab is hidden the graph is left alone and redrawn when the tab is selected.
         """
-        df = get_all_transactions()
+        snapshot = snapshot or get_snapshot(self.filters)
+        if not self.is_tab_visible(self.transactions_tab): # type: ignore[attr-defined]
+            self._pending_graph = snapshot
+            return
+        self._pending_graph = None
 
-        # If there is no data then remove the graph from the GUI
-        if df.empty:
-            # Destroy old canvas if it exists
-            if self.canvas:
-                self.canvas.get_tk_widget().destroy()
-                self.canvas = None  # type: ignore[assignment]
+        # If there is no data then hide the graph (it's kept for when data comes back)
+        if snapshot.empty:
+            if self.graph_visible:
+                self.bar_chart.widget.grid_remove()
             # Update state to reflect no graph is currently visible
             self.graph_visible = False
             return
         
         # If there is data then draw the graph in the GUI
-        self.show_transaction_graph()
+        self.show_transaction_graph(snapshot)
         self.graph_visible = True
 
+    def show_pending_graph(self) -> None:
+        """
+        Redraws the graph if the data changed while the Transactions tab was hidden and it's now visible.
+        """
+        if self._pending_graph is not None and self.is_tab_visible(self.transactions_tab): # type: ignore[attr-defined]
+            self.refresh_graph(self._pending_graph)
+
     def export_to_csv(self) -> None:
         """
-        Exports all transactions from the database to a CSV file.
+        Exports transactions to CSV, compressed CSV or Parquet.
+        The export streams from the database on the background worker so the window stays responsive.
         """
-        df = get_all_transactions()
-        if df.empty:
+        if self._export_running:
+            self.status_label.config(text="An export is already running.", fg="red")
+            return None
+
+        if count_transactions(self.export_filters) == 0:
             return None
         
-        # Ask user where to save CSV file
+        # Ask user where to save the file; the extension picks the format
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv")],
-            title="Save transactions as CSV"
+            filetypes=[("CSV files", "*.csv"), ("Compressed CSV", "*.csv.gz"), ("Parquet files", "*.parquet")],
+            title="Export transactions"
         )
+        if not file_path:
+            return None
 
-        # If user provideda file path, export the DataFrame to CSV
-        if file_path:
-            df.to_csv(file_path, index=False)
\ No newline at end of file
+        # Show progress and the cancel button while the export runs
+        self._export_running = True
+        self._export_cancel = threading.Event()
+        self.progress_bar["value"] = 0
+        self.progress_bar.grid(row=12, column=1, sticky="ew", padx=4, pady=(5))
+        self.cancel_button.grid(row=13, column=1, sticky="ew", padx=4, pady=(5))
+        self.status_label.config(text="Exporting...", fg="black")
+
+        filters, cancel_event = self.export_filters, self._export_cancel
+        self.worker.submit(
+            "export",
+            lambda: export_transactions(
+                file_path, filters=filters, cancel_event=cancel_event,
+                progress=lambda written, total: self.worker.post(self._show_export_progress, written, total),
+            ),
+            on_done=lambda rows: self._finish_export(f"Exported {rows} transactions.", "green"),
+            on_error=self._export_failed,
+        )
+
+    def _show_export_progress(self, written: int, total: int) -> None:
+        self.progress_bar["value"] = written / max(total, 1) * 100
+
+    def _export_failed(self, error: Exception) -> None:
+        if isinstance(error, ExportCancelled):
+            self._finish_export("Export cancelled.", "red")
+        else:
+            self._finish_export(f"Export failed: {error}", "red")
+
+    def _finish_export(self, message: str, colour: str) -> None:
+        """
+        Hides the export progress widgets and reports the outcome.
+        """
+        self._export_running = False
+        self.progress_bar.grid_remove()
+        self.cancel_button.grid_remove()
+        self.status_label.config(text=message, fg=colour)
+
+    def cancel_export(self) -> None:
+        """
+        Asks the running export to stop after its current chunk.
+        """
+        self._export_cancel.set()
+
+    def import_from_csv(self) -> None:
+        """
+        Imports transactions from a CSV file chosen by the user, skipping duplicates.
+        The file is streamed in on the background worker, with progress shown as it goes.
+        """
+        file_path = filedialog.askopenfilename(
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            title="Import transactions from CSV"
+        )
+        if not file_path:
+            return
+
+        # Show the progress bar while the file is streamed in
+        self.progress_bar["value"] = 0
+        self.progress_bar.grid(row=12, column=1, sticky="ew", padx=4, pady=(5))
+        self.status_label.config(text="Importing...", fg="black")
+
+        from ..importer import import_csv
+
+        self.worker.submit(
+            "import",
+            lambda: import_csv(
+                file_path,
+                progress=lambda rows_read, fraction: self.worker.post(self._show_import_progress, rows_read, fraction),
+            ),
+            on_done=self._finish_import,
+            on_error=self._import_failed,
+        )
+
+    def _finish_import(self, result) -> None:
+        """
+        Reports the outcome of a finished import and refreshes the views.
+        """
+        self.progress_bar.grid_remove()
+
+        message = f"Imported {result.inserted} transactions."
+        if result.duplicates:
+            message += f" Skipped {result.duplicates} duplicates."
+        if result.rejected:
+            message += f" Rejected {len(result.rejected)} invalid rows."
+        self.status_label.config(text=message, fg="green" if not result.rejected else "red")
+
+        # Refresh the GUI with the new data
+        self.refresh_all()
+
+    def _import_failed(self, error: Exception) -> None:
+        self.progress_bar.grid_remove()
+        self.status_label.config(text=f"Import failed: {error}", fg="red")
+        
+        # Earlier chunks may already have been committed
+        self.refresh_all()
+
+    def _show_import_progress(self, rows_read: int, fraction: float) -> None:
+        """
+        Updates the import progress bar and status while a CSV import is running.
+        """
+        self.progress_bar["value"] = fraction * 100
+        self.status_label.config(text=f"Importing... {rows_read} rows read", fg="black")
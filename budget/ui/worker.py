@@ -0,0 +1,143 @@
+# --- Standard library ---
+import logging
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class BackgroundWorker:
+    """
+    Runs slow work (database reads, aggregation, forecasting, imports/exports) on a thread pool
+    and hands the results back to the Tk main thread, the only thread allowed to touch widgets.
+
+    Every job has a key. Submitting a new job for a key makes older jobs with that key stale:
+    their results are dropped instead of being applied, so a slow refresh can never overwrite
+    a newer one. Results are drained from a queue with root.after while jobs are running.
+
+    cancel(key) makes every job for a key stale, and also stops the latest one from starting
+    if it hasn't yet.
+    """
+    def __init__(self, root, max_workers: int = 3, poll_ms: int = 30, synchronous: bool = False) -> None:
+        self.root = root
+        self.poll_ms = poll_ms
+        self.synchronous = synchronous  # Run jobs inline (useful for scripts and tests)
+        self.on_busy_change: Optional[Callable[[bool], None]] = None
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="budget-worker")
+        self._results: queue.Queue[tuple[Callable[..., None], tuple[Any, ...]]] = queue.Queue()
+        self._tokens: dict[str, int] = {}
+        self._futures: dict[str, Future] = {}  # Latest job per key
+        self._pending = 0
+        self._polling = False
+
+    @property
+    def busy(self) -> bool:
+        return self._pending > 0
+
+    def submit(self, key: str, job: Callable[[], Any], on_done: Callable[[Any], None],
+               on_error: Optional[Callable[[Exception], None]] = None) -> None:
+        """
+        Runs job() in the background, then calls on_done(result) (or on_error(exception))
+        on the main thread, unless a newer job with the same key was submitted in the meantime.
+        """
+        token = self._tokens.get(key, 0) + 1
+        self._tokens[key] = token
+
+        if self.synchronous:
+            try:
+                result = job()
+            except Exception as error:
+                self._handle_error(error, on_error)
+                return
+            on_done(result)
+            return
+
+        self._set_pending(self._pending + 1)
+        future = self._futures[key] = self._executor.submit(job)
+        future.add_done_callback(
+            lambda done: self._results.put((self._finish, (key, token, done, on_done, on_error)))
+        )
+        self._ensure_polling()
+
+    def cancel(self, key: str) -> None:
+        """
+        Makes every job submitted for key stale, and cancels the latest one if it hasn't started yet
+        (a running job is left to finish; its result is dropped).
+        """
+        self._tokens[key] = self._tokens.get(key, 0) + 1
+        future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def post(self, callback: Callable[..., None], *args: Any) -> None:
+        """
+        Schedules callback(*args) on the main thread. Safe to call from a job (e.g. for progress updates).
+        """
+        if self.synchronous:
+            callback(*args)
+            return
+        self._results.put((callback, args))
+
+    def is_current(self, key: str, token: int) -> bool:
+        """
+        True if token belongs to the most recent job submitted for key.
+        """
+        return self._tokens.get(key) == token
+
+    def shutdown(self) -> None:
+        """
+        Stops accepting work and cancels anything that hasn't started yet.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- Main-thread side ---
+
+    def _finish(self, key: str, token: int, future: Future, on_done: Callable[[Any], None],
+                on_error: Optional[Callable[[Exception], None]]) -> None:
+        """
+        Applies one finished job's result, or drops it if it's stale.
+        """
+        self._set_pending(self._pending - 1)
+        if self._futures.get(key) is future:
+            del self._futures[key]
+        if future.cancelled() or not self.is_current(key, token):
+            return
+        error = future.exception()
+        if error is not None:
+            self._handle_error(error, on_error) # type: ignore[arg-type]
+            return
+        on_done(future.result())
+
+    def _handle_error(self, error: Exception, on_error: Optional[Callable[[Exception], None]]) -> None:
+        if on_error is not None:
+            on_error(error)
+        else:
+            logger.error("Background job failed", exc_info=error)
+
+    def _ensure_polling(self) -> None:
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self) -> None:
+        """
+        Drains the result queue on the main thread; keeps polling while jobs are outstanding.
+        """
+        while True:
+            try:
+                callback, args = self._results.get_nowait()
+            except queue.Empty:
+                break
+            callback(*args)
+
+        if self._pending > 0 or not self._results.empty():
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    def _set_pending(self, pending: int) -> None:
+        was_busy = self.busy
+        self._pending = pending
+        if self.busy != was_busy and self.on_busy_change is not None:
+            self.on_busy_change(self.busy)
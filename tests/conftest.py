@@ -3,6 +3,7 @@ import tkinter as tk
 from budget.ui.app import BudgetApp
 from budget import db
 
+
 @pytest.fixture
 def app(tmp_path, monkeypatch):
     """
@@ -23,6 +24,9 @@ def app(tmp_path, monkeypatch):
     yield app # Return the app to the test function
     
     root.destroy() #Close Tkinter window
+    app.worker.shutdown()
+    db.close_database()
+
 
 @pytest.fixture()
 def temp_db(tmp_path, monkeypatch):
@@ -36,4 +40,7 @@ def temp_db(tmp_path, monkeypatch):
     # Create schema
     db.initialise_database()
 
-    yield db
\ No newline at end of file
+    yield db
+
+    # Close the shared connections so the next test starts fresh
+    db.close_database()
\ No newline at end of file
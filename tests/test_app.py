@@ -1,5 +1,6 @@
 from unittest.mock import patch
 
+
 def test_submit_transaction_valid(app):
     """
     Submitting a valid transaction should call add_transaction
@@ -18,6 +19,7 @@ def test_submit_transaction_valid(app):
         # Check that add_transaction was called once with correct args
         mock_add_transaction.assert_called_once_with("2025-07-01", 20.50, "Food", "Groceries")
 
+
 def test_submit_transaction_invalid_amount(app):
     """
     If the amount field is invalid, add_transaction should NOT be called.
@@ -33,4 +35,39 @@ def test_submit_transaction_invalid_amount(app):
         app.submit_transaction()
 
     # Check that the add transaction was NOT called
-    mock_add_transaction.assert_not_called()
\ No newline at end of file
+    mock_add_transaction.assert_not_called()
+
+
+def test_submit_transaction_uses_import_rules(app):
+    """
+    The form should reject what an import would, e.g. an amount of 'nan'.
+    """
+    app.date_entry.set_date('01-07-2025')
+    app.amount_entry.insert(0, "nan")
+    app.category_var.set("Food")
+
+    with patch("budget.ui.transactions.add_transaction") as mock_add_transaction:
+        app.submit_transaction()
+
+    mock_add_transaction.assert_not_called()
+    assert app.status_label.cget("text") == "Amount must be a number."
+
+
+def test_rapid_actions_refresh_each_view_once(app):
+    """
+    Several data changes before Tk goes idle should cost a single refresh pass.
+    """
+    app.worker.synchronous = True  # Apply the refresh straight away
+    app.scheduler.flush()           # Drop the startup refresh
+    app.scheduler.reset_counters()
+
+    with patch.object(app.transaction_list, "show_fetched") as mock_show_rows:
+        app.delete_latest_transaction()
+        app.delete_latest_transaction()
+        app.select_forecast_model()
+        app.root.update_idletasks()  # Tk goes idle: the scheduler runs its pass
+
+    assert app.scheduler.requests == 3
+    assert app.scheduler.passes == 1
+    assert app.scheduler.refreshes == {"list": 1, "kpis": 1, "graph": 1, "insights": 1}
+    mock_show_rows.assert_called_once()
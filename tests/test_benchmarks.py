@@ -0,0 +1,33 @@
+import json
+
+from benchmarks import bench_ledger
+from benchmarks.synthetic import CATEGORIES, generate_transactions
+
+
+def test_synthetic_ledger_is_seeded_and_valid(temp_db):
+    first = generate_transactions(5000, seed=7)
+
+    assert first.equals(generate_transactions(5000, seed=7))
+    assert not first.equals(generate_transactions(5000, seed=8))
+    assert first["date"].is_monotonic_increasing
+    assert set(first["category"]) == set(CATEGORIES)
+    assert (first["category"] == "Food").sum() > (first["category"] == "Holidays").sum()
+
+    # Every generated row passes the app's own validation
+    assert temp_db.add_transactions(first).rejected == []
+
+
+def test_benchmark_writes_comparable_results(temp_db, tmp_path):
+    output = tmp_path / "results.json"
+
+    # The benchmark opens its own temporary database; temp_db restores the default afterwards
+    bench_ledger.main(["--rows", "2000", "--repeat", "1", "--output", str(output)])
+    report = json.loads(output.read_text())
+
+    assert report["environment"]["python"]
+    results = report["runs"][0]["results"]
+    for name in ("db.get_monthly_totals", "ledger.load_snapshot", "forecast.fit[trend]", "charts.bar",
+                 "refresh_cycle[add transaction]"):
+        assert results[name]["median_ms"] >= 0
+
+    assert {row[1] for row in bench_ledger.compare(report, report)} == set(results)
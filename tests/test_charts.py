@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from budget.ui.charts import CategoryBarChart, TrendChart, CategoryPieChart, has_values
+
+# Charts are created without a Tk master, so they render to a plain Agg canvas (no display needed)
+
+
+def test_bar_chart_updates_bars_in_place():
+    chart = CategoryBarChart()
+    chart.update(pd.Series({"Food": 10.0, "Transport": 20.0}))
+    bars = list(chart.bars)
+
+    with patch.object(chart.canvas, "draw_idle") as draw_idle:
+        chart.update(pd.Series({"Food": 15.0, "Transport": 5.0}))
+
+    # Same categories: the same bar artists are resized, not recreated
+    assert chart.bars == bars
+    assert [bar.get_width() for bar in chart.bars] == [15.0, 5.0]
+    assert chart.ax.get_xlim()[1] >= 15.0
+    draw_idle.assert_called_once()
+
+
+def test_bar_chart_recreates_bars_when_categories_change():
+    chart = CategoryBarChart()
+    chart.update(pd.Series({"Food": 10.0}))
+    chart.update(pd.Series({"Food": 10.0, "Holidays": 30.0}))
+
+    assert chart.categories == ["Food", "Holidays"]
+    assert len(chart.ax.patches) == 2  # Old bars were removed
+    assert [label.get_text() for label in chart.ax.get_yticklabels()] == ["Food", "Holidays"]
+
+
+def test_trend_chart_replaces_line_data():
+    chart = TrendChart()
+    line = chart.line
+    chart.update(pd.DataFrame({"month": ["2025-01", "2025-02"], "amount": [100.0, 200.0]}))
+    chart.update(pd.DataFrame({"month": ["2025-01", "2025-02", "2025-03"], "amount": [100.0, 200.0, 50.0]}))
+
+    assert chart.line is line
+    assert list(chart.line.get_ydata()) == [100.0, 200.0, 50.0]
+    assert [label.get_text() for label in chart.ax.get_xticklabels()] == ["2025-01", "2025-02", "2025-03"]
+    low, high = chart.ax.get_ylim()
+    assert low < 50.0 and high > 200.0
+
+
+def test_pie_chart_matches_a_fresh_pie():
+    chart = CategoryPieChart()
+    chart.update(pd.Series({"Food": 10.0, "Transport": 30.0}))
+    wedges = list(chart.wedges)
+    chart.update(pd.Series({"Food": 30.0, "Transport": 10.0}))
+
+    # Wedges were moved in place and match what Axes.pie draws for the new values
+    assert chart.wedges == wedges
+    fresh = CategoryPieChart()
+    fresh.update(pd.Series({"Food": 30.0, "Transport": 10.0}))
+    for moved, drawn in zip(chart.wedges, fresh.wedges):
+        assert moved.theta1 == pytest.approx(drawn.theta1)
+        assert moved.theta2 == pytest.approx(drawn.theta2)
+    for moved, drawn in zip(chart.labels + chart.autotexts, fresh.labels + fresh.autotexts):
+        assert moved.get_position() == pytest.approx(drawn.get_position())
+        assert moved.get_text() == drawn.get_text()
+
+
+def test_has_values():
+    assert has_values(pd.Series({"Food": 1.0}))
+    assert not has_values(pd.Series({"Food": 0.0}))
+    assert not has_values(pd.Series(dtype=float))
+    assert not has_values(None)
@@ -0,0 +1,113 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from budget.cli import main
+
+
+def _run(capsys, *argv):
+    """
+    Runs the CLI with --json and returns (exit status, parsed output).
+    """
+    status = main(["--json", *argv])
+    out = capsys.readouterr().out
+    return status, json.loads(out) if out else None
+
+
+def test_add_and_summary(temp_db, capsys):
+    status, added = _run(capsys, "add", "2025-07-01", "20.50", "Food", "Groceries")
+    assert status == 0
+    assert added["id"] == 1
+
+    _run(capsys, "add", "2025-08-03", "10", "Drinks")
+    _run(capsys, "add", "2025-08-04", "5", "Food")
+
+    status, summary = _run(capsys, "summary")
+    assert status == 0
+    assert summary["count"] == 3
+    assert summary["total"] == 35.5
+    assert summary["monthly_average"] == 17.75
+    assert summary["monthly"] == [{"month": "2025-07", "amount": 20.5}, {"month": "2025-08", "amount": 15.0}]
+    assert summary["top_categories"][0] == {"category": "Food", "amount": 25.5}
+
+    _, food = _run(capsys, "summary", "--category", "Food", "--from", "2025-08-01")
+    assert food["count"] == 1 and food["total"] == 5.0
+
+    _, large = _run(capsys, "summary", "--min", "10", "--max", "20.5")
+    assert large["count"] == 2 and large["total"] == 30.5
+
+
+def test_add_rejects_invalid_input(temp_db, capsys):
+    assert main(["add", "2025-07-01", "-3", "Food"]) == 1
+    assert "Amount must be a positive number." in capsys.readouterr().err
+    assert temp_db.count_transactions() == 0
+
+
+def test_forecast(temp_db, capsys):
+    for month, amount in enumerate([100, 200, 300], start=1):
+        temp_db.add_transaction(f"2025-0{month}-01", amount, "Food", "")
+        temp_db.add_transaction(f"2025-0{month}-02", 50, "Drinks", "")
+
+    status, result = _run(capsys, "forecast", "--by-category")
+    assert status == 0
+    assert result["months"] == 3
+    assert result["next_month"] == 450.0
+    assert result["categories"] == {"Drinks": 50.0, "Food": 400.0}
+
+    _, average = _run(capsys, "forecast", "--model", "average")
+    assert average["next_month"] == 250.0
+
+
+def test_import_and_export(temp_db, tmp_path, capsys):
+    source = tmp_path / "statement.csv"
+    source.write_text("Date,Paid out,Type,Memo\n01/07/2025,12.00,Food,Lunch\n02/07/2025,oops,Food,Bad\n")
+
+    status, result = _run(capsys, "import", str(source), "--map", "amount=Paid out")
+    assert status == 0
+    assert result["inserted"] == 1 and len(result["rejected"]) == 1
+
+    # Importing the same file again skips the duplicate
+    _, again = _run(capsys, "import", str(source), "--map", "amount=Paid out")
+    assert again["inserted"] == 0 and again["duplicates"] == 1
+
+    target = tmp_path / "out.csv"
+    status, exported = _run(capsys, "export", str(target))
+    assert status == 0 and exported["rows"] == 1
+    assert "2025-07-01" in target.read_text()
+
+
+def test_check_and_rebuild_summary(temp_db, capsys):
+    temp_db.add_transaction("2025-07-01", 10, "Food", "")
+    with temp_db._writer() as conn:
+        conn.execute("UPDATE monthly_category_totals SET amount = 99")
+
+    status, check = _run(capsys, "check-summary")
+    assert status == 1 and not check["ok"]
+
+    assert _run(capsys, "rebuild-summary")[0] == 0
+    assert _run(capsys, "check-summary") == (0, {"ok": True, "mismatches": []})
+
+
+def test_partition(temp_db, tmp_path, capsys):
+    temp_db.add_transaction("2024-07-01", 10, "Food", "")
+    temp_db.add_transaction("2025-07-01", 20, "Food", "")
+
+    assert _run(capsys, "partition")[1]["years"] == [2024, 2025]
+    assert _run(capsys, "summary")[1]["total"] == 30
+
+
+def test_cli_does_not_import_gui_or_pandas(tmp_path):
+    """
+    The summary command runs without loading Tkinter, Matplotlib or pandas.
+    """
+    code = (
+        "import sys\n"
+        "from budget.cli import main\n"
+        f"status = main(['--db', {str(tmp_path / 'cli.db')!r}, 'summary'])\n"
+        "loaded = [name for name in ('tkinter', 'matplotlib', 'pandas') if name in sys.modules]\n"
+        "print(status, loaded)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).resolve().parent.parent)
+    assert result.stdout.strip().splitlines()[-1] == "0 []"
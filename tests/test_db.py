@@ -1,11 +1,16 @@
-from budget import db
+import sqlite3
+import warnings
+import pytest
+import pandas as pd
+from budget import db, partitions
+
 
 def test_add_transaction(temp_db):
     """
     Adding a transaction should correctly save it to the database.
     """
     # Add a single transaction into the temporary test database
-    temp_db.add_transaction("2025-09-09", 10, "Food", "Lunch")
+    assert temp_db.add_transaction("2025-09-09", 10, "Food", "Lunch") == 1
     
     # Fetch all transactions back from the database
     result = temp_db.get_all_transactions()
@@ -20,6 +25,7 @@ def test_add_transaction(temp_db):
     assert result.iloc[0]["category"]  == "Food"
     assert result.iloc[0]["description"]  == "Lunch"
 
+
 def test_delete_latest_transaction(temp_db):
     """
     delete_latest_transaction should remove only the most recent row.
@@ -41,6 +47,7 @@ def test_delete_latest_transaction(temp_db):
     assert len(remaining) == 1 # Only 1 row left
     assert remaining.iloc[0]["id"] != latest_id # Ensure deleted row is gone
 
+
 def test_delete_latest_transaction_empty(temp_db):
     """
     Calling delete_latest_transaction on an empty database should return None.
@@ -48,6 +55,7 @@ def test_delete_latest_transaction_empty(temp_db):
     # Calling delete_latest_transaction on an empty DB should return None
     assert temp_db.delete_latest_transaction() is None
 
+
 def test_delete_all_transactions(temp_db):
     """
     delete_all_transactions should remove all rows from the database.
@@ -63,4 +71,525 @@ def test_delete_all_transactions(temp_db):
     result = temp_db.get_all_transactions()
     
     # Assert the database is now empty
-    assert result.empty
\ No newline at end of file
+    assert result.empty
+
+
+def test_connection_manager_reuses_tuned_connections(temp_db):
+    """
+    Reads should reuse one connection per thread, with the configured pragmas applied.
+    """
+    manager = temp_db.get_connection_manager()
+
+    # The same reader connection is handed out every time on this thread
+    with manager.reader() as first, manager.reader() as second:
+        assert first is second
+        assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert first.execute("PRAGMA synchronous").fetchone()[0] == 1 # NORMAL
+        assert first.execute("PRAGMA temp_store").fetchone()[0] == 2 # MEMORY
+
+    # Writes are visible to the reader straight away
+    temp_db.add_transaction("2025-09-09", 10, "Food", "Lunch")
+    assert temp_db.get_total_amount() == 10
+
+
+def test_open_database_in_memory(temp_db):
+    """
+    open_database(':memory:') should give a working, isolated database.
+    """
+    temp_db.open_database(":memory:")
+    temp_db.initialise_database()
+    temp_db.add_transaction("2025-09-09", 10, "Food", "Lunch")
+
+    assert len(temp_db.get_all_transactions()) == 1
+
+    # Closing drops the in-memory data; reopening starts empty
+    temp_db.close_database()
+    temp_db.initialise_database()
+    assert temp_db.get_all_transactions().empty
+
+
+def test_migrate_upgrades_existing_database(tmp_path, monkeypatch):
+    """
+    A pre-migration database should be upgraded in place without losing rows.
+    """
+    # Build a database the way the original initialise_database() did
+    old_db = tmp_path / "old_budget.db"
+    with sqlite3.connect(old_db) as conn:
+        conn.execute("CREATE TABLE transactions (id INTEGER PRIMARY KEY, date TEXT, amount REAL, category TEXT, description TEXT)")
+        conn.execute("INSERT INTO transactions (date, amount, category, description) VALUES ('2025-09-09', 10, 'Food', 'Lunch')")
+    conn.close()
+
+    monkeypatch.setattr(db, "DB_NAME", str(old_db))
+    try:
+        db.initialise_database()
+
+        # Schema is at the latest version and the indexes exist
+        assert db.get_schema_version() == len(db.MIGRATIONS)
+        with db.get_connection_manager().reader() as conn:
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_transactions_day_id", "idx_transactions_category_day", "idx_transactions_month_key"} <= indexes
+
+        # Existing data survived and migrating again is a no-op
+        assert len(db.get_all_transactions()) == 1
+        assert db.migrate() == len(db.MIGRATIONS)
+    finally:
+        db.close_database()
+
+
+def test_migrate_converts_text_dates_to_day_numbers(tmp_path, monkeypatch):
+    """
+    Version 5 rebuilds the table with integer days and a month key, reading ISO and day-first text dates.
+    """
+    old_db = tmp_path / "v4_budget.db"
+    monkeypatch.setattr(db, "DB_NAME", str(old_db))
+    monkeypatch.setattr(db, "MIGRATIONS", db.MIGRATIONS[:4])
+    db.initialise_database()
+    with db.get_connection_manager().writer() as conn:
+        conn.executemany("INSERT INTO transactions (date, amount, category, description) VALUES (?, ?, ?, ?)", [
+            ("2025-01-31", 10, "Food", "Lunch"),
+            ("01-02-2025", 20, "Food", "Dinner"),  # Day-first, as typed into older versions of the form
+            ("not a date", 5, "Other", "Mystery"),
+        ])
+    db.close_database()
+
+    monkeypatch.undo()
+    monkeypatch.setattr(db, "DB_NAME", str(old_db))
+    try:
+        assert db.migrate() == len(db.MIGRATIONS)
+        with db.get_connection_manager().reader() as conn:
+            rows = conn.execute("SELECT day, month_key, date FROM transactions ORDER BY id").fetchall()
+        assert rows == [(db.to_day("2025-01-31"), 2025 * 12 + 1, "2025-01-31"),
+                        (db.to_day("2025-02-01"), 2025 * 12 + 2, "2025-02-01"),
+                        (None, None, None)]
+
+        # Months are bucketed by key (the unreadable date under key 0, which is no month) and the summary agrees
+        assert db.get_monthly_totals().to_dict("list") == {"month": ["2025-01", "2025-02"], "amount": [10.0, 20.0]}
+        assert db.get_total_amount() == 35
+        assert db.check_summary() == []
+        assert db.get_total_amount(db.TransactionFilter(start_date="2025-02-01")) == 20
+    finally:
+        db.close_database()
+
+
+def test_date_helpers():
+    assert db.to_day("1970-01-02") == 1
+    assert db.from_day(db.to_day("2024-02-29")) == "2024-02-29"
+    assert db.to_month_key("2025-12-31") + 1 == db.to_month_key("2026-01")
+    assert db.month_label(db.to_month_key("2025-12")) == "2025-12"
+
+
+def test_add_transactions_bulk(temp_db):
+    """
+    add_transactions should insert valid rows in batches and report the rejected ones.
+    """
+    rows = [
+        ("2025-09-09", 10, "Food", "Lunch"),
+        ("2025-09-10", "abc", "Food", "Dinner"),  # Amount is not a number
+        ("2025-09-11", 5.5, "Drinks", "Coffee"),
+        ("2025-09-12", -1, "Food", "Refund"),     # Negative amount
+        ("2025-09-13", 7, "", "Snack"),           # Missing category
+        ("2025-09-14", 3, "Other", "123"),        # Numeric description
+        ("2025-09-15", 20, "Transport", "Train"),
+    ]
+
+    # A generator and a tiny batch size exercise the streaming path
+    result = temp_db.add_transactions((row for row in rows), batch_size=2)
+
+    assert result.inserted == 3
+    assert (result.first_id, result.last_id) == (1, 3)
+    assert result.rejected == [
+        (1, "Amount must be a number."),
+        (3, "Amount must be a positive number."),
+        (4, "All fields must be filled in."),
+        (5, "Description must not be a number."),
+    ]
+    assert temp_db.get_total_amount() == 35.5
+
+
+def test_validate_transaction_matches_bulk_rules():
+    """
+    validate_transaction should give the same reasons as the bulk validation, without pandas.
+    """
+    assert db.validate_transaction("2025-09-09", "10", "Food", "Lunch") is None
+    assert db.validate_transaction("2025-09-10", "abc", "Food", "Dinner") == "Amount must be a number."
+    assert db.validate_transaction("2025-09-12", -1, "Food", "Refund") == "Amount must be a positive number."
+    assert db.validate_transaction("2025-09-13", 7, "", "Snack") == "All fields must be filled in."
+    assert db.validate_transaction("2025-09-14", 3, "Other", "123") == "Description must not be a number."
+    assert db.validate_transaction("2025-02-30", 3, "Other") == "Date must be a valid date."
+
+
+def test_add_transactions_from_dataframe(temp_db):
+    """
+    A DataFrame should be accepted directly, with dates normalised to ISO format.
+    """
+    temp_db.add_transaction("2025-09-01", 1, "Food", "Existing")
+    df = pd.DataFrame({
+        "date": ["2025-9-2", pd.Timestamp("2025-09-03")],
+        "amount": [2, 3],
+        "category": ["Food", "Other"],
+        "description": ["Bread", None],
+    })
+
+    result = temp_db.add_transactions(df)
+
+    assert (result.inserted, result.first_id, result.last_id) == (2, 2, 3)
+    assert set(temp_db.get_all_transactions()["date"]) == {"2025-09-01", "2025-09-02", "2025-09-03"}
+
+
+def test_aggregate_queries(temp_db):
+    """
+    Monthly, category and top-N totals should be grouped in SQL, with optional date filters.
+    """
+    temp_db.add_transaction("2025-01-10", 100, "Food", "Groceries")
+    temp_db.add_transaction("2025-01-20", 30, "Drinks", "Bar")
+    temp_db.add_transaction("2025-02-15", 50, "Transport", "Train")
+    temp_db.add_transaction("2025-02-16", 10, "Food", "Lunch")
+
+    monthly = temp_db.get_monthly_totals()
+    assert monthly.to_dict("list") == {"month": ["2025-01", "2025-02"], "amount": [130, 60]}
+
+    categories = temp_db.get_category_totals()
+    assert categories.to_dict() == {"Drinks": 30, "Transport": 50, "Food": 110}
+
+    assert temp_db.get_top_categories(2) == [("Food", 110), ("Transport", 50)]
+
+    by_category = temp_db.get_monthly_category_totals()
+    assert list(by_category.itertuples(index=False, name=None)) == [
+        ("2025-01", "Drinks", 30), ("2025-01", "Food", 100), ("2025-02", "Food", 10), ("2025-02", "Transport", 50),
+    ]
+
+    february = temp_db.TransactionFilter(start_date="2025-02-01", end_date="2025-02-28")
+    assert temp_db.get_total_amount(february) == 60
+    assert temp_db.get_category_totals(february).to_dict() == {"Food": 10, "Transport": 50}
+
+
+def test_summary_table_tracks_writes(temp_db):
+    """
+    The trigger-maintained summary should match the transactions table after inserts,
+    updates and deletes, and the aggregate readers should use it.
+    """
+    temp_db.add_transaction("2025-01-10", 100, "Food", "Groceries")
+    temp_db.add_transactions([
+        ("2025-01-20", 30, "Drinks", "Bar"),
+        ("2025-02-15", 50, "Food", "Lunch"),
+    ])
+    temp_db.delete_latest_transaction()
+
+    with temp_db.get_connection_manager().writer() as conn:
+        conn.execute("UPDATE transactions SET category = 'Other', day = ? WHERE id = 2", (temp_db.to_day("2025-03-01"),))
+        summary = conn.execute("SELECT month_key, category, amount, count FROM monthly_category_totals ORDER BY month_key").fetchall()
+
+    assert summary == [(2025 * 12 + 1, "Food", 100, 1), (2025 * 12 + 3, "Other", 30, 1)]
+    assert temp_db.check_summary() == []
+    assert temp_db.get_total_amount() == 130
+
+    # Tampering is caught by the checker and fixed by a rebuild
+    with temp_db.get_connection_manager().writer() as conn:
+        conn.execute("UPDATE monthly_category_totals SET amount = 999 WHERE month_key = ?", (temp_db.to_month_key("2025-01"),))
+    assert temp_db.check_summary() == [("2025-01", "Food", 999, 100)]
+    temp_db.rebuild_summary()
+    assert temp_db.check_summary() == []
+
+    temp_db.delete_all_transactions()
+    assert temp_db.get_monthly_totals().empty
+
+
+def test_amount_filters(temp_db):
+    """
+    Amount bounds are inclusive and apply to every reader; the summary can't answer them, so the
+    aggregates read the transactions table.
+    """
+    temp_db.add_transactions([
+        ("2025-01-10", 5, "Food", "Coffee"),
+        ("2025-01-20", 50, "Food", "Groceries"),
+        ("2025-02-01", 500, "Holidays", "Flights"),
+    ])
+    window = temp_db.TransactionFilter(min_amount=50, max_amount=500)
+    food = temp_db.TransactionFilter(categories=("Food",), max_amount=50)
+
+    assert temp_db.count_transactions(window) == 2
+    assert temp_db.get_total_amount(window) == 550
+    assert temp_db.get_category_totals(food).to_dict() == {"Food": 55}
+    assert list(temp_db.get_all_transactions(window)["description"]) == ["Flights", "Groceries"]
+    assert [row[4] for row in temp_db.get_transactions_slice(0, 5, filters=window)] == ["Flights", "Groceries"]
+    assert [row[4] for row in temp_db.search_transactions("fl", filters=window)] == ["Flights"]
+
+
+def test_partial_month_filters_fall_back_to_transactions(temp_db):
+    """
+    Date ranges that split a month can't be answered by the summary, so the base table is used.
+    """
+    temp_db.add_transaction("2025-01-10", 100, "Food", "Groceries")
+    temp_db.add_transaction("2025-01-25", 30, "Food", "Lunch")
+
+    mid_month = temp_db.TransactionFilter(start_date="2025-01-15")
+    whole_month = temp_db.TransactionFilter(start_date="2025-01-01", end_date="2025-01-31")
+    assert temp_db.get_total_amount(mid_month) == 30
+    assert temp_db.get_total_amount(whole_month) == 130
+
+
+def test_get_transactions_slice(temp_db):
+    """
+    Slices should page through the ledger in the requested order.
+    """
+    temp_db.add_transactions([(f"2025-01-{day:02d}", day, "Food", "Lunch")
+                              for day in range(1, 11)])
+
+    newest = temp_db.get_transactions_slice(0, 3)
+    assert [row[1] for row in newest] == ["2025-01-10", "2025-01-09", "2025-01-08"]
+
+    page = temp_db.get_transactions_slice(3, 2, sort_by="amount", descending=False)
+    assert [row[2] for row in page] == [4, 5]
+
+
+def test_get_transactions_page_keyset(temp_db):
+    """
+    Keyset pages should walk the ledger forwards and backwards without gaps or repeats.
+    """
+    # Two rows per day so ties on date are exercised
+    temp_db.add_transactions([(f"2025-01-{day:02d}", day, "Food", "Lunch")
+                              for day in range(1, 6) for _ in range(2)])
+    everything = temp_db.get_transactions_slice(0, 100)
+
+    # Walk forwards three rows at a time
+    seen, after = [], None
+    while True:
+        page = temp_db.get_transactions_page(after=after, limit=3)
+        seen.extend(page.rows)
+        if not page.has_more:
+            break
+        after = page.last_key
+    assert seen == everything
+
+    # Step back from the last page
+    previous = temp_db.get_transactions_page(after=page.first_key, limit=3, direction="prev")
+    assert previous.rows == everything[-4:-1]
+
+    # Filters are applied alongside the seek
+    food_in_january_3rd = temp_db.TransactionFilter(start_date="2025-01-03", end_date="2025-01-03")
+    assert len(temp_db.get_transactions_page(limit=10, filters=food_in_january_3rd).rows) == 2
+
+
+def test_get_transactions_page_sorts_by_any_column(temp_db):
+    """
+    Keyset pages in every column order, either way round, should match the OFFSET slices, seek on the
+    column's index, and place missing values where the slices do.
+    """
+    temp_db.add_transactions([
+        ("2024-05-01", 30, "Food", "Lunch"),
+        ("2025-01-02", 5, "Drinks", "Coffee"),
+        ("2025-01-02", 30, "Food", "Dinner"),
+        ("2024-12-31", 12.5, "Transport", "Bus"),
+        ("2025-03-01", 5, "Food", "Lunch"),
+    ])
+    with temp_db.get_connection_manager().writer() as conn:
+        conn.execute("INSERT INTO transactions (day, amount, category, description) VALUES (NULL, NULL, NULL, NULL)")
+
+    def walk(sort_by, descending):
+        seen, after = [], None
+        while True:
+            page = temp_db.get_transactions_page(after=after, limit=2, sort_by=sort_by, descending=descending)
+            seen.extend(page.rows)
+            if not page.has_more:
+                return seen, page
+            after = page.last_key
+
+    def check():
+        for sort_by in temp_db.SORTABLE_COLUMNS:
+            for descending in (True, False):
+                everything = temp_db.get_transactions_slice(0, 100, sort_by, descending)
+                seen, last = walk(sort_by, descending)
+                assert seen == everything, (sort_by, descending)
+                previous = temp_db.get_transactions_page(after=last.first_key, limit=3, direction="prev",
+                                                         sort_by=sort_by, descending=descending)
+                assert previous.rows == everything[1:4], (sort_by, descending)
+
+    check()
+    with temp_db.get_connection_manager().reader() as conn:
+        plan = " ".join(str(row) for row in conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT id FROM transactions WHERE {temp_db.SORT_EXPRESSIONS['amount']} <= ? "
+            f"ORDER BY {temp_db.SORT_EXPRESSIONS['amount']} DESC, id", (10,)))
+    assert "idx_transactions_sort_amount_id" in plan
+
+    # Partitioned, non-date orders merge the partitions' pages
+    assert partitions.split_into_partitions() == [0, 2024, 2025]
+    check()
+
+
+def test_get_transactions_page_lists_undated_rows_last(temp_db):
+    """
+    Rows whose date couldn't be read (day NULL, from old databases) should be paged after the dated
+    rows, and their keys should work as anchors in both directions.
+    """
+    temp_db.add_transactions([
+        ("2025-01-01", 1, "Food", "Lunch"),
+        ("2025-01-02", 2, "Food", "Lunch"),
+    ])
+    with temp_db.get_connection_manager().writer() as conn:
+        conn.executemany("INSERT INTO transactions (day, amount, category, description) VALUES (NULL, ?, 'Other', 'Old')",
+                         [(5,), (6,), (7,)])
+    everything = temp_db.get_transactions_slice(0, 100)
+    assert [row[1] for row in everything] == ["2025-01-02", "2025-01-01", None, None, None]
+
+    def walk():
+        seen, after = [], None
+        while True:
+            page = temp_db.get_transactions_page(after=after, limit=2)
+            seen.extend(page.rows)
+            if not page.has_more:
+                return seen, page.last_key
+            after = page.last_key
+
+    assert walk() == (everything, (None, everything[-1][0]))
+
+    # Back from an undated row, across the boundary to the dated rows
+    previous = temp_db.get_transactions_page(after=(None, everything[3][0]), limit=2, direction="prev")
+    assert previous.rows == everything[1:3]
+
+    # Partitioned, the undated rows have their own file (year 0), read after the oldest year
+    assert partitions.split_into_partitions() == [0, 2025]
+    assert walk() == (everything, (None, everything[-1][0]))
+
+    # Undated rows count towards totals and categories but not towards any month
+    assert list(temp_db.get_monthly_totals()["month"]) == ["2025-01"]
+    assert [month for month, _, _ in temp_db.get_monthly_category_amounts()] == ["2025-01"]
+    assert temp_db.get_total_amount() == 21
+    # Whether the summary answers a date range or the rows do, undated rows are outside it
+    assert temp_db.get_total_amount(temp_db.TransactionFilter(end_date="2025-01-31")) == 3
+    assert temp_db.get_total_amount(temp_db.TransactionFilter(end_date="2025-01-30")) == 3
+
+    # The seek uses the index on the sort expression
+    with temp_db.get_connection_manager().reader() as conn:
+        plan = " ".join(str(row) for row in conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT id FROM transactions WHERE {temp_db.SORT_DAY_SQL} <= ? "
+            f"ORDER BY {temp_db.SORT_DAY_SQL} DESC, id", (0,)))
+    assert "idx_transactions_sort_day_id" in plan
+
+
+def test_delete_and_update_transactions(temp_db):
+    """
+    Batch edits by ids or filter return how many rows changed and keep hashes, summary and search in step.
+    """
+    temp_db.add_transactions([
+        ("2025-01-10", 5, "Food", "Coffee"),
+        ("2025-01-20", 50, "Food", "Groceries"),
+        ("2025-02-01", 500, "Holidays", "Flights"),
+        ("2025-02-03", 8, "Food", "Coffee"),
+    ])
+
+    assert temp_db.update_transactions([1, 4], category="Drinks", amount="4.5") == 2
+    assert temp_db.update_transactions(temp_db.TransactionFilter(min_amount=100), date="2025-03-01") == 1
+    assert temp_db.get_category_totals().to_dict() == {"Drinks": 9, "Food": 50, "Holidays": 500}
+    assert [row[1] for row in temp_db.search_transactions("fli")] == ["2025-03-01"]
+    assert temp_db.check_summary() == []
+
+    # The hash follows the new values, so re-importing the edited row is a duplicate
+    result = temp_db.add_transactions([("2025-01-10", 4.5, "Drinks", "Coffee")],
+                                      skip_duplicates=True)
+    assert result.inserted == 0
+
+    with pytest.raises(ValueError):
+        temp_db.update_transactions([1], amount=-1)
+    with pytest.raises(ValueError):
+        temp_db.update_transactions([1], content_hash="x")
+
+    assert temp_db.delete_transactions(temp_db.TransactionFilter(categories=("Drinks",))) == 2
+    assert temp_db.delete_transactions([2, 99]) == 1
+    assert temp_db.delete_transactions([]) == 0
+    assert [row[0] for row in temp_db.get_transactions_slice(0, 10)] == [3]
+    assert temp_db.check_summary() == []
+
+
+def test_search_transactions(temp_db):
+    """
+    Search matches word prefixes in descriptions and categories, ranks description matches first
+    (then newest first), and the index follows inserts, updates and deletes.
+    """
+    temp_db.add_transactions([
+        ("2025-01-10", 20, "Food", "Tesco groceries"),
+        ("2025-01-12", 5, "Food", "Café Nero"),
+        ("2025-02-01", 40, "Transport", "Tesla supercharger"),
+        ("2025-02-03", 8, "Tesco", "Fuel"),
+    ])
+
+    assert [row[4] for row in temp_db.search_transactions("tes")] == ["Tesla supercharger", "Tesco groceries", "Fuel"]
+    assert [row[4] for row in temp_db.search_transactions("tesco gro")] == ["Tesco groceries"]
+    assert [row[4] for row in temp_db.search_transactions("cafe")] == ["Café Nero"]
+    assert temp_db.search_transactions("tes", limit=1)[0][1:] == ("2025-02-01", 40, "Transport", "Tesla supercharger")
+    assert temp_db.search_transactions("  ") == []
+    assert temp_db.search_transactions('"nero OR') == []  # Operators and quotes are taken literally
+
+    with temp_db.get_connection_manager().writer() as conn:
+        conn.execute("UPDATE transactions SET description = 'Sainsbury''s' WHERE id = 1")
+    temp_db.delete_latest_transaction()
+    assert [row[0] for row in temp_db.search_transactions("tes")] == [3]
+    assert [row[0] for row in temp_db.search_transactions("sains")] == [1]
+
+
+def test_split_into_year_partitions(temp_db, tmp_path):
+    """
+    Splitting moves each year into its own file. Readers fan out to the partitions (only those
+    overlapping the filter) with the same results, and new rows are routed by year with unique ids.
+    """
+    temp_db.add_transactions([
+        ("2023-12-31", 10, "Food", "Dinner"),
+        ("2024-01-01", 20, "Drinks", "Party"),
+        ("2024-06-15", 30, "Food", "Lunch"),
+        ("2025-02-01", 40, "Other", "Gift"),
+    ])
+    partial = temp_db.TransactionFilter(start_date="2024-01-01", end_date="2024-06-20")
+
+    def read():
+        return (temp_db.get_transactions_slice(1, 10), temp_db.get_transactions_slice(1, 2, sort_by="amount"),
+                temp_db.get_monthly_category_amounts(), temp_db.get_top_categories(2),
+                temp_db.get_total_amount(partial), temp_db.count_transactions(partial),
+                temp_db.get_transactions_page(("2024-06-15", 3), limit=2).rows, temp_db.search_transactions("party lu"),
+                temp_db.search_transactions("food"))
+
+    before = read()
+    assert partitions.split_into_partitions() == [2023, 2024, 2025]
+    assert sorted(path.name for path in tmp_path.glob("*.db")) == [
+        "test_budget-2023.db", "test_budget-2024.db", "test_budget-2025.db", "test_budget.db"]
+    with temp_db.get_connection_manager().reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM main.transactions").fetchone()[0] == 0
+
+    temp_db.get_total_amount(partial)
+    with temp_db.get_connection_manager().reader() as conn:
+        assert [row[1] for row in conn.execute("PRAGMA database_list")] == ["main", "y2024"]
+    assert read() == before
+
+    assert temp_db.add_transaction("2026-01-05", 5, "Food", "Coffee") == 5
+    assert (tmp_path / "test_budget-2026.db").exists()
+    assert temp_db.get_transactions_slice(0, 1)[0][0] == 5
+    assert temp_db.delete_latest_transaction() == 5
+    assert temp_db.check_summary() == []
+    assert read() == before
+
+    # The emptied 2026 partition isn't concatenated (pandas warns about empty frames)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        assert list(temp_db.get_all_transactions()["id"]) == [4, 3, 2, 1]
+
+    # Changing the year moves rows to that year's partition
+    assert temp_db.update_transactions([1, 3], date="2024-03-01") == 2
+    assert [row[0] for row in temp_db.get_transactions_slice(0, 10, filters=partial)] == [1, 3, 2]
+    assert temp_db.delete_transactions(temp_db.TransactionFilter(start_date="2024-03-01", end_date="2024-03-01")) == 2
+    assert temp_db.check_summary() == []
+
+    with pytest.raises(ValueError):
+        partitions.split_into_partitions()
+
+
+def test_consistent_read_over_more_partitions_than_can_be_attached(temp_db):
+    """
+    With more year partitions than fit attached at once, a read inside consistent_read() should
+    swap partitions (restarting its read transaction) rather than fail.
+    """
+    years = range(2000, 2000 + partitions.MAX_ATTACHED_PARTITIONS + 2)
+    temp_db.add_transactions([(f"{year}-03-15", 10, "Food", "Lunch") for year in years])
+    before = temp_db.get_transactions_slice(0, 100)
+
+    assert partitions.split_into_partitions() == list(years)
+    with temp_db.consistent_read():
+        assert temp_db.get_transactions_slice(0, 100) == before
+        assert temp_db.count_transactions(temp_db.TransactionFilter(start_date="2000-03-10")) == len(years)
@@ -0,0 +1,72 @@
+import csv
+import gzip
+import threading
+
+import pytest
+
+from budget.exporter import export_transactions, ExportCancelled
+
+
+def _add_rows(temp_db):
+    temp_db.add_transaction("2025-07-01", 10, "Food", "Lunch")
+    temp_db.add_transaction("2025-08-01", 20, "Drinks", "Bar")
+    temp_db.add_transaction("2025-09-01", 30, "Food", "Dinner")
+
+
+def test_export_csv_with_filters(temp_db, tmp_path):
+    """
+    Filters should be applied in SQL and rows streamed to the CSV newest first.
+    """
+    _add_rows(temp_db)
+    path = tmp_path / "food.csv"
+
+    filters = temp_db.TransactionFilter(start_date="2025-07-15", categories=("Food",))
+    written = export_transactions(str(path), filters=filters, chunk_size=1)
+
+    assert written == 1
+    with open(path, newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows == [["id", "date", "amount", "category", "description"], ["3", "2025-09-01", "30.0", "Food", "Dinner"]]
+
+
+def test_export_gzip_csv(temp_db, tmp_path):
+    """
+    A .csv.gz path should produce a gzip-compressed CSV.
+    """
+    _add_rows(temp_db)
+    path = tmp_path / "all.csv.gz"
+
+    progress = []
+    assert export_transactions(str(path), chunk_size=2, progress=lambda done, total: progress.append((done, total))) == 3
+    assert progress == [(2, 3), (3, 3)]
+
+    with gzip.open(path, "rt", newline="") as file:
+        assert len(list(csv.reader(file))) == 4 # Header + 3 rows
+
+
+def test_export_parquet(temp_db, tmp_path):
+    """
+    A .parquet path should produce a columnar file (when pyarrow is installed).
+    """
+    pq = pytest.importorskip("pyarrow.parquet")
+    _add_rows(temp_db)
+    path = tmp_path / "all.parquet"
+
+    assert export_transactions(str(path), chunk_size=2) == 3
+    table = pq.read_table(path)
+    assert table.column("amount").to_pylist() == [30.0, 20.0, 10.0]
+
+
+def test_export_cancelled_removes_partial_file(temp_db, tmp_path):
+    """
+    Cancelling an export should raise ExportCancelled and leave no file behind.
+    """
+    _add_rows(temp_db)
+    path = tmp_path / "cancelled.csv"
+    cancel = threading.Event()
+    cancel.set()
+
+    with pytest.raises(ExportCancelled):
+        export_transactions(str(path), chunk_size=1, cancel_event=cancel)
+    assert not path.exists()
+    assert not (tmp_path / "cancelled.csv.part").exists()
@@ -0,0 +1,18 @@
+import pytest
+
+from budget.ui.filter_bar import parse_amount, parse_date
+
+
+def test_parse_date_accepts_form_and_iso_formats():
+    assert parse_date("05-03-2025") == "2025-03-05"
+    assert parse_date(" 2025-03-05 ") == "2025-03-05"
+    assert parse_date("") is None
+    with pytest.raises(ValueError):
+        parse_date("31-02-2025")
+
+
+def test_parse_amount():
+    assert parse_amount("£12.50") == 12.5
+    assert parse_amount("  ") is None
+    with pytest.raises(ValueError):
+        parse_amount("ten")
@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+from budget import forecast
+from budget.forecast import Forecaster
+
+
+def test_linear_trend_matches_least_squares_fit():
+    rng = np.random.default_rng(1)
+    history = rng.uniform(50, 500, size=(20, 9))
+
+    result = forecast.linear_trend(history)
+
+    # Same as fitting each row separately and evaluating the line at the next month
+    for row, predicted in zip(history, result):
+        slope, intercept = np.polyfit(np.arange(9), row, 1)
+        assert predicted == pytest.approx(intercept + slope * 9)
+
+
+def test_exponential_smoothing_matches_recursion():
+    history = np.array([[100.0, 120.0, 90.0, 150.0], [10.0, 10.0, 40.0, 0.0]])
+
+    for row, predicted in zip(history, forecast.exponential_smoothing(history, alpha=0.3)):
+        level = row[0]
+        for value in row[1:]:
+            level = 0.3 * value + 0.7 * level
+        assert predicted == pytest.approx(level)
+
+
+def test_seasonal_naive_and_moving_average():
+    year = np.arange(1, 13, dtype=float) * 10
+    history = np.concatenate([year, [11.0, 22.0]])  # 14 months
+
+    assert forecast.seasonal_naive(history)[0] == 30.0  # Same month last year
+    assert forecast.seasonal_naive(history[:5])[0] == 50.0  # Less than a year: repeat the latest month
+    assert forecast.moving_average(history)[0] == pytest.approx((120 + 11 + 22) / 3)
+
+
+def test_fill_months_spaces_columns_by_calendar_month():
+    # Spending in Jan and Mar 2024 and Jan 2025, nothing in between
+    history = np.array([[10.0, 30.0, 40.0], [1.0, 3.0, 4.0]])
+    filled = forecast.fill_months(history, ["2024-01", "2024-03", "2025-01"])
+
+    assert filled.shape == (2, 13)
+    assert list(filled[0, :3]) == [10.0, 0.0, 30.0]
+    assert filled[0].sum() == 80.0
+    # Next month is Feb 2025, so the seasonal model repeats Feb 2024 (nothing) rather than a later month
+    assert forecast.seasonal_naive(filled)[0] == 0.0
+
+    with pytest.raises(ValueError):
+        forecast.fill_months(history, ["2024-01"])
+
+
+def test_forecast_is_batched_and_sums_to_the_total():
+    rng = np.random.default_rng(2)
+    history = rng.uniform(0, 300, size=(6, 14))
+
+    for model in forecast.MODELS:
+        per_series = forecast.forecast(history, model)
+        one_by_one = [forecast.forecast(row, model)[0] for row in history]
+        assert per_series == pytest.approx(one_by_one)
+
+        # Every model is linear, so the category forecasts add up to the forecast of the total
+        assert per_series.sum() == pytest.approx(forecast.forecast_total(history.sum(axis=0), model))
+
+
+def test_forecast_needs_enough_history():
+    assert forecast.forecast([100.0], "trend") is None
+    assert forecast.forecast_total([100.0], "average") == 100.0
+    with pytest.raises(ValueError):
+        forecast.forecast([1.0, 2.0], "unknown")
+
+
+def test_backtest_picks_out_the_right_model():
+    months = np.arange(36, dtype=float)
+    trend = 100 + 5 * months
+    seasonal = 200 + 80 * np.sin(2 * np.pi * months / 12)
+
+    # A straight line is forecast exactly by the trend model
+    assert forecast.backtest(trend, "trend")[0] == pytest.approx(0.0)
+    assert forecast.backtest(trend, "average")[0] > 5
+
+    # A repeating yearly pattern is forecast exactly by the seasonal model once a year of history exists
+    assert forecast.backtest(seasonal, "seasonal", min_train=12)[0] == pytest.approx(0.0)
+    assert forecast.backtest(seasonal, "trend", min_train=12)[0] > 10
+
+    # Nothing to test against
+    assert np.isnan(forecast.backtest([1.0, 2.0], "trend")[0])
+
+
+@pytest.mark.parametrize("model", list(forecast.MODELS))
+def test_forecaster_updates_incrementally(model):
+    rng = np.random.default_rng(3)
+    history = rng.uniform(0, 200, size=(5, 13))
+    forecaster = Forecaster(history, model, labels=list("abcde"))
+
+    # Change one month, as adding a transaction would
+    changed = history.copy()
+    changed[2, 7] += 55.0
+    assert forecaster.update(changed, labels=list("abcde")) == 1
+    assert forecaster.forecasts() == pytest.approx(forecast.forecast(changed, model))
+
+    # A new month is a different shape, so everything is refitted
+    extended = np.hstack([changed, rng.uniform(0, 200, size=(5, 1))])
+    assert forecaster.update(extended, labels=list("abcde")) == -1
+    assert forecaster.forecasts() == pytest.approx(forecast.forecast(extended, model))
+
+
+def test_forecaster_waits_for_enough_history():
+    forecaster = Forecaster([[10.0], [20.0]], "trend")
+    assert forecaster.forecasts() is None
+
+    forecaster.set_total(0, 0, 15.0)
+    assert forecaster.forecasts() is None
+    assert forecaster.update([[15.0, 25.0], [20.0, 20.0]]) == -1
+    assert forecaster.forecasts() == pytest.approx([35.0, 20.0])
+
+
+def test_forecasts_are_batched_and_updates_incremental(monkeypatch):
+    """
+    Work guard: a forecast is one vectorised model call over every series, and changing one month
+    recomputes only that series (the trend model adjusts its running sums without refitting).
+    """
+    history = np.random.default_rng(4).uniform(0, 500, size=(1_000, 24))
+    calls = []
+
+    def counted(function):
+        def wrapper(y, *args):
+            calls.append(np.shape(y))
+            return function(y, *args)
+        return wrapper
+
+    for name, model in list(forecast.MODELS.items()):
+        monkeypatch.setitem(forecast.MODELS, name, model._replace(function=counted(model.function)))
+
+    for model in forecast.MODELS:
+        forecast.forecast(history, model)
+    assert calls == [(1_000, 24)] * len(forecast.MODELS)
+
+    trend, smoothing = Forecaster(history, "trend"), Forecaster(history, "smoothing")
+    calls.clear()
+    for month in range(10):
+        trend.set_total(month, month, 1.0)
+        smoothing.set_total(month, month, 1.0)
+    assert calls == [(24,)] * 10
@@ -0,0 +1,58 @@
+from budget.importer import import_csv
+
+
+def test_import_csv_maps_columns_and_skips_duplicates(temp_db, tmp_path):
+    """
+    import_csv should map bank-style headers, normalise dates and skip rows already imported.
+    """
+    csv_path = tmp_path / "statement.csv"
+    csv_path.write_text(
+        "Transaction Date,Amount,Category,Memo\n"
+        "01/07/2025,\"£1,020.50\",Holidays,Flights\n"
+        "2025-07-02,4.20,Drinks,Coffee\n"
+        "not a date,3,Food,Snack\n"
+    )
+
+    # Small chunks so the file is streamed over several batches
+    progress = []
+    result = import_csv(str(csv_path), chunk_size=2, progress=lambda rows, fraction: progress.append(rows))
+
+    assert (result.rows_read, result.inserted, result.duplicates) == (3, 2, 0)
+    assert result.rejected == [(4, "Date must be a valid date.")]
+    assert progress == [2, 3]
+
+    df = temp_db.get_all_transactions()
+    assert list(df["date"]) == ["2025-07-02", "2025-07-01"]
+    assert list(df["amount"]) == [4.20, 1020.50]
+
+    # Importing the same file again (or a manually added match) inserts nothing new
+    again = import_csv(str(csv_path))
+    assert (again.inserted, again.duplicates) == (0, 2)
+    assert len(temp_db.get_all_transactions()) == 2
+
+
+def test_import_csv_keeps_repeated_identical_rows(temp_db, tmp_path):
+    """
+    Identical rows in one file are separate purchases; only copies already in the database are skipped.
+    """
+    csv_path = tmp_path / "statement.csv"
+    csv_path.write_text(
+        "Date,Amount,Category,Description\n"
+        "2025-07-02,4.20,Drinks,Coffee\n"
+        "2025-07-02,4.20,Drinks,Coffee\n"
+        "2025-07-02,4.20,Drinks,Coffee\n"
+    )
+
+    # The third copy arrives in a second chunk
+    result = import_csv(str(csv_path), chunk_size=2)
+    assert (result.inserted, result.duplicates) == (3, 0)
+
+    again = import_csv(str(csv_path), chunk_size=2)
+    assert (again.inserted, again.duplicates) == (0, 3)
+
+    # A longer statement with a fourth copy only adds the new one
+    with open(csv_path, "a") as file:
+        file.write("2025-07-02,4.20,Drinks,Coffee\n")
+    more = import_csv(str(csv_path))
+    assert (more.inserted, more.duplicates) == (1, 3)
+    assert len(temp_db.get_all_transactions()) == 4
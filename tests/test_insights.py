@@ -1,9 +1,11 @@
 import pandas as pd
 from unittest.mock import patch, MagicMock
+from budget.ledger import LedgerSnapshot
+
 
 def test_show_monthly_trend_with_data(app, monkeypatch):
     """
-    When valid data exists, show_monthly_trend should create and draw a chart
+    When valid data exists, show_monthly_trend should update and redraw the chart
     and pack the widget into the UI.
     """
     # Fake dataframe with 2 months of spending
@@ -13,28 +15,72 @@ def test_show_monthly_trend_with_data(app, monkeypatch):
         "category": ["Food", "Transport"]
     })
 
-    # Make get_all_transactions return this fake data
-    monkeypatch.setattr("budget.ui.insights.get_all_transactions", lambda: fake_df)
-
-    # Mock _get_monthly_totals to avoid relying on date parsing logic
+    # Pre-computed monthly totals, so the test doesn't rely on date parsing logic
     fake_monthly = pd.DataFrame({
         "month": ["2025-01", "2025-02"],
         "amount": [100, 200]
     })
-    monkeypatch.setattr(app, "_get_monthly_totals", lambda df: fake_monthly)
+    snapshot = LedgerSnapshot(
+        generation=0,
+        row_count=len(fake_df),
+        total=300.0,
+        monthly=fake_monthly,
+        category_totals=fake_df.groupby("category")["amount"].sum(),
+    )
 
-    # Mock the chart canvas so no real Matplotlib figure is created
-    with patch("budget.ui.insights.FigureCanvasTkAgg") as mock_canvas_class:
-        mock_canvas = MagicMock()
-        mock_canvas_class.return_value = mock_canvas
+    canvas = app.trend_chart.canvas
 
+    # Mock the canvas' redraw and tk widget so nothing is rendered
+    with patch.object(canvas, "draw_idle") as mock_draw_idle, \
+         patch.object(canvas, "get_tk_widget") as mock_get_widget:
         fake_widget = MagicMock()
-        mock_canvas.get_tk_widget.return_value = fake_widget
+        fake_widget.winfo_manager.return_value = ""  # Not packed yet
+        mock_get_widget.return_value = fake_widget
 
         # Call the function under test
-        app.show_monthly_trend(fake_df)
+        app.show_monthly_trend(snapshot)
 
         # Asserts
-        mock_canvas_class.assert_called_once()  # A chart must be created
-        mock_canvas.draw.assert_called_once()   # Chart must be drawn
-        fake_widget.pack.assert_called_once()   # Widget must be added to UI
\ No newline at end of file
+        assert app.trend_chart.canvas is canvas  # The existing chart is reused
+        mock_draw_idle.assert_called_once()      # Chart must be redrawn
+        fake_widget.pack.assert_called_once()    # Widget must be added to UI
+        assert list(app.trend_chart.line.get_ydata()) == [100, 200]
+
+
+def test_insights_render_only_when_visible(app):
+    """
+    Refreshing while the Transactions tab is selected should only mark Insights dirty;
+    it's rendered once the user switches to the tab. The hidden bar chart waits the same way.
+    """
+    snapshot = LedgerSnapshot(
+        generation=0,
+        row_count=1,
+        total=10.0,
+        monthly=pd.DataFrame({"month": ["2025-01"], "amount": [10.0]}),
+        category_totals=pd.Series({"Food": 10.0}),
+    )
+
+    with patch.object(app, "render_insights") as mock_render:
+        # Transactions tab is selected at startup
+        app.refresh_insights(snapshot)
+        mock_render.assert_not_called()
+        assert app.insights_dirty
+
+        # Switching tabs renders the pending data once
+        app.notebook.select(app.insights_tab)
+        app._on_tab_changed()
+        mock_render.assert_called_once_with(snapshot)
+        assert not app.insights_dirty
+
+        # Refreshing while visible renders straight away
+        app.refresh_insights(snapshot)
+        assert mock_render.call_count == 2
+
+    # Now the Transactions tab is hidden, so its chart isn't drawn until it's selected again
+    with patch.object(app, "show_transaction_graph") as mock_graph:
+        app.refresh_graph(snapshot)
+        mock_graph.assert_not_called()
+
+        app.notebook.select(app.transactions_tab)
+        app._on_tab_changed()
+        mock_graph.assert_called_once_with(snapshot)
@@ -0,0 +1,91 @@
+import logging
+
+import pytest
+
+from budget import db, instrumentation
+from budget.ui import transactions
+
+
+@pytest.fixture
+def instrumented(temp_db):
+    instrumentation.install()
+    instrumentation.reset()
+    yield temp_db
+    instrumentation.uninstall()
+    instrumentation.reset()
+
+
+def test_nothing_is_wrapped_until_installed(temp_db):
+    original = db.add_transaction
+    instrumentation.install()
+    try:
+        assert db.add_transaction is not original
+        # Modules that imported the function by name see the wrapper too
+        assert transactions.add_transaction is db.add_transaction
+    finally:
+        instrumentation.uninstall()
+    assert db.add_transaction is original and transactions.add_transaction is original
+
+
+def test_db_calls_record_time_calls_and_rows(instrumented):
+    instrumented.add_transactions([
+        ("2025-07-01", 10, "Food", "a"),
+        ("2025-07-02", 20, "Drinks", "b"),
+    ])
+    instrumented.get_transactions_slice(0, 50)
+    instrumented.get_transactions_slice(0, 1)
+    assert sum(len(chunk) for chunk in instrumented.iter_transactions(chunk_size=1)) == 2
+
+    stats = instrumentation.function_stats()
+    assert stats["db.add_transactions"].rows == 2
+    assert stats["db.get_transactions_slice"].calls == 2
+    assert stats["db.get_transactions_slice"].rows == 3
+    assert stats["db.iter_transactions"].rows == 2
+    assert stats["db.get_transactions_slice"].seconds > 0
+    assert "db.get_transactions_slice" in instrumentation.report()
+
+
+def test_actions_count_outermost_calls_only(instrumented, caplog):
+    instrumented.add_transaction("2025-07-01", 10, "Food", "a")
+
+    instrumentation.begin_action("load")
+    with caplog.at_level(logging.INFO, logger=instrumentation.__name__):
+        instrumented.get_monthly_category_totals()  # Calls get_monthly_category_amounts internally
+        action = instrumentation.end_action()
+
+    assert action is not None and action.name == "load"
+    assert action.layers[instrumentation.DB].calls == 1
+    assert action.layers[instrumentation.DB].rows == 1
+    assert instrumentation.function_stats()["db.get_monthly_category_amounts"].calls == 1
+    assert caplog.messages == [action.summary()]
+    assert action.summary().startswith("load: ")
+    assert "db 1 call, 1 rows" in action.summary()
+
+    # Nothing is attributed once the action has ended
+    assert instrumentation.end_action() is None
+    assert instrumentation.recent_actions() == [action]
+
+
+def test_requested_reads_the_environment(monkeypatch):
+    monkeypatch.setenv(instrumentation.ENV_VAR, "1")
+    assert instrumentation.requested()
+    monkeypatch.setenv(instrumentation.ENV_VAR, "0")
+    assert not instrumentation.requested()
+
+
+def test_refresh_methods_and_charts_are_timed(instrumented):
+    import pandas as pd
+    from budget.ui.charts import CategoryBarChart
+
+    assert hasattr(transactions.TransactionTabMixin.refresh_graph, "__wrapped__")
+    assert not hasattr(transactions.TransactionTabMixin.setup_transactions_tab, "__wrapped__")
+
+    instrumentation.begin_action("chart")
+    CategoryBarChart().update(pd.Series({"Food": 10.0, "Drinks": 5.0}))
+    action = instrumentation.end_action()
+
+    stats = instrumentation.function_stats()
+    assert stats["CategoryBarChart.update"].calls == 1
+    assert stats["FigureCanvasAgg.draw"].calls >= 1
+    # The render happens inside the update, so the charts layer counts the update only
+    assert action.layers[instrumentation.CHARTS].calls == 1
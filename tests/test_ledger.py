@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+from budget import ledger, partitions
+
+
+def test_snapshot_loaded_once_per_generation(temp_db):
+    """
+    Repeated get_snapshot() calls should share one database read until the next write.
+    """
+    temp_db.add_transaction("2025-01-10", 100, "Food", "Groceries")
+    temp_db.add_transaction("2025-02-15", 50, "Transport", "Train")
+
+    with patch("budget.ledger.db.get_monthly_totals", wraps=temp_db.get_monthly_totals) as mock_read:
+        first = ledger.get_snapshot()
+        second = ledger.get_snapshot()
+        assert first is second
+        assert mock_read.call_count == 1
+
+        # A write bumps the generation, so the next snapshot reloads
+        temp_db.add_transaction("2025-02-20", 25, "Food", "Lunch")
+        third = ledger.get_snapshot()
+        assert mock_read.call_count == 2
+
+    assert third.total == 175
+    assert list(third.monthly["amount"]) == [100, 75]
+    assert list(third.monthly["month"]) == ["2025-01", "2025-02"]
+    assert third.category_totals.to_dict() == {"Transport": 50, "Food": 125}
+    assert third.category_monthly.loc["Food"].tolist() == [100, 25]
+    assert third.category_monthly.loc["Transport"].tolist() == [0, 50]  # Months without spending are 0
+
+
+def test_filtered_snapshot(temp_db):
+    """
+    A snapshot for a filter only aggregates the matching transactions, and changing the filter reloads it.
+    """
+    temp_db.add_transactions([
+        ("2025-01-10", 100, "Food", "Groceries"),
+        ("2025-02-15", 50, "Transport", "Train"),
+        ("2025-02-20", 25, "Food", "Lunch"),
+    ])
+    february = temp_db.TransactionFilter(start_date="2025-02-01", end_date="2025-02-28", max_amount=40)
+
+    snapshot = ledger.get_snapshot(february)
+    assert snapshot.filters == february
+    assert (snapshot.row_count, snapshot.total) == (1, 25)
+    assert list(snapshot.monthly["month"]) == ["2025-02"]
+    assert snapshot.category_totals.to_dict() == {"Food": 25}
+    assert ledger.get_snapshot().total == 175
+
+
+def test_snapshot_over_more_partitions_than_can_be_attached(temp_db):
+    """
+    A filter the summary can't answer reads every year partition; with more years than fit attached
+    at once, the snapshot should still load (and match the single-file database).
+    """
+    years = range(2000, 2000 + partitions.MAX_ATTACHED_PARTITIONS + 2)
+    temp_db.add_transactions([(f"{year}-03-15", amount, "Food", "Lunch")
+                              for year in years for amount in (0.5, 10)])
+    filters = [temp_db.TransactionFilter(min_amount=1), temp_db.TransactionFilter(start_date="2000-03-10")]
+    before = [ledger.load_snapshot(filters=f) for f in filters]
+
+    assert partitions.split_into_partitions() == list(years)
+    for f, expected in zip(filters, before):
+        snapshot = ledger.load_snapshot(filters=f)
+        assert (snapshot.row_count, snapshot.total) == (expected.row_count, expected.total)
+        assert snapshot.monthly.equals(expected.monthly)
+        assert snapshot.category_totals.equals(expected.category_totals)
+    assert ledger.load_snapshot(filters=filters[0]).row_count == len(years)
@@ -1,12 +1,17 @@
+import subprocess
+import sys
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 from budget.main import run_app
 
+
 def test_run_app_starts_gui():
     """
     Basic test that run_app() starts the GUI correctly.
     """
 
     with patch("budget.main.initialise_database") as mock_init_db, \
+         patch("budget.main.close_database") as mock_close_db, \
          patch("budget.main.tk.Tk") as mock_tk, \
          patch("budget.main.BudgetApp") as mock_app, \
          patch("budget.main.platform.system", return_value="Windows"):
@@ -28,6 +33,42 @@ def test_run_app_starts_gui():
 
         fake_root.state.assert_called_once_with("zoomed")
         fake_root.mainloop.assert_called_once()
+        mock_close_db.assert_called_once()
 
         assert root is fake_root
-        assert app is fake_app
\ No newline at end of file
+        assert app is fake_app
+
+
+def test_run_app_profile_startup(capsys):
+    """
+    With profile_startup, run_app() reports each startup phase once the window has painted.
+    """
+    with patch("budget.main.initialise_database"), \
+         patch("budget.main.close_database"), \
+         patch("budget.main.tk.Tk") as mock_tk, \
+         patch("budget.main.BudgetApp"):
+
+        # Run the idle callback straight away instead of from the event loop
+        fake_root = MagicMock()
+        fake_root.after_idle.side_effect = lambda callback: callback()
+        mock_tk.return_value = fake_root
+
+        run_app(profile_startup=True)
+
+    report = capsys.readouterr().err
+    for phase in ("imports", "database", "window built", "first paint", "total"):
+        assert phase in report
+    assert "Heavy modules imported:" in report
+
+
+def test_startup_does_not_import_heavy_modules():
+    """
+    Importing the app must not pull in pandas, NumPy or Matplotlib (they load on first use).
+    """
+    code = (
+        "import sys, budget.main; "
+        "print(','.join(m for m in ('pandas', 'numpy', 'matplotlib') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).resolve().parent.parent)
+    assert result.stdout.strip() == ""
@@ -0,0 +1,73 @@
+import pytest
+
+from budget.ui.scheduler import RefreshScheduler, ALL_VIEWS, LIST, KPIS, INSIGHTS
+
+
+class FakeRoot:
+    """
+    Stands in for tk.Tk: records root.after_idle callbacks so the test decides when Tk "goes idle".
+    """
+    def __init__(self):
+        self.idle = {}
+        self.next_id = 0
+
+    def after_idle(self, callback, *args):
+        self.next_id += 1
+        self.idle[f"after#{self.next_id}"] = (callback, args)
+        return f"after#{self.next_id}"
+
+    def after_cancel(self, after_id):
+        self.idle.pop(after_id, None)
+
+    def go_idle(self):
+        callbacks, self.idle = list(self.idle.values()), {}
+        for callback, args in callbacks:
+            callback(*args)
+
+
+def test_requests_are_coalesced_into_one_pass():
+    """
+    However many requests arrive before Tk goes idle, each view is refreshed once.
+    """
+    root = FakeRoot()
+    passes = []
+    scheduler = RefreshScheduler(root, on_flush=passes.append)
+
+    scheduler.request(LIST, KPIS)
+    scheduler.request(KPIS)
+    scheduler.request(INSIGHTS)
+    assert len(root.idle) == 1  # Only one pass is scheduled
+    assert passes == []
+
+    root.go_idle()
+    assert passes == [frozenset({LIST, KPIS, INSIGHTS})]
+    assert scheduler.requests == 3
+    assert scheduler.passes == 1
+    assert scheduler.refreshes == {LIST: 1, KPIS: 1, INSIGHTS: 1}
+
+    # Nothing pending: going idle again does nothing
+    root.go_idle()
+    assert scheduler.passes == 1
+
+
+def test_request_without_views_refreshes_everything():
+    root = FakeRoot()
+    passes = []
+    scheduler = RefreshScheduler(root, on_flush=passes.append)
+
+    scheduler.request()
+    scheduler.request(LIST)
+    scheduler.flush()  # Flushing by hand cancels the scheduled idle callback
+
+    assert passes == [frozenset(ALL_VIEWS)]
+    assert root.idle == {}
+    assert scheduler.pending == frozenset()
+
+    scheduler.reset_counters()
+    assert (scheduler.requests, scheduler.passes, sum(scheduler.refreshes.values())) == (0, 0, 0)
+
+
+def test_unknown_view_is_rejected():
+    scheduler = RefreshScheduler(FakeRoot())
+    with pytest.raises(ValueError):
+        scheduler.request("chart")
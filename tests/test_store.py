@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from budget.store import LedgerStore, StringPool
+
+
+def _fill(db):
+    db.add_transaction("2025-01-10", 100, "Food", "Groceries")
+    db.add_transaction("2025-01-20", 30, "Drinks", "Bar")
+    db.add_transaction("2025-02-15", 50, "Transport", "Train")
+    db.add_transaction("2025-02-16", 10, "Food", "Groceries")
+
+
+def test_string_pool_interns_values():
+    pool = StringPool()
+
+    assert list(pool.codes(["Food", "Drinks", "Food", None])) == [0, 1, 0, 2]
+    assert pool[1] == "Drinks" and pool[2] == ""
+    assert list(pool.lookup(["Drinks", "Unknown"])) == [1]
+    assert len(pool) == 3
+
+
+def test_store_matches_database_aggregates(temp_db):
+    """
+    The vectorised groupings should give the same totals as the SQL queries.
+    """
+    _fill(temp_db)
+    store = LedgerStore.from_database(chunk_size=3)
+
+    assert len(store) == 4
+    assert store.row(3) == (4, "2025-02-16", 10.0, "Food", "Groceries")
+    assert len(store.descriptions) == 3  # "Groceries" is stored once
+    assert store.total() == temp_db.get_total_amount()
+
+    months, amounts = store.monthly_totals()
+    assert [temp_db.month_label(key) for key in months] == ["2025-01", "2025-02"]
+    assert list(amounts) == [130, 60]
+
+    categories, totals = store.category_totals()
+    assert dict(zip(categories, totals)) == temp_db.get_category_totals().to_dict()
+
+    months, categories, matrix = store.monthly_category_totals()
+    assert categories == ["Food", "Drinks", "Transport"]
+    assert matrix.tolist() == [[100, 10], [30, 0], [0, 50]]
+
+    february = temp_db.TransactionFilter(start_date="2025-02-01", end_date="2025-02-28")
+    assert store.total(february) == temp_db.get_total_amount(february)
+    assert store.category_totals(temp_db.TransactionFilter(categories=("Food", "Other")))[1].tolist() == [110]
+    assert store.total(temp_db.TransactionFilter(categories=())) == 0
+    large = temp_db.TransactionFilter(min_amount=30, max_amount=100)
+    assert store.total(large) == temp_db.get_total_amount(large)
+
+
+def test_store_keeps_pre_1970_and_undated_rows(temp_db):
+    """
+    Days before 1970 are negative, so they must not be mistaken for missing dates; undated rows
+    count towards totals but no month, and only match filters without dates.
+    """
+    temp_db.add_transaction("1969-12-31", 20, "Food", "New Year's Eve")
+    temp_db.add_transaction("1965-06-01", 5, "Food", "Lunch")
+    with temp_db.get_connection_manager().writer() as conn:
+        conn.execute("INSERT INTO transactions (day, amount, category, description) VALUES (NULL, 7, 'Other', 'Old')")
+    store = LedgerStore.from_database()
+
+    assert store.row(0)[1] == "1969-12-31" and store.row(2)[1] is None
+    months, amounts = store.monthly_totals()
+    assert [temp_db.month_label(key) for key in months] == list(temp_db.get_monthly_totals()["month"])
+    assert list(amounts) == [5, 20]
+    assert store.total() == temp_db.get_total_amount() == 32
+
+    sixties = temp_db.TransactionFilter(end_date="1969-12-31")
+    assert store.total(sixties) == temp_db.get_total_amount(sixties) == 25
+
+
+def test_store_codes_more_categories_than_int16():
+    store = LedgerStore()
+    count = 40_000
+    store.extend(range(count), [0] * count, [1.0] * count, [f"Category {i}" for i in range(count)], [""] * count)
+
+    categories, totals = store.category_totals()
+    assert len(categories) == count and categories[-1] == f"Category {count - 1}"
+    assert store.row(count - 1)[3] == f"Category {count - 1}"
+
+
+def test_store_append_and_delete():
+    store = LedgerStore(capacity=2)
+
+    store.append(10, "2025-03-01", 5, "Food")
+    store.append(11, "2025-03-02", 7, "Other", "Gift")
+    store.append(12, "2025-03-03", 9, "Food")
+    assert store.ids.tolist() == [10, 11, 12]
+
+    assert store.delete([11, 99]) == 1
+    assert store.ids.tolist() == [10, 12]
+    assert store.amounts.tolist() == [5, 9]
+    assert store.delete([]) == 0
+
+    with pytest.raises(ValueError):
+        store.ids[0] = 1  # Columns are read-only views
+    with pytest.raises(IndexError):
+        store.row(2)
+
+
+def test_store_is_compact():
+    store = LedgerStore(capacity=100_000)
+    ids = np.arange(100_000)
+    store.extend(ids, ids % 3000, np.ones(100_000), ["Food"] * 100_000, ["Tesco"] * 100_000)
+
+    assert store.total() == 100_000
+    assert store.nbytes < 3_000_000
+    assert len(store.monthly_totals()[0]) == 99
@@ -0,0 +1,113 @@
+import threading
+import time
+
+
+def test_transaction_list_only_materialises_visible_rows(app, temp_db):
+    """
+    The virtual list should hold just the on-screen rows and fetch more as it scrolls.
+    """
+    temp_db.add_transactions([
+        (f"2025-01-{day % 28 + 1:02d}", day, "Food", f"Item {day}")
+        for day in range(500)
+    ])
+
+    tx_list = app.transaction_list
+    tx_list.refresh()
+
+    # Only one screen of rows exists in the Treeview
+    assert tx_list.total == 500
+    assert len(tx_list.tree.get_children()) == tx_list.visible_rows
+
+    # Scrolling to the end shows the oldest rows
+    tx_list.scroll_to(10_000)
+    assert tx_list.top == 500 - tx_list.visible_rows
+    assert tx_list.visible_values()[-1][1] == "2025-01-01"
+
+    # Clicking the amount heading sorts by amount (largest first)
+    tx_list.sort_by("amount")
+    assert tx_list.visible_values()[0][2] == "499.00"
+
+
+def test_search_box_shows_matches(app, temp_db):
+    """
+    Typing in the search box replaces the list with the ranked matches; clearing it restores the ledger.
+    """
+    temp_db.add_transactions([
+        ("2025-01-10", 20, "Food", "Tesco groceries"),
+        ("2025-01-12", 5, "Food", "Coffee"),
+        ("2025-02-01", 40, "Transport", "Tesla supercharger"),
+    ])
+    app.worker.synchronous = True
+    tx_list = app.transaction_list
+
+    app.search_var.set("tes")
+    app.run_search()
+    assert [row[4] for row in tx_list.visible_values()] == ["Tesla supercharger", "Tesco groceries"]
+
+    tx_list.sort_by("amount")
+    assert [row[2] for row in tx_list.visible_values()] == ["40.00", "20.00"]
+
+    app.search_var.set("nothing")
+    app.run_search()
+    assert tx_list.visible_values()[0][4] == "No matching transactions."
+
+    app.search_var.set("")
+    app.run_search()
+    assert tx_list.results is None and tx_list.total == 3
+
+
+def test_selection_survives_scrolling_and_batch_edits(app, temp_db):
+    """
+    Selected rows stay selected when scrolled out of view, and the batch actions apply to all of them.
+    """
+    temp_db.add_transactions([
+        (f"2025-01-{day % 28 + 1:02d}", day, "Food", f"Item {day}")
+        for day in range(100)
+    ])
+    tx_list = app.transaction_list
+    tx_list.refresh()
+
+    first = tx_list.tree.get_children()[:2]
+    tx_list.tree.selection_set(first)
+    tx_list.update()  # Deliver <<TreeviewSelect>>
+    tx_list.scroll_to(50)
+    tx_list.scroll_to(0)
+    assert tx_list.selected_ids == {int(iid) for iid in first}
+    assert set(tx_list.tree.selection()) == set(first)
+
+    assert app.apply_edits(sorted(tx_list.selected_ids), {"date": "", "amount": "-1"}) == "Amount must be a positive number."
+    assert app.apply_edits(sorted(tx_list.selected_ids), {"date": "31-02-2025"}) == "'31-02-2025' is not a date (use DD-MM-YYYY)."
+    assert app.apply_edits(sorted(tx_list.selected_ids), {"category": "Drinks", "date": "01-02-2025"}) is None
+    edited = temp_db.get_transactions_slice(0, 2)  # Now the newest rows
+    assert {row[0] for row in edited} == tx_list.selected_ids
+    assert [(row[1], row[3]) for row in edited] == [("2025-02-01", "Drinks")] * 2
+
+
+def test_refresh_reads_the_list_rows_on_the_worker(app, temp_db, monkeypatch):
+    """
+    A refresh pass should count and fetch the list's rows on the worker thread; the main thread only draws them.
+    """
+    temp_db.add_transactions([
+        (f"2025-01-{day % 28 + 1:02d}", day, "Food", f"Item {day}")
+        for day in range(50)
+    ])
+    calls = []
+
+    def recorded(function):
+        def wrapper(*args, **kwargs):
+            calls.append((function.__name__, threading.current_thread() is threading.main_thread()))
+            return function(*args, **kwargs)
+        return wrapper
+
+    for name in ("count_transactions", "get_transactions_slice", "get_transactions_page"):
+        monkeypatch.setattr(temp_db, name, recorded(getattr(temp_db, name)))
+
+    app.refresh_all()
+    deadline = time.monotonic() + 5
+    while (app.scheduler.pending or app.worker.busy) and time.monotonic() < deadline:
+        app.root.update()
+
+    assert app.transaction_list.total == 50
+    assert len(app.transaction_list.tree.get_children()) == app.transaction_list.visible_rows
+    assert {name for name, _ in calls} >= {"count_transactions", "get_transactions_slice"}
+    assert not [name for name, on_main_thread in calls if on_main_thread]
@@ -1,9 +1,12 @@
+import pytest
 import pandas as pd
 from unittest.mock import patch, MagicMock
+from budget.ledger import LedgerSnapshot
+
 
 def test_show_transaction_graph_with_data(app, monkeypatch):
     """
-    show_transaction_graph should create, draw, and grid the chart widget
+    show_transaction_graph should update, redraw, and grid the persistent chart widget
     when valid transaction data exists.
     """
     # Fake dataframe with 2 rows (so df is NOT empty)
@@ -12,24 +15,93 @@ def test_show_transaction_graph_with_data(app, monkeypatch):
         "amount": [10, 20]
     })
 
-    # Make get_all_transactions return fake data
-    monkeypatch.setattr("budget.ui.transactions.get_all_transactions", lambda: fake_df)
+    # Build a ledger snapshot from the fake data
+    snapshot = LedgerSnapshot(
+        generation=0,
+        row_count=len(fake_df),
+        total=30.0,
+        monthly=None,
+        category_totals=fake_df.groupby("category")["amount"].sum().sort_values(),
+    )
 
-    # Mock FigureCanvasTkAgg so it doesn't create a real chart
-    with patch("budget.ui.transactions.FigureCanvasTkAgg") as mock_canvas_class:
-        mock_canvas = MagicMock()
-        mock_canvas_class.return_value = mock_canvas
+    canvas = app.bar_chart.canvas
 
-        # Mock the tk widget returned by get_tk_widget()
+    # Mock the canvas' redraw and tk widget so nothing is rendered
+    with patch.object(canvas, "draw_idle") as mock_draw_idle, \
+         patch.object(canvas, "get_tk_widget") as mock_get_widget:
         fake_widget = MagicMock()
-        mock_canvas.get_tk_widget.return_value = fake_widget
+        mock_get_widget.return_value = fake_widget
 
-        # Run the function
-        app.show_transaction_graph()
+        # Run the function twice (e.g. two refreshes)
+        app.show_transaction_graph(snapshot)
+        app.show_transaction_graph(snapshot._replace(category_totals=snapshot.category_totals * 2))
 
-        # Check the canvas was created and drawn
-        mock_canvas_class.assert_called_once()
-        mock_canvas.draw.assert_called_once()
+        # The persistent canvas is reused and redrawn in place
+        assert app.bar_chart.canvas is canvas
+        assert mock_draw_idle.call_count == 2
+        assert [bar.get_width() for bar in app.bar_chart.bars] == [20, 40]
 
         # The widget should be gridded inside the frame
-        fake_widget.grid.assert_called_once()
\ No newline at end of file
+        fake_widget.grid.assert_called()
+
+
+def test_forecast_categories_uses_selected_model(app):
+    """
+    The per-category forecasts should come from the model picked in the dropdown
+    and add up to the total forecast.
+    """
+    category_monthly = pd.DataFrame(
+        {"2025-01": [100.0, 10.0], "2025-02": [200.0, 20.0], "2025-03": [150.0, 60.0]},
+        index=pd.Index(["Food", "Transport"], name="category"),
+    )
+    snapshot = LedgerSnapshot(
+        generation=0,
+        row_count=6,
+        total=540.0,
+        monthly=None,
+        category_totals=category_monthly.sum(axis=1).sort_values(),
+        category_monthly=category_monthly,
+    )
+
+    # Default model: linear trend
+    total, per_category = app._forecast_categories(snapshot)
+    assert per_category["Food"] == pytest.approx(200.0)
+    assert total == pytest.approx(per_category.sum())
+
+    # Switching to the 3-month average
+    with patch.object(app.scheduler, "request") as mock_request:
+        app.forecast_model_var.set("3-month average")
+        app.select_forecast_model()
+        mock_request.assert_called_once_with("kpis", "insights")  # Only the forecast's views are refreshed
+
+    total, per_category = app._forecast_categories(snapshot)
+    assert per_category.to_dict() == pytest.approx({"Food": 150.0, "Transport": 30.0})
+    assert total == pytest.approx(180.0)
+
+
+def test_apply_filters_restricts_every_view(app, temp_db):
+    """
+    A filter applied from one tab's bar shows in both bars and narrows the list, KPIs and exports.
+    """
+    temp_db.add_transactions([
+        ("2025-01-10", 100, "Food", "Groceries"),
+        ("2025-02-15", 50, "Transport", "Train"),
+        ("2025-02-20", 25, "Food", "Lunch"),
+    ])
+    app.worker.synchronous = True
+    transactions_bar, insights_bar = app.filter_bars
+
+    transactions_bar.start_entry.insert(0, "01-02-2025")
+    transactions_bar.max_entry.insert(0, "40")
+    transactions_bar.apply()
+
+    assert app.filters == temp_db.TransactionFilter(start_date="2025-02-01", max_amount=40)
+    assert app.export_filters == app.filters
+    assert insights_bar.start_entry.get() == "01-02-2025"
+
+    app._run_refresh(frozenset({"list", "kpis"}))
+    assert [row[4] for row in app.transaction_list.visible_values()] == ["Lunch"]
+    assert app.amount_spent.cget("text").endswith("25.00")
+
+    insights_bar.clear()
+    assert app.filters is None and transactions_bar.max_entry.get() == ""
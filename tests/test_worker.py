@@ -0,0 +1,93 @@
+import threading
+import time
+
+from budget.ui.worker import BackgroundWorker
+
+
+class FakeRoot:
+    """
+    Stands in for tk.Tk: records root.after callbacks so the test can run them on "the main thread".
+    """
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback, *args):
+        self.scheduled.append((callback, args))
+
+    def run_until_idle(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.scheduled and time.monotonic() < deadline:
+            callback, args = self.scheduled.pop(0)
+            callback(*args)
+            time.sleep(0.001)
+
+
+def test_stale_results_are_discarded():
+    """
+    Only the newest job for a key should have its result applied.
+    """
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    applied, busy_states = [], []
+    worker.on_busy_change = busy_states.append
+
+    release_slow = threading.Event()
+
+    def slow_job():
+        release_slow.wait(5)
+        return "old"
+
+    worker.submit("refresh", slow_job, applied.append)
+    worker.submit("refresh", lambda: "new", applied.append)
+    release_slow.set()
+    root.run_until_idle()
+
+    assert applied == ["new"]
+    assert busy_states == [True, False]
+    worker.shutdown()
+
+
+def test_errors_and_posts_run_on_main_thread():
+    """
+    Errors go to on_error and post() callbacks run from the polling loop, not the worker thread.
+    """
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    main_thread = threading.get_ident()
+    calls = []
+
+    def failing_job():
+        worker.post(lambda: calls.append(("progress", threading.get_ident() == main_thread)))
+        raise ValueError("boom")
+
+    worker.submit("import", failing_job, calls.append, on_error=lambda error: calls.append(("error", str(error))))
+    root.run_until_idle()
+
+    assert calls == [("progress", True), ("error", "boom")]
+    worker.shutdown()
+
+
+def test_cancel_skips_jobs_that_have_not_started():
+    """
+    Cancelling a key stops its queued job from running and drops the result of a running one.
+    """
+    root = FakeRoot()
+    worker = BackgroundWorker(root, max_workers=1)
+    ran, applied = [], []
+    started, release = threading.Event(), threading.Event()
+
+    def blocking_job():
+        started.set()
+        release.wait(5)
+        return "running"
+
+    worker.submit("search", blocking_job, applied.append)
+    started.wait(5)
+    worker.submit("search", lambda: ran.append("queued"), applied.append)
+    worker.cancel("search")
+    release.set()
+    root.run_until_idle()
+
+    assert ran == [] and applied == []
+    assert not worker.busy
+    worker.shutdown()